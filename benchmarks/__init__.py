@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for TV price scraper.
+
+Run from the project root, e.g. ``python -m benchmarks.bench_session``.
+"""
@@ -0,0 +1,49 @@
+"""
+Compare parsing search pages inline on the event loop against a parse pool.
+
+Every scraper's fixture page is parsed ``--rounds`` times; throughput is
+reported in pages per second for each executor mode.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+from benchmarks.fixtures import describe_pages, load_page, scraper_classes
+from utils.parsing import ExtractionSpec, ParseExecutor, extract_first
+
+async def _run(mode: str, pages: List[Tuple[str, ExtractionSpec]], workers: int) -> float:
+    executor = ParseExecutor(mode, max_workers=workers)
+    try:
+        # Warm up the pool so worker start-up isn't counted
+        await asyncio.gather(*(executor.run(extract_first, html, spec)
+                               for html, spec in pages[:workers]))
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(executor.run(extract_first, html, spec)
+                                         for html, spec in pages))
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+    missing = sum(1 for result in results if not result)
+    if missing:
+        print(f"  warning: {missing} pages yielded no product in {mode} mode")
+    return elapsed
+
+async def main(rounds: int, workers: int) -> None:
+    classes = scraper_classes()
+    pages = [(load_page(retailer), cls.spec) for retailer, cls in classes.items()] * rounds
+    size = sum(len(html) for html, _ in pages) / len(pages) / 1024
+
+    print(f"{len(pages)} {describe_pages()}, average {size:.0f} KiB, {workers} workers")
+    for mode in ParseExecutor.MODES:
+        elapsed = await _run(mode, pages, workers)
+        print(f"  {mode:8s} {elapsed:.3f}s ({len(pages) / elapsed:.1f} pages/s)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.workers))
@@ -0,0 +1,46 @@
+"""
+Compare full-document parsing against partial parsing with early termination.
+
+Each mode runs in a fresh worker process so its peak RSS can be reported
+alongside CPU time per page.
+"""
+
+import argparse
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+from benchmarks.fixtures import describe_pages, load_page, scraper_classes
+from utils.parsing import extract_items
+
+def _measure(partial: bool, rounds: int) -> Tuple[float, int, int]:
+    classes = scraper_classes()
+    pages = [(load_page(retailer), cls.spec) for retailer, cls in classes.items()]
+    # Warm up so compiled selectors and import-time allocations aren't counted
+    extract_items(pages[0][0], pages[0][1], limit=1, partial=partial)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.process_time()
+    parsed = 0
+    for _ in range(rounds):
+        for html, spec in pages:
+            if extract_items(html, spec, limit=1, partial=partial):
+                parsed += 1
+    cpu = time.process_time() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return cpu / parsed, peak - baseline, parsed
+
+def main(rounds: int) -> None:
+    print(f"Parsing {describe_pages()}")
+    for label, partial in (('full', False), ('partial', True)):
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            cpu, rss_growth, parsed = pool.submit(_measure, partial, rounds).result()
+        print(f"{label:8s} {cpu * 1000:.2f} ms CPU/page, "
+              f"peak RSS +{rss_growth} KiB ({parsed} pages)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    main(args.rounds)
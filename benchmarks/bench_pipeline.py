@@ -0,0 +1,162 @@
+"""
+End-to-end benchmark of the PriceScraper pipeline against the mock retailers.
+
+A mock server (``benchmarks.mock_server``) runs in a subprocess and serves
+the fixture pages; this process points every scraper at it and scrapes a
+synthetic catalog with the cache off. No network access is needed.
+
+Reports throughput, p50/p95 lookup latency, CPU per page (including parse
+workers) and peak RSS. ``--save`` records the result and ``--compare``
+checks against a saved result, exiting non-zero on a regression beyond
+``--tolerance``, so changes can be gated on it:
+
+    python -m benchmarks.bench_pipeline --products 200 --save baseline.json
+    python -m benchmarks.bench_pipeline --products 200 --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from benchmarks import mock_server
+from utils.storage import SQLiteStore
+
+# Metrics where a higher value is a regression, and the one where lower is
+LOWER_IS_BETTER = ('p50_ms', 'p95_ms', 'cpu_ms_per_page', 'peak_rss_mib')
+HIGHER_IS_BETTER = ('lookups_per_s',)
+
+def _start_server(args: argparse.Namespace) -> subprocess.Popen:
+    command = [sys.executable, '-m', 'benchmarks.mock_server', '--port', '0',
+               '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--error-rate', str(args.error_rate), '--slow-rate', str(args.slow_rate),
+               '--slow-latency', str(args.slow_latency)]
+    if not args.compress:
+        command.append('--no-compress')
+    if not args.etag:
+        command.append('--no-etag')
+    return subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+
+def _timed(search: Callable, latencies: List[float]) -> Callable:
+    async def wrapper(product_name: str, fresh: bool = False):
+        start = time.perf_counter()
+        try:
+            return await search(product_name, fresh)
+        finally:
+            latencies.append(time.perf_counter() - start)
+    return wrapper
+
+def _cpu_seconds() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+async def run_pipeline(port: int, args: argparse.Namespace, db_path: Path) -> Dict[str, float]:
+    from main import PriceScraper
+
+    scraper = PriceScraper(args.retailers, args.concurrency, cache_mode='off',
+                           store=SQLiteStore(db_path))
+    scraper.parser.mode = args.parse_mode
+    # Only the mock server is on the other end, so lift politeness limits
+    scraper.rate_limiter.limits = {'default': {'requests': 1_000_000, 'period': 1}}
+    scraper.retry_policy.base_delay = 0.05
+    scraper.retry_policy.max_delay = 0.5
+    scraper.retry_policy.budgets = {'default': 1_000_000}
+
+    latencies: List[float] = []
+    for retailer_scraper in scraper.scrapers:
+        retailer_scraper.base_url = f"http://127.0.0.1:{port}/{retailer_scraper.retailer}"
+        timed = _timed(retailer_scraper.search, latencies)
+        retailer_scraper.search = timed  # type: ignore[method-assign]
+
+    # Distinct model numbers so nothing is deduplicated or coalesced
+    products = ({'name': f"Bench 55\" 4K Smart TV - BX{index:06d}A"}
+                for index in range(args.products))
+
+    cpu_start = _cpu_seconds()
+    start = time.perf_counter()
+    found = 0
+    async with scraper:
+        async for _, _, results in scraper.iter_product_results(products):
+            found += len(results)
+    elapsed = time.perf_counter() - start
+    # Parse workers have exited by now, so their CPU time is in RUSAGE_CHILDREN
+    cpu = _cpu_seconds() - cpu_start
+
+    lookups = len(latencies)
+    quantiles = statistics.quantiles(latencies, n=20) if lookups > 1 else [0.0] * 19
+    peak_rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                   resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return {
+        'products': args.products,
+        'lookups': lookups,
+        'found': found,
+        'elapsed_s': elapsed,
+        'lookups_per_s': lookups / elapsed if elapsed else 0.0,
+        'p50_ms': quantiles[9] * 1000,
+        'p95_ms': quantiles[18] * 1000,
+        'cpu_ms_per_page': cpu / lookups * 1000 if lookups else 0.0,
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_mib': peak_rss / 1024,
+    }
+
+def compare(result: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    regressions = []
+    for key in LOWER_IS_BETTER:
+        if baseline.get(key) and result[key] > baseline[key] * (1 + tolerance):
+            regressions.append(f"{key}: {result[key]:.2f} vs baseline {baseline[key]:.2f}")
+    for key in HIGHER_IS_BETTER:
+        if baseline.get(key) and result[key] < baseline[key] * (1 - tolerance):
+            regressions.append(f"{key}: {result[key]:.2f} vs baseline {baseline[key]:.2f}")
+    return regressions
+
+def main(args: argparse.Namespace) -> int:
+    # The pipeline logs every product; keep the report readable
+    logging.disable(logging.INFO)
+
+    server = _start_server(args)
+    try:
+        # The server prints its port once it is listening
+        port = int(server.stdout.readline()) if server.stdout is not None else 0
+        with tempfile.TemporaryDirectory() as tmp:
+            result = asyncio.run(run_pipeline(port, args, Path(tmp) / 'bench.db'))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{result['lookups']} lookups ({result['found']} found) in {result['elapsed_s']:.2f}s: "
+          f"{result['lookups_per_s']:.1f} lookups/s, p50 {result['p50_ms']:.1f} ms, "
+          f"p95 {result['p95_ms']:.1f} ms, {result['cpu_ms_per_page']:.2f} ms CPU/page, "
+          f"peak RSS {result['peak_rss_mib']:.1f} MiB")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(result, indent=2), encoding='utf-8')
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100)
+    parser.add_argument('--retailers', default='all')
+    parser.add_argument('--concurrency', type=int, default=None)
+    parser.add_argument('--parse-mode', default='process', choices=('process', 'thread', 'inline'))
+    mock_server.add_arguments(parser)
+    parser.add_argument('--save', help='write the result as JSON to this path')
+    parser.add_argument('--compare', help='baseline JSON to check the result against')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='allowed relative regression before failing (default 0.15)')
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,72 @@
+"""
+Compare a fresh ClientSession per request against the shared pooled session.
+
+Starts a local aiohttp server standing in for a retailer and fetches the same
+search page repeatedly through ``BaseScraper.make_request``.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+from aiohttp import web
+from scrapers.base_scraper import BaseScraper
+from utils.rate_limiter import RateLimiter
+from utils.session import SessionManager
+
+PAGE = "<html><body>" + "<div class='product-tile'>TV</div>" * 200 + "</body></html>"
+
+class BenchScraper(BaseScraper):
+    async def scrape(self, product_name: str) -> Optional[List[Dict]]:
+        return None
+
+async def _handler(request: web.Request) -> web.Response:
+    return web.Response(text=PAGE, content_type='text/html')
+
+async def _start_server(port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_get('/search', _handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner
+
+async def _run(scraper: BaseScraper, url: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await scraper.make_request(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - start
+
+async def main(requests: int, concurrency: int, port: int) -> None:
+    runner = await _start_server(port)
+    url = f"http://127.0.0.1:{port}/search"
+    try:
+        # Only the local server is on the other end, so lift the politeness limit;
+        # this measures connection reuse, not the rate limiter
+        scraper = BenchScraper(
+            rate_limiter=RateLimiter({'default': {'requests': 1_000_000, 'period': 1}}))
+        per_request = await _run(scraper, url, requests, concurrency)
+
+        async with SessionManager() as manager:
+            scraper.session = manager.session
+            pooled = await _run(scraper, url, requests, concurrency)
+
+        print(f"{requests} requests, concurrency {concurrency}")
+        print(f"  session per request: {per_request:.3f}s ({requests / per_request:.0f} req/s)")
+        print(f"  shared session:      {pooled:.3f}s ({requests / pooled:.0f} req/s)")
+        print(f"  speedup:             {per_request / pooled:.2f}x")
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=12)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.port))
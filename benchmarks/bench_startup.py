@@ -0,0 +1,57 @@
+"""
+Measure how long the CLI takes to start, in fresh interpreters.
+
+Each case runs in a new ``python`` process (so nothing is already imported)
+and reports the median wall time over ``--repeat`` runs, next to an empty
+interpreter for reference, plus the scraper modules a single-retailer
+setup loads:
+
+    python -m benchmarks.bench_startup --repeat 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CASES = {
+    'empty interpreter': ['-c', 'pass'],
+    'import main': ['-c', 'import main'],
+    'main.py --help': ['main.py', '--help'],
+    'PriceScraper("bestbuy")': ['-c', 'import main; main.PriceScraper("bestbuy")'],
+    'PriceScraper("all")': ['-c', 'import main; main.PriceScraper("all")'],
+}
+
+LOADED_SCRAPERS = (
+    'import sys, main; main.PriceScraper("bestbuy"); '
+    'print(sorted(m for m in sys.modules if m.startswith("scrapers.")))'
+)
+
+def _time(args: List[str], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+def main(repeat: int) -> None:
+    print(f"median of {repeat} fresh interpreters")
+    for name, args in CASES.items():
+        print(f"  {name:<26} {_time(args, repeat) * 1000:7.1f} ms")
+
+    loaded = subprocess.run([sys.executable, '-c', LOADED_SCRAPERS], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout.strip()
+    print(f"scraper modules loaded for one retailer: {loaded}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    main(parser.parse_args().repeat)
@@ -0,0 +1,87 @@
+"""
+HTML fixtures for benchmarks.
+
+A recorded page saved as ``benchmarks/fixtures/<retailer>.html`` is used when
+present. Otherwise a synthetic page is generated from the scraper's
+extraction spec: a heavy head (inline scripts and styles), navigation, a grid
+of product tiles and a footer, roughly the size of a real search page.
+
+No recorded pages are checked in, so benchmarks run on synthetic pages
+unless one is saved locally. Synthetic tiles match the spec exactly and
+carry no embedded JSON, so real pages may parse slower.
+"""
+
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Type
+import scrapers
+from utils.parsing import ExtractionSpec, Selector
+
+if TYPE_CHECKING:
+    from scrapers.base_scraper import BaseScraper
+
+FIXTURE_DIR = Path(__file__).resolve().parent / 'fixtures'
+
+MODELS = ['QN65Q60DAFXZC', '55QNED80TUC', '50A68N', 'UN75DU7100FXZC', '50UT7570PUB', '32A4KV']
+
+def scraper_classes() -> Dict[str, Type['BaseScraper']]:
+    """Scraper classes keyed by retailer"""
+    return {retailer: scrapers.load_scraper(retailer)
+            for retailer in scrapers.available_retailers()}
+
+def _open_tag(selector: Selector, extra: str = '') -> str:
+    attrs = ''.join(f' {name}="{value}"' for name, value in selector.attrs.items())
+    return f"<{selector.tag}{attrs}{extra}>"
+
+def _tile(spec: ExtractionSpec, index: int, rng: random.Random) -> str:
+    model = MODELS[index % len(MODELS)]
+    price = f"${rng.randint(199, 2999):,}.{rng.randint(0, 99):02d}"
+    title = f"Brand {50 + index % 40}\" 4K Smart TV - {model}"
+    href = f"/product/{model.lower()}-{index}"
+
+    parts: List[str] = []
+    rendered = set()
+    for field, selector in spec.fields.items():
+        key = (selector.tag, tuple(sorted(selector.attrs.items())))
+        if key in rendered:
+            continue
+        rendered.add(key)
+        # Fields sharing a selector (title link with href) become one element
+        shares_href = any(
+            other.attr == 'href' and (other.tag, tuple(sorted(other.attrs.items()))) == key
+            for other in spec.fields.values()
+        )
+        extra = f' href="{href}"' if shares_href else ''
+        text = {'price': price}.get(field, title)
+        parts.append(f"{_open_tag(selector, extra)}{text}</{selector.tag}>")
+
+    filler = '<div class="badge">Free shipping</div><ul class="specs">' + \
+        ''.join(f'<li>Spec {n}: value</li>' for n in range(8)) + '</ul>'
+    return (f"{_open_tag(spec.container)}<img src=\"/img/{index}.jpg\"/>"
+            f"{''.join(parts)}{filler}</{spec.container.tag}>")
+
+def synthetic_page(spec: ExtractionSpec, tiles: int = 48, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    script = "<script>" + "var x=" + "1+" * 4000 + "1;</script>"
+    style = "<style>" + ".c{color:red}" * 2000 + "</style>"
+    nav = "<nav>" + ''.join(f'<a href="/c/{n}">Category {n}</a>' for n in range(300)) + "</nav>"
+    grid = ''.join(_tile(spec, n, rng) for n in range(tiles))
+    legal = ''.join(f'<p>Legal text paragraph {n}</p>' for n in range(200))
+    footer = f"<footer>{legal}</footer>"
+    return (f"<!DOCTYPE html><html><head><title>Search</title>{script * 5}{style}</head>"
+            f"<body>{nav}<main><section class=\"results\">{grid}</section></main>{footer}"
+            f"{script * 5}</body></html>")
+
+def describe_pages() -> str:
+    """Which pages a benchmark run uses, for its report"""
+    recorded = sorted(path.stem for path in FIXTURE_DIR.glob('*.html'))
+    if not recorded:
+        return "synthetic pages (nothing recorded in benchmarks/fixtures/)"
+    return f"recorded pages for {', '.join(recorded)}, synthetic for the rest"
+
+def load_page(retailer: str) -> str:
+    """Recorded fixture for ``retailer`` if saved, else a synthetic page"""
+    recorded = FIXTURE_DIR / f'{retailer}.html'
+    if recorded.exists():
+        return recorded.read_text(encoding='utf-8')
+    return synthetic_page(scraper_classes()[retailer].spec)
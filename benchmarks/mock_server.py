@@ -0,0 +1,126 @@
+"""
+Local aiohttp server standing in for every retailer, for offline benchmarks.
+
+Requests to ``/<retailer>/<search path>`` are answered with that retailer's
+fixture page (see ``benchmarks.fixtures``) with an ETag, and with 304 Not
+Modified when the client revalidates a page it already has. Latency, slow
+outliers and transient errors can be injected to exercise retries and tail
+latency.
+
+Run standalone with ``python -m benchmarks.mock_server --port 8080``; the
+bound port is printed on the first line of stdout.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import Dict, Optional
+from aiohttp import web
+from benchmarks.fixtures import load_page, scraper_classes
+
+class MockRetailers:
+    def __init__(self,
+                 latency: float = 0.05,
+                 jitter: float = 0.02,
+                 error_rate: float = 0.0,
+                 slow_rate: float = 0.0,
+                 slow_latency: float = 1.0,
+                 compress: bool = True,
+                 etag: bool = True,
+                 seed: Optional[int] = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.compress = compress
+        self.etag = etag
+        self.rng = random.Random(seed)
+        self.pages: Dict[str, bytes] = {
+            retailer: load_page(retailer).encode('utf-8') for retailer in scraper_classes()
+        }
+        self.etags: Dict[str, str] = {
+            retailer: '"' + hashlib.sha1(page).hexdigest()[:16] + '"'
+            for retailer, page in self.pages.items()
+        }
+        self.stats: Dict[str, int] = {'requests': 0, 'errors': 0, 'slow': 0, 'not_modified': 0}
+
+    def delay(self) -> float:
+        if self.slow_rate and self.rng.random() < self.slow_rate:
+            self.stats['slow'] += 1
+            return self.slow_latency
+        return max(0.0, self.rng.gauss(self.latency, self.jitter))
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        self.stats['requests'] += 1
+        retailer = request.match_info['retailer']
+        page = self.pages.get(retailer)
+        if page is None:
+            raise web.HTTPNotFound()
+
+        await asyncio.sleep(self.delay())
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.stats['errors'] += 1
+            return web.Response(status=503, headers={'Retry-After': '0'})
+
+        headers = {'ETag': self.etags[retailer]} if self.etag else {}
+        if self.etag and request.headers.get('If-None-Match') == self.etags[retailer]:
+            self.stats['not_modified'] += 1
+            return web.Response(status=304, headers=headers)
+
+        response = web.Response(body=page, content_type='text/html', charset='utf-8',
+                                headers=headers)
+        if self.compress:
+            response.enable_compression()
+        return response
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/{retailer}/{tail:.*}', self.handle)
+        return app
+
+async def start(mock: MockRetailers, port: int = 0) -> web.AppRunner:
+    """Serve ``mock`` on 127.0.0.1; ``port=0`` picks a free port (see ``bound_port``)"""
+    runner = web.AppRunner(mock.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner
+
+def bound_port(runner: web.AppRunner) -> int:
+    return runner.addresses[0][1]
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='mean response delay in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02,
+                        help='standard deviation of the delay')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of 503 responses')
+    parser.add_argument('--slow-rate', type=float, default=0.0, help='share of slow responses')
+    parser.add_argument('--slow-latency', type=float, default=1.0, help='delay of slow responses')
+    parser.add_argument('--no-compress', dest='compress', action='store_false',
+                        help='serve pages uncompressed')
+    parser.add_argument('--no-etag', dest='etag', action='store_false',
+                        help='send no ETag and never answer 304')
+
+def from_arguments(args: argparse.Namespace) -> MockRetailers:
+    return MockRetailers(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                         slow_rate=args.slow_rate, slow_latency=args.slow_latency,
+                         compress=args.compress, etag=args.etag)
+
+async def serve(args: argparse.Namespace) -> None:
+    runner = await start(from_arguments(args), args.port)
+    print(bound_port(runner), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--port', type=int, default=0)
+    add_arguments(parser)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -8,12 +8,53 @@ from .settings import (
     LOGS_DIR,
     RESULTS_DIR,
     REQUEST_TIMEOUT,
+    REQUEST_DEADLINE,
     MAX_RETRIES,
     RETRY_DELAY,
+    RETRY_MAX_DELAY,
+    MAX_RESPONSE_BYTES,
+    RETRY_BUDGET,
     CONCURRENT_REQUESTS,
+    RETAILER_CONCURRENCY,
+    SCHEDULER_MAX_PENDING,
+    ADAPTIVE_CONCURRENCY,
+    LATENCY_SPIKE_FACTOR,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    PRODUCT_DEADLINE,
+    RETAILER_DEADLINES,
+    HEDGE_RETAILERS,
+    HEDGE_QUANTILE,
+    HEDGE_MIN_SAMPLES,
+    PARSE_EXECUTOR,
+    PARSE_WORKERS,
+    PARSE_PARTIAL,
+    PARSE_CHUNK_SIZE,
+    PARSE_STREAMING,
+    STRUCTURED_DATA,
+    MATCH_CANDIDATES,
+    MATCH_MIN_CONFIDENCE,
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
     CACHE_ENABLED,
     CACHE_DURATION,
     CACHE_DIR,
+    CACHE_MEMORY_ENTRIES,
+    CACHE_TTL_OVERRIDES,
+    CACHE_WRITE_BATCH,
+    CACHE_FLUSH_DELAY,
+    DB_PATH,
+    RESULTS_JSON_EXPORT,
+    JOURNAL_RETENTION,
+    CONDITIONAL_REQUESTS,
+    VALIDATOR_RETENTION,
+    PRICE_HISTORY,
+    METRICS_ENABLED,
+    METRICS_EXPORT,
+    WATCH_MIN_INTERVAL,
+    WATCH_MAX_INTERVAL,
     RATE_LIMIT,
     PROXY_ENABLED,
     PROXY_LIST,
@@ -27,12 +68,53 @@ __all__ = [
     'LOGS_DIR',
     'RESULTS_DIR',
     'REQUEST_TIMEOUT',
+    'REQUEST_DEADLINE',
     'MAX_RETRIES',
     'RETRY_DELAY',
+    'RETRY_MAX_DELAY',
+    'MAX_RESPONSE_BYTES',
+    'RETRY_BUDGET',
     'CONCURRENT_REQUESTS',
+    'RETAILER_CONCURRENCY',
+    'SCHEDULER_MAX_PENDING',
+    'ADAPTIVE_CONCURRENCY',
+    'LATENCY_SPIKE_FACTOR',
+    'CIRCUIT_FAILURE_THRESHOLD',
+    'CIRCUIT_RESET_TIMEOUT',
+    'PRODUCT_DEADLINE',
+    'RETAILER_DEADLINES',
+    'HEDGE_RETAILERS',
+    'HEDGE_QUANTILE',
+    'HEDGE_MIN_SAMPLES',
+    'PARSE_EXECUTOR',
+    'PARSE_WORKERS',
+    'PARSE_PARTIAL',
+    'PARSE_CHUNK_SIZE',
+    'PARSE_STREAMING',
+    'STRUCTURED_DATA',
+    'MATCH_CANDIDATES',
+    'MATCH_MIN_CONFIDENCE',
+    'CONNECTION_LIMIT',
+    'CONNECTION_LIMIT_PER_HOST',
+    'DNS_CACHE_TTL',
+    'KEEPALIVE_TIMEOUT',
     'CACHE_ENABLED',
     'CACHE_DURATION',
     'CACHE_DIR',
+    'CACHE_MEMORY_ENTRIES',
+    'CACHE_TTL_OVERRIDES',
+    'CACHE_WRITE_BATCH',
+    'CACHE_FLUSH_DELAY',
+    'DB_PATH',
+    'RESULTS_JSON_EXPORT',
+    'JOURNAL_RETENTION',
+    'CONDITIONAL_REQUESTS',
+    'VALIDATOR_RETENTION',
+    'PRICE_HISTORY',
+    'METRICS_ENABLED',
+    'METRICS_EXPORT',
+    'WATCH_MIN_INTERVAL',
+    'WATCH_MAX_INTERVAL',
     'RATE_LIMIT',
     'PROXY_ENABLED',
     'PROXY_LIST',
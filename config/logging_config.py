@@ -25,12 +25,14 @@ LOGGING_CONFIG = {
             'level': 'DEBUG',
             'formatter': 'detailed',
             'class': 'logging.FileHandler',
+            'delay': True,
             'filename': os.path.join(LOGS_DIR, f'scraper_{datetime.now().strftime("%Y%m%d")}.log'),
         },
         'error_file': {
             'level': 'ERROR',
             'formatter': 'detailed',
             'class': 'logging.FileHandler',
+            'delay': True,
             'filename': os.path.join(LOGS_DIR, f'error_{datetime.now().strftime("%Y%m%d")}.log'),
         },
     },
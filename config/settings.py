@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import List
 
 # Project paths
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -12,15 +13,91 @@ for directory in [DATA_DIR, LOGS_DIR, RESULTS_DIR]:
     directory.mkdir(exist_ok=True)
 
 # Scraping settings
-REQUEST_TIMEOUT = 30
+REQUEST_TIMEOUT = 30     # Seconds allowed for a single attempt
+REQUEST_DEADLINE = 90    # Seconds allowed for a request including retries
 MAX_RETRIES = 3
-RETRY_DELAY = 5
-CONCURRENT_REQUESTS = 3
+RETRY_DELAY = 5          # Base delay for exponential backoff
+RETRY_MAX_DELAY = 60     # Cap on a single backoff sleep
+MAX_RESPONSE_BYTES = 5 * 1024 * 1024  # Decompressed body size at which a page is abandoned
+
+# Retries each retailer may spend per run
+RETRY_BUDGET = {
+    'default': 30
+}
+CONCURRENT_REQUESTS = 12  # In-flight requests across all retailers
+
+# Per-retailer cap on in-flight requests
+RETAILER_CONCURRENCY = {
+    'amazon': 2,
+    'default': 3
+}
+SCHEDULER_MAX_PENDING = 200  # (product, retailer) jobs kept alive at once
+# Shrink a retailer's cap on errors and latency spikes, regrow it on success
+ADAPTIVE_CONCURRENCY = True
+LATENCY_SPIKE_FACTOR = 3.0   # A response this many times slower than average counts as a spike
+
+# Circuit breaker: stop sending requests to a retailer that keeps failing
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures that open the circuit
+CIRCUIT_RESET_TIMEOUT = 60     # Seconds before a single probe request is let through
+
+# Deadlines: stop waiting on slow retailers and keep whatever results are in
+# Seconds a product waits for all its retailers; None waits for every answer
+PRODUCT_DEADLINE = None
+# Per-retailer cap in seconds on one lookup, rate-limit queueing and retries included
+RETAILER_DEADLINES = {
+    'default': None
+}
+
+# Hedged requests: a second attempt once the first outlasts the retailer's usual latency
+HEDGE_RETAILERS: List[str] = []  # Retailers that tolerate the duplicate request, e.g. ['bestbuy']
+HEDGE_QUANTILE = 0.95    # Latency quantile after which the hedge is sent
+HEDGE_MIN_SAMPLES = 20   # Responses seen before a retailer is hedged
+
+# HTML parsing settings
+PARSE_EXECUTOR = 'process'  # 'process', 'thread' or 'inline'
+PARSE_WORKERS = None        # Worker count; None uses the CPU count
+PARSE_PARTIAL = True        # Stop building the tree once the product tile is read
+PARSE_CHUNK_SIZE = 65536    # Bytes fed to the incremental parser at a time
+PARSE_STREAMING = False     # Parse straight from the response stream (on the event loop)
+STRUCTURED_DATA = True      # Read JSON-LD / embedded state before walking the DOM
+MATCH_CANDIDATES = 5        # Products read per search page and ranked against the query
+MATCH_MIN_CONFIDENCE = 0.0  # Best matches scoring below this (0-1) are reported as not found
+
+# Connection pool settings (shared aiohttp session)
+CONNECTION_LIMIT = 100          # Total open connections across all retailers
+CONNECTION_LIMIT_PER_HOST = 4   # Open connections per retailer host
+DNS_CACHE_TTL = 300             # Seconds to cache DNS lookups
+KEEPALIVE_TIMEOUT = 30          # Seconds to keep idle connections open
 
 # Cache settings
 CACHE_ENABLED = True
 CACHE_DURATION = 3600  # 1 hour
 CACHE_DIR = DATA_DIR / 'cache'
+CACHE_MEMORY_ENTRIES = 5000  # Results kept in the in-process LRU tier
+CACHE_WRITE_BATCH = 50       # Buffered cache writes per SQLite transaction
+CACHE_FLUSH_DELAY = 1.0      # Seconds a partial batch waits before flushing
+
+# Per-retailer TTL in seconds, overriding CACHE_DURATION
+CACHE_TTL_OVERRIDES = {
+    'amazon': 1800,  # Amazon reprices frequently
+}
+
+# Storage settings (SQLite cache and results store)
+DB_PATH = Path(os.getenv('DB_PATH', DATA_DIR / 'price_history.db'))
+RESULTS_JSON_EXPORT = True  # Also write each run to data/results/*.json
+JOURNAL_RETENTION = 7 * 24 * 3600  # Seconds a run stays resumable
+RUN_ID = os.getenv('RUN_ID')  # Default --run-id, so a restarted container resumes its run
+CONDITIONAL_REQUESTS = True  # Revalidate stale results with ETag / Last-Modified
+VALIDATOR_RETENTION = 7 * 24 * 3600  # Seconds page validators are kept
+PRICE_HISTORY = True  # Record price changes per retailer and model (enables --changes-only)
+
+# Metrics settings
+METRICS_ENABLED = True  # Time fetch/parse/cache stages and print a run summary
+METRICS_EXPORT = os.getenv('METRICS_EXPORT')  # Optional export file: *.json, else Prometheus text
+
+# Watch mode settings (--watch)
+WATCH_MIN_INTERVAL = 3600       # Seconds before a product is looked up again at a retailer
+WATCH_MAX_INTERVAL = 24 * 3600  # Seconds after which a lookup is overdue whatever its history
 
 # Rate limiting settings
 RATE_LIMIT = {
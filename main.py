@@ -1,128 +1,582 @@
+import argparse
 import json
 import logging
 import asyncio
-from typing import List, Dict
+import functools
+import signal
+import sys
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO,
+    Tuple,
+)
 from pathlib import Path
 from datetime import datetime
-from scrapers.costco_scraper import CostcoScraper
-from scrapers.bestbuy_scraper import BestBuyScraper
-from scrapers.amazon_scraper import AmazonScraper
-from scrapers.visions_scraper import VisionsScraper
-from scrapers.londondrugs_scraper import LondonDrugsScraper
-from scrapers.canadiantire_scraper import CanadianTireScraper
-from scrapers.dufresne_scraper import DufresneScraper
-from scrapers.tanguay_scraper import TanguayScraper
-from scrapers.teppermans_scraper import TeppermansScraper
-from scrapers.lg_scraper import LGScraper
-from scrapers.samsung_scraper import SamsungScraper
-from scrapers.staples_scraper import StaplesScraper
-from config.settings import DATA_DIR, RESULTS_DIR, CONCURRENT_REQUESTS
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/scraper.log'),
-        logging.StreamHandler()
-    ]
+from scrapers import REGISTRY, load_scraper
+from utils.scheduler import ConcurrencyLimiter, DeadlineExceeded, JobScheduler
+from utils.rate_limiter import RateLimiter
+from utils.cache import Cache
+from utils.circuit import CircuitBreaker, CircuitOpenError
+from utils.storage import SQLiteStore
+from utils.journal import EMPTY, FAILED, FOUND, RunJournal
+from utils.history import PriceChange, PriceHistory
+from utils.results import PriceResult, format_cents
+from utils.refresh import RefreshScheduler
+from utils.singleflight import SingleFlight
+from utils.metrics import Metrics
+from utils.product_io import open_output, read_products, write_jsonl
+from config.settings import (
+    LOGS_DIR, RESULTS_DIR, CONCURRENT_REQUESTS,
+    CACHE_DURATION, CACHE_TTL_OVERRIDES, RESULTS_JSON_EXPORT, JOURNAL_RETENTION,
+    METRICS_EXPORT, VALIDATOR_RETENTION, PRICE_HISTORY, PRODUCT_DEADLINE, RETAILER_DEADLINES,
+    RUN_ID,
 )
 
+if TYPE_CHECKING:
+    from scrapers.base_scraper import BaseScraper
+
 logger = logging.getLogger(__name__)
 
+CACHE_MODES = ('on', 'off', 'refresh')
+
+# Job position of the step that restores a resumed product's journaled results
+RESTORE = -1
+
+# (product index, product, results), once every retailer has answered for a product
+Answer = Tuple[int, Dict, List[PriceResult]]
+
+def configure_logging() -> None:
+    """Log to the console and logs/scraper.log; done by the CLI, not on import,
+    so importing this module (tests, benchmarks) leaves logs/ alone"""
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            # Opened on the first record
+            logging.FileHandler(LOGS_DIR / 'scraper.log', delay=True),
+            logging.StreamHandler()
+        ]
+    )
+
+def log_failure(scraper: 'BaseScraper', error: BaseException) -> None:
+    if isinstance(error, CircuitOpenError):
+        # The breaker already logged the trip; one line per skipped product is noise
+        logger.debug(f"Skipped {scraper.__class__.__name__}: {str(error)}")
+    elif isinstance(error, DeadlineExceeded):
+        logger.warning(f"Gave up on {scraper.__class__.__name__}: {str(error)}")
+    else:
+        logger.error(f"Error with {scraper.__class__.__name__}: {str(error)}")
+
 class PriceScraper:
-    def __init__(self, retailer: str = 'all'):
-        # Dictionary of available scrapers
-        self.available_scrapers = {
-            'visions': VisionsScraper,
-            'canadiantire': CanadianTireScraper,
-            'costco': CostcoScraper,
-            'bestbuy': BestBuyScraper,
-            'amazon': AmazonScraper,
-            'londondrugs': LondonDrugsScraper,
-            'dufresne': DufresneScraper,
-            'tanguay': TanguayScraper,
-            'teppermans': TeppermansScraper,
-            'lg': LGScraper,
-            'samsung': SamsungScraper,
-            'staples': StaplesScraper,
-            'all': None
-        }
+    def __init__(self, retailer: str = 'all', concurrency: Optional[int] = None,
+                 cache_mode: str = 'on', store: Optional[SQLiteStore] = None):
+        # ``retailer`` may be a comma-separated list; only those scraper modules are imported
+        names = [name.strip().lower() for name in retailer.split(',') if name.strip()]
+        if not names or 'all' in names:
+            names = list(REGISTRY)
+        elif not all(name in REGISTRY for name in names):
+            options = ', '.join([*REGISTRY, 'all'])
+            raise ValueError(f"Invalid retailer. Available options: {options}")
 
-        # Initialize selected scrapers
-        if retailer.lower() == 'all':
-            self.scrapers = [
-                scraper() for scraper in self.available_scrapers.values()
-                if scraper is not None
-            ]
-        elif retailer.lower() in self.available_scrapers:
-            self.scrapers = [self.available_scrapers[retailer.lower()]()]
-        else:
-            raise ValueError(f"Invalid retailer. Available options: {', '.join(self.available_scrapers.keys())}")
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode '{cache_mode}'. "
+                             f"Available options: {', '.join(CACHE_MODES)}")
+
+        # Deferred until a run is set up, so --help, argument errors and the
+        # prompts don't wait for aiohttp and lxml to import
+        from utils.parsing import ParseExecutor
+        from utils.retry import RetryPolicy
+        from utils.session import SessionManager
 
-    async def scrape_product(self, product_name: str) -> List[Dict]:
+        scraper_classes = [load_scraper(name) for name in dict.fromkeys(names)]
+
+        # Global and per-retailer request slots and rate budgets shared by all scrapers
+        self.limiter = ConcurrencyLimiter(concurrency or CONCURRENT_REQUESTS)
+        self.rate_limiter = RateLimiter()
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.store = store if store is not None else SQLiteStore()
+        self.cache = Cache(self.store, enabled=cache_mode != 'off', refresh=cache_mode == 'refresh')
+        # Selectors are compiled once here and in every parse worker
+        self.parser = ParseExecutor(specs=[cls.spec for cls in scraper_classes])
+        self.flights = SingleFlight()
+        self.metrics = Metrics()
+        self.scrapers: List['BaseScraper'] = [
+            cls(cache=self.cache, rate_limiter=self.rate_limiter, limiter=self.limiter,
+                retry_policy=self.retry_policy, breaker=self.breaker, flights=self.flights,
+                metrics=self.metrics, parser=self.parser)
+            for cls in scraper_classes
+        ]
+        # Where to export metrics at the end of a run (*.json, else Prometheus text)
+        self.metrics_export = METRICS_EXPORT
+        # Latest price per (retailer, model) and a log of changes; None when disabled
+        self.history = PriceHistory(self.store) if PRICE_HISTORY else None
+        self._by_retailer = {scraper.retailer: scraper for scraper in self.scrapers}
+        self.scheduler = JobScheduler()
+        # Seconds a product waits for its retailers before keeping the results it has
+        self.product_deadline = PRODUCT_DEADLINE
+        # Products answered by an identical query already in flight
+        self.duplicates = 0
+
+        # One pooled session for the whole run, borrowed by every scraper
+        self.session_manager = SessionManager()
+
+    async def __aenter__(self) -> 'PriceScraper':
+        session = await self.session_manager.open()
+        for scraper in self.scrapers:
+            scraper.session = session
+
+        # Expire stale entries through the timestamp index before the run starts
+        max_ttl = max([CACHE_DURATION, *CACHE_TTL_OVERRIDES.values()])
+        purged = await self.cache.purge_expired(max_ttl)
+        if purged:
+            logger.info(f"Purged {purged} expired cache entries")
+        await self.store.purge_journal_async(JOURNAL_RETENTION)
+        await self.store.purge_validators_async(VALIDATOR_RETENTION)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # Lookups left running past a deadline must not outlive the session and store
+        await self.flights.cancel_all()
+        for scraper in self.scrapers:
+            scraper.session = None
+        await self.session_manager.close()
+        await self.cache.close()
+        self.store.close()
+        self.parser.shutdown()
+
+    async def scrape_product(self, product_name: str) -> List[PriceResult]:
         """Scrape prices for a single product"""
         results = []
-        tasks = []
+        async for _, _, found in self.iter_product_results([{'name': product_name}]):
+            results = found
+        return results
 
-        for scraper in self.scrapers:
-            task = asyncio.create_task(scraper.scrape(product_name))
-            tasks.append(task)
+    def _jobs(self, products: Iterable[Dict], pending: Dict[int, Dict],
+              leaders: Dict[Tuple, int], journal: Optional[RunJournal] = None) -> Iterator[Tuple]:
+        """Expand products into independent (product, retailer) jobs.
 
-        completed_tasks = await asyncio.gather(*tasks, return_exceptions=True)
+        A product searched by the same queries as one still in flight (e.g. the
+        same model number under different marketing text) is not scheduled;
+        it is answered with that product's results instead. With
+        a journal, finished products are skipped and retailers already
+        settled for a product are replaced by one step restoring their results.
+        """
+        for index, product in enumerate(products):
+            if journal is not None and journal.is_complete(product):
+                journal.stats['skipped_products'] += 1
+                continue
 
-        for scraper, result in zip(self.scrapers, completed_tasks):
-            if isinstance(result, Exception):
-                logger.error(f"Error with {scraper.__class__.__name__}: {str(result)}")
+            query = tuple(scraper.get_cache_key(product['name']) for scraper in self.scrapers)
+            if query in leaders:
+                pending[leaders[query]]['followers'].append((index, product))
+                self.duplicates += 1
                 continue
-            if result:
-                results.extend(result)
+            leaders[query] = index
+            settled = journal.settled(product) if journal is not None else set()
+            positions = [
+                position for position, scraper in enumerate(self.scrapers)
+                if scraper.retailer not in settled
+            ]
+            restore = len(positions) < len(self.scrapers)
 
-        return results
+            product_name = product['name']
+            logger.info(f"Scraping prices for: {product_name}")
+            deadline_at = None
+            if self.product_deadline is not None:
+                deadline_at = asyncio.get_running_loop().time() + self.product_deadline
+            pending[index] = {
+                'product': product,
+                'remaining': len(positions) + restore,
+                'results': [None] * len(self.scrapers),
+                'failed': False,
+                'query': query,
+                'followers': [],
+            }
+            if restore and journal is not None:
+                yield (index, RESTORE), functools.partial(journal.restore, product)
+            for position in positions:
+                yield (index, position), functools.partial(self.search, self.scrapers[position],
+                                                           product_name, deadline_at)
+
+    def retailer_deadline(self, retailer: str) -> Optional[float]:
+        return RETAILER_DEADLINES.get(retailer, RETAILER_DEADLINES.get('default'))
+
+    async def search(self, scraper: 'BaseScraper', product_name: str,
+                     deadline_at: Optional[float] = None,
+                     fresh: bool = False) -> Optional[List[PriceResult]]:
+        """``scraper.search`` within the retailer's deadline and the product's
+        ``deadline_at`` (loop time); ``fresh`` skips the result cache.
+
+        A lookup past its deadline raises ``DeadlineExceeded``, so it counts
+        as failed (a resumed run retries it). The lookup itself is shared
+        through SingleFlight and keeps running, so a late answer still
+        reaches the cache, until the run ends (see ``__aexit__``).
+        """
+        timeout = self.retailer_deadline(scraper.retailer)
+        if deadline_at is not None:
+            remaining = max(0.0, deadline_at - asyncio.get_running_loop().time())
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        if timeout is None:
+            return await scraper.search(product_name, fresh)
+
+        lookup = asyncio.ensure_future(scraper.search(product_name, fresh))
+        try:
+            done, _ = await asyncio.wait({lookup}, timeout=timeout)
+        finally:
+            if not lookup.done():
+                lookup.cancel()
+        if done:
+            return lookup.result()
+        self.metrics.inc('deadline_exceeded', retailer=scraper.retailer)
+        raise DeadlineExceeded(f"No answer from {scraper.website} within {timeout:.1f}s")
+
+    async def iter_product_results(self, products: Iterable[Dict],
+                                   journal: Optional[RunJournal] = None) -> AsyncIterator[Answer]:
+        """Yield (product index, product, results) as soon as every retailer has
+        answered for a product.
+
+        ``products`` is consumed lazily, so it can be a generator over a file
+        of any size. With a ``journal`` every answer is checkpointed, and a
+        product without failures is marked done once the caller has consumed it.
+        """
+        pending: Dict[int, Dict] = {}
+        leaders: Dict[Tuple, int] = {}
+
+        jobs = self._jobs(products, pending, leaders, journal)
+        async for (index, position), result in self.scheduler.run(jobs):
+            entry = pending[index]
+            if position == RESTORE:
+                self._restore(entry, result, journal)
+            else:
+                scraper = self.scrapers[position]
+                if isinstance(result, BaseException):
+                    log_failure(scraper, result)
+                    entry['failed'] = True
+                    status = FAILED
+                elif result:
+                    entry['results'][position] = result
+                    status = FOUND
+                else:
+                    status = EMPTY
+                if journal is not None:
+                    records = [found.to_dict() for found in result] if status == FOUND else None
+                    await journal.record(entry['product'], scraper.retailer, status, records)
+
+            entry['remaining'] -= 1
+            if entry['remaining'] == 0:
+                del pending[index]
+                del leaders[entry['query']]
+                # Keep retailer order stable regardless of completion order
+                results = [item for found in entry['results'] if found for item in found]
+                for answered, product in [(index, entry['product']), *entry['followers']]:
+                    yield answered, product, results
+                    # Products with failed retailers stay open so a resumed run retries them
+                    if journal is not None and not entry['failed']:
+                        await journal.complete(product)
+
+    def _restore(self, entry: Dict, restored: Any, journal: Optional[RunJournal]) -> None:
+        """Place results journaled by an earlier attempt of the run"""
+        if isinstance(restored, BaseException):
+            logger.error(f"Could not restore journaled results for {entry['product']['name']}: "
+                         f"{str(restored)}")
+            return
+        for position, scraper in enumerate(self.scrapers):
+            if scraper.retailer in restored:
+                entry['results'][position] = scraper._from_records(restored[scraper.retailer])
+                if journal is not None:
+                    journal.stats['restored_pairs'] += 1
+
+    async def record_history(self, product: Dict, results: List[PriceResult],
+                             run_id: Optional[str] = None) -> List[PriceChange]:
+        """Record ``product``'s prices in the price history and return the ones that changed"""
+        if self.history is None or not results:
+            return []
+        observations = []
+        for result in results:
+            scraper = self._by_retailer.get(result.retailer)
+            if scraper is not None:
+                model = scraper.get_cache_key(product['name'])
+                observations.append((scraper.retailer, model, result.price_cents))
+        return await self.history.record(observations, run_id)
+
+    def format_changes(self, results: List[PriceResult], changes: List[PriceChange]) -> Dict:
+        """The per-brand output shape holding only changed prices, each with its previous price"""
+        previous = {change.retailer: change.previous_cents for change in changes}
+        changed = [result for result in results if result.retailer in previous]
+        block = self.format_product(changed)
+        for result, entry in zip(changed, block['Product']):
+            cents = previous[result.retailer]
+            entry['PreviousPrice'] = format_cents(cents) if cents is not None else None
+        return block
+
+    @staticmethod
+    def format_product(results: List[PriceResult]) -> Dict:
+        """Group one product's results into the per-brand output shape"""
+        return {
+            'Brand': results[0].brand,
+            'Product': [result.to_output() for result in results]
+        }
 
     async def scrape_prices(self, products: List[Dict]) -> List[Dict]:
         """Scrape prices for multiple products"""
-        all_results = []
-        
-        for product in products:
-            product_name = product['name']
-            logger.info(f"Scraping prices for: {product_name}")
-            
-            results = await self.scrape_product(product_name)
-            
+        completed = {}
+
+        async for index, product, results in self.iter_product_results(products):
             if results:
-                brand = results[0]['brand']
-                all_results.append({
-                    'Brand': brand,
-                    'Product': [
-                        {
-                            'Website': r['website'],
-                            'Title': r['title'],
-                            'Price': r['price'],
-                            'PriceValidTill': r.get('price_valid_till', ''),
-                            'URL': r.get('url', '')
-                        }
-                        for r in results
-                    ]
-                })
-            
-        return all_results
-
-    def save_results(self, results: List[Dict], filename: str = None):
-        """Save results to a JSON file"""
-        if not filename:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            retailer_name = 'all' if len(self.scrapers) > 1 else self.scrapers[0].__class__.__name__.lower().replace('scraper', '')
-            filename = f'data/results/{retailer_name}_prices_{timestamp}.json'
+                completed[index] = self.format_product(results)
+                await self.record_history(product, results)
+
+        self.log_stats()
+        return [completed[index] for index in sorted(completed)]
+
+    async def scrape_to_jsonl(self, products: Iterable[Dict], output: TextIO, run_id: str,
+                              changes_only: bool = False) -> Dict[str, int]:
+        """Scrape ``products`` and write each one's result as a JSONL line when it completes.
+
+        Nothing is held beyond the products in flight, and every finished
+        product is on disk (and in the store) even if the run dies midway.
+        Calling this again with the same ``run_id`` resumes the run from its
+        journal, fetching only what is missing or failed; a product retried
+        this way is written again, and its later line supersedes the earlier.
+
+        With ``changes_only`` a line is written only for products whose price
+        changed (or was first seen) at some retailer, listing just those
+        retailers with their ``PreviousPrice``.
+        """
+        if changes_only and self.history is None:
+            raise ValueError("--changes-only needs PRICE_HISTORY enabled")
+        counts = {'products': 0, 'found': 0, 'changed': 0}
+        journal = await RunJournal(self.store, run_id).load()
+        try:
+            async for _, product, results in self.iter_product_results(products, journal):
+                counts['products'] += 1
+                if not results:
+                    logger.info(f"No prices found for {product['name']}")
+                    continue
+                block = self.format_product(results)
+                await self.store.save_results_async(run_id, [block])
+                changes = await self.record_history(product, results, run_id)
+                counts['found'] += 1
+                counts['changed'] += bool(changes)
+                if changes_only:
+                    if not changes:
+                        continue
+                    block = self.format_changes(results, changes)
+                write_jsonl(output, {'Name': product['name'], **block})
+        finally:
+            self.log_stats()
+            if journal.stats['skipped_products'] or journal.stats['restored_pairs']:
+                logger.info(f"Journal for run {run_id}: {journal.stats}")
+        return counts
+
+    async def watch(self, products: Iterable[Dict], output: TextIO,
+                    refresh: Optional[RefreshScheduler] = None,
+                    duration: Optional[float] = None) -> Dict[str, int]:
+        """Keep refreshing ``products`` until cancelled (or for ``duration`` seconds).
+
+        Instead of sweeping the catalog at one cadence, every retailer's
+        request budget goes to the pairs most likely to have changed (see
+        ``RefreshScheduler``). Each price change is written to ``output``
+        as a JSONL line in the --changes-only shape.
+        """
+        if self.history is None:
+            raise ValueError("--watch needs PRICE_HISTORY enabled")
+        refresh = refresh or RefreshScheduler()
+        for product in products:
+            for scraper in self.scrapers:
+                refresh.add(scraper.retailer, scraper.get_cache_key(product['name']), product)
+        await refresh.load(self.store)
+
+        workers = [
+            asyncio.ensure_future(self._watch_retailer(scraper, refresh, output))
+            for scraper in self.scrapers
+            for _ in range(self.limiter.retailer_limit(scraper.retailer))
+        ]
+        try:
+            await asyncio.wait_for(asyncio.gather(*workers), timeout=duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            logger.info(f"Watch: {refresh.stats}")
+            self.log_stats()
+        return refresh.stats
+
+    async def _watch_retailer(self, scraper: 'BaseScraper', refresh: RefreshScheduler,
+                              output: TextIO) -> None:
+        while True:
+            pair, wait = refresh.next(scraper.retailer)
+            if pair is None:
+                await asyncio.sleep(wait)
+                continue
+
+            product = pair.product
+            try:
+                # A cached answer would tell the scheduler nothing about whether
+                # the price moved, so every refresh asks the retailer
+                results = await self.search(scraper, product['name'], fresh=True)
+            except Exception as e:
+                log_failure(scraper, e)
+                refresh.failed(pair)
+                continue
+
+            found = results or []
+            changes = await self.record_history(product, found)
+            refresh.succeeded(pair, bool(changes))
+            if changes:
+                write_jsonl(output, {'Name': product['name'],
+                                     **self.format_changes(found, changes)})
+
+    def log_stats(self) -> None:
+        if self.duplicates or self.flights.stats['coalesced']:
+            logger.info(
+                f"Coalesced {self.duplicates} duplicate products and "
+                f"{self.flights.stats['coalesced']} in-flight lookups"
+            )
+        if self.retry_policy.retries_spent:
+            logger.info(f"Retries spent per retailer: {dict(self.retry_policy.retries_spent)}")
+        tripped = {retailer: stats for retailer, stats in self.breaker.stats.items()
+                   if stats['opened']}
+        if tripped:
+            logger.info(f"Circuit breaker trips per retailer: {tripped}")
+        limits = self.limiter.current_limits()
+        if any(limit < self.limiter.retailer_limit(retailer) for retailer, limit in limits.items()):
+            logger.info(f"Adapted concurrency per retailer: {limits}")
+        logger.info(f"Cache hit rate {self.cache.hit_rate:.0%}: {self.cache.stats}")
+        structured = {
+            scraper.retailer: f"{scraper.structured_hit_rate:.0%}"
+            for scraper in self.scrapers
+            if scraper.parse_stats['structured'] or scraper.parse_stats['selectors']
+        }
+        if structured:
+            logger.info(f"Structured-data hit rate per retailer: {structured}")
+        if self.history is not None and self.history.stats['observed']:
+            logger.info(f"Price history: {self.history.stats}")
+
+        if self.metrics.enabled and (self.metrics.histograms or self.metrics.counters):
+            logger.info(f"Run metrics:\n{self.metrics.summary()}")
+            if self.metrics_export:
+                try:
+                    self.metrics.write(self.metrics_export)
+                    logger.info(f"Metrics exported to {self.metrics_export}")
+                except OSError as e:
+                    logger.warning(f"Could not export metrics to {self.metrics_export}: {str(e)}")
+
+    def run_name(self) -> str:
+        if len(self.scrapers) > 1:
+            return 'all'
+        return self.scrapers[0].__class__.__name__.lower().replace('scraper', '')
+
+    async def save_results(self, results: List[Dict], filename: str = None):
+        """Save results to the SQLite store and, optionally, a JSON file"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        retailer_name = self.run_name()
+        run_id = f'{retailer_name}_{timestamp}'
+
+        saved = await self.store.save_results_async(run_id, results)
+        logger.info(f"Saved {saved} results to {self.store.db_path} (run {run_id})")
+
+        if filename or RESULTS_JSON_EXPORT:
+            filename = filename or f'data/results/{retailer_name}_prices_{timestamp}.json'
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._write_json, filename, results)
+            logger.info(f"Results saved to {filename}")
 
+    @staticmethod
+    def _write_json(filename: str, results: List[Dict]) -> None:
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Results saved to {filename}")
 
-async def main():
-    # Get user input for retailer
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Scrape TV prices from Canadian retailers.",
+        epilog="Without arguments on a terminal, the scraper prompts for its input.",
+    )
+    parser.add_argument('-r', '--retailers', default='all',
+                        help="comma-separated retailers, or 'all' (default)")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('-i', '--input',
+                        help="products as .jsonl, .csv or .json, or '-' for stdin "
+                             "(JSONL or one name per line; the default when stdin is piped)")
+    source.add_argument('-p', '--product', action='append',
+                        help="product name to scrape; may be repeated")
+    parser.add_argument('-o', '--output',
+                        help="JSONL file to append results to, or '-' for stdout "
+                             "(default: data/results/<run id>.jsonl)")
+    parser.add_argument('-c', '--concurrency', type=int,
+                        help=f"maximum requests in flight (default: {CONCURRENT_REQUESTS})")
+    parser.add_argument('--cache', choices=CACHE_MODES, default='on',
+                        help="'refresh' ignores cached prices but stores the new ones")
+    parser.add_argument('--deadline', type=float, metavar='SECONDS',
+                        help="give up on retailers that haven't answered a product within SECONDS "
+                             "and keep the results that are in (default: wait for all)")
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="export run metrics to PATH (.json, otherwise Prometheus text format)")
+    parser.add_argument('--changes-only', action='store_true',
+                        help="write only prices that changed since they were last seen, "
+                             "with their previous price")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running, spending each retailer's rate budget on the products "
+                             "most likely to have changed, and write price changes as they happen")
+    parser.add_argument('--duration', type=float, metavar='SECONDS',
+                        help="with --watch, stop after this many seconds "
+                             "(default: run until stopped)")
+    parser.add_argument('--run-id', default=RUN_ID,
+                        help="name of the run; re-running with the same id resumes it, "
+                             "skipping finished products and retrying failures "
+                             "(default: $RUN_ID, else a new timestamped run)")
+    return parser.parse_args(argv)
+
+async def run_batch(args: argparse.Namespace) -> int:
+    """Non-interactive run: stream products in, stream JSONL results out"""
+    if args.product:
+        products: Iterable[Dict] = [{'name': name} for name in args.product]
+    else:
+        products = read_products(args.input or '-')
+
+    # Let `docker stop` / SIGTERM unwind cleanly so caches are flushed
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    try:
+        if task is not None:
+            loop.add_signal_handler(signal.SIGTERM, task.cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    try:
+        async with PriceScraper(args.retailers, args.concurrency, args.cache) as scraper:
+            if args.metrics:
+                scraper.metrics_export = args.metrics
+            if args.deadline is not None:
+                scraper.product_deadline = args.deadline
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            run_id = args.run_id or f"{scraper.run_name()}_{timestamp}"
+            output = args.output or str(RESULTS_DIR / f"{run_id}.jsonl")
+            with open_output(output) as handle:
+                if args.watch:
+                    await scraper.watch(products, handle, duration=args.duration)
+                    logger.info(f"Watch {run_id} stopped; price changes written to {output}")
+                    return 0
+                counts = await scraper.scrape_to_jsonl(products, handle, run_id, args.changes_only)
+    except asyncio.CancelledError:
+        logger.warning("Run cancelled; results written so far are kept")
+        return 1
+    except (OSError, ValueError) as e:
+        logger.error(f"Error: {str(e)}")
+        return 1
+
+    logger.info(
+        f"Run {run_id}: prices found for {counts['found']} of {counts['products']} products "
+        f"({counts['changed']} changed), written to {output}"
+    )
+    return 0
+
+def prompt_for_products() -> Optional[Tuple[str, List[Dict]]]:
+    """Ask for a retailer and products on the terminal"""
     print("\nAvailable retailers:")
     print("- all (scrape from all retailers)")
     print("- visions")
@@ -150,35 +604,33 @@ async def main():
     if choice == "1":
         # Single product input
         product = input("\nEnter product name (e.g. Samsung 65\" 4K Tizen Smart QLED TV - QN65Q60DAFXZC): ").strip()
-        products = [{"name": product}]
+        return retailer, [{"name": product}]
     elif choice == "2":
-        # JSON file input
+        # Product file input
         file_path = input("\nEnter path to JSON file (e.g., products.json): ").strip()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                products = json.load(f)
-                if not isinstance(products, list):
-                    print("Error: JSON file must contain an array of products")
-                    return
-                # Verify each product has a name field
-                for product in products:
-                    if not isinstance(product, dict) or 'name' not in product:
-                        print("Error: Each product must have a 'name' field")
-                        return
+            return retailer, list(read_products(file_path))
         except FileNotFoundError:
             print(f"Error: File {file_path} not found")
-            return
         except json.JSONDecodeError:
             print("Error: Invalid JSON format")
-            return
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+        return None
     else:
         print("Invalid choice")
-        return
+        return None
+
+async def run_interactive() -> int:
+    prompted = prompt_for_products()
+    if prompted is None:
+        return 1
+    retailer, products = prompted
 
     try:
-        scraper = PriceScraper(retailer)
-        results = await scraper.scrape_prices(products)
-        scraper.save_results(results)
+        async with PriceScraper(retailer) as scraper:
+            results = await scraper.scrape_prices(products)
+            await scraper.save_results(results)
         
         # Print results to console
         print("\nResults:")
@@ -194,10 +646,16 @@ async def main():
                 
     except ValueError as e:
         print(f"Error: {str(e)}")
+        return 1
+    return 0
+
+async def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    configure_logging()
+    # Prompts only make sense on a terminal; cron, Docker and pipes get the batch CLI
+    if not argv and sys.stdin.isatty():
+        return await run_interactive()
+    return await run_batch(parse_args(argv))
 
 if __name__ == "__main__":
-    # Ensure log directory exists
-    Path('logs').mkdir(exist_ok=True)
-    
-    # Run the scraper
-    asyncio.run(main()) 
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
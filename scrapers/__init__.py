@@ -1,19 +1,58 @@
 """
 Scrapers package for TV price scraping from various retailers.
+
+Scraper modules are imported on first use, so a run only loads the
+retailers it scrapes: ``load_scraper('bestbuy')`` or
+``from scrapers import BestBuyScraper`` both import just that module.
 """
 
-from .visions_scraper import VisionsScraper
-from .amazon_scraper import AmazonScraper
-from .bestbuy_scraper import BestBuyScraper
-from .costco_scraper import CostcoScraper
-from .canadiantire_scraper import CanadianTireScraper
-from .londondrugs_scraper import LondonDrugsScraper
-from .dufresne_scraper import DufresneScraper
-from .tanguay_scraper import TanguayScraper
-from .teppermans_scraper import TeppermansScraper
-from .lg_scraper import LGScraper
-from .samsung_scraper import SamsungScraper
-from .staples_scraper import StaplesScraper
+import importlib
+from typing import TYPE_CHECKING, Dict, List, Type
+
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
+
+# Retailer key -> 'module:Class', in the order results are reported
+REGISTRY: Dict[str, str] = {
+    'visions': 'scrapers.visions_scraper:VisionsScraper',
+    'canadiantire': 'scrapers.canadiantire_scraper:CanadianTireScraper',
+    'costco': 'scrapers.costco_scraper:CostcoScraper',
+    'bestbuy': 'scrapers.bestbuy_scraper:BestBuyScraper',
+    'amazon': 'scrapers.amazon_scraper:AmazonScraper',
+    'londondrugs': 'scrapers.londondrugs_scraper:LondonDrugsScraper',
+    'dufresne': 'scrapers.dufresne_scraper:DufresneScraper',
+    'tanguay': 'scrapers.tanguay_scraper:TanguayScraper',
+    'teppermans': 'scrapers.teppermans_scraper:TeppermansScraper',
+    'lg': 'scrapers.lg_scraper:LGScraper',
+    'samsung': 'scrapers.samsung_scraper:SamsungScraper',
+    'staples': 'scrapers.staples_scraper:StaplesScraper',
+}
+
+_BY_CLASS = {target.split(':')[1]: target for target in REGISTRY.values()}
+
+def _load(target: str) -> Type['BaseScraper']:
+    module, name = target.split(':')
+    return getattr(importlib.import_module(module), name)
+
+def available_retailers() -> List[str]:
+    return list(REGISTRY)
+
+def load_scraper(retailer: str) -> Type['BaseScraper']:
+    """Import and return the scraper class registered for ``retailer``"""
+    target = REGISTRY.get(retailer)
+    if target is None:
+        raise ValueError(f"Invalid retailer '{retailer}'. Available options: {', '.join(REGISTRY)}")
+    return _load(target)
+
+def __getattr__(name: str):
+    target = _BY_CLASS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    cls = globals()[name] = _load(target)
+    return cls
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
 
 __all__ = [
     'VisionsScraper',
@@ -28,4 +67,6 @@ __all__ = [
     'LGScraper',
     'SamsungScraper',
     'StaplesScraper',
+    'available_retailers',
+    'load_scraper',
 ]
@@ -1,38 +1,484 @@
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from abc import ABC
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Union
 import aiohttp
 import asyncio
+import functools
 import re
 import logging
-import os
-import json
-from bs4 import BeautifulSoup
-from utils.cache import Cache
+import time
+import urllib.parse
+from utils.cache import Cache, Validator
+from utils.circuit import CircuitBreaker, CircuitOpenError
 from utils.rate_limiter import RateLimiter
-from config.settings import REQUEST_TIMEOUT, MAX_RETRIES, RETRY_DELAY
+from utils.scheduler import ConcurrencyLimiter, LatencyWindow
+from utils.retry import RetryPolicy
+from utils.metrics import SIZE_BUCKETS, Metrics
+from utils.session import ResponseTooLarge, accept_encoding
+from utils.singleflight import SingleFlight
+from utils.query import canonical_query, normalize_query
+from utils.parsing import ExtractionSpec, ParseExecutor, TileExtractor, extract_product
+from utils.matching import best_match
+from utils.results import PriceResult, retailer_key, to_cents
+from config.settings import (
+    REQUEST_TIMEOUT, REQUEST_DEADLINE, CACHE_DURATION, CACHE_TTL_OVERRIDES,
+    PARSE_STREAMING, PARSE_CHUNK_SIZE, STRUCTURED_DATA, CONDITIONAL_REQUESTS, MAX_RESPONSE_BYTES,
+    HEDGE_RETAILERS, HEDGE_QUANTILE, MATCH_CANDIDATES, MATCH_MIN_CONFIDENCE,
+)
 
 logger = logging.getLogger(__name__)
 
+# Consumes a successful response in place of reading it as text
+Reader = Callable[[aiohttp.ClientResponse], Awaitable[Any]]
+
+# Returned by make_request when a conditional request gets 304 Not Modified
+NOT_MODIFIED = object()
+
+# Statuses that mean the retailer is struggling or pushing back, not that the page is missing
+OVERLOAD_STATUSES = {403, 429, 500, 502, 503, 504}
+
+# A comma before the last two digits is a French-Canadian decimal comma ('1 299,99 $');
+# any other comma separates thousands ('$1,299.99')
+_DECIMAL_COMMA = re.compile(r',(\d{2})$')
+
+class Page(NamedTuple):
+    """What a reader made of a response, with the response's validators and charset"""
+    content: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    encoding: Optional[str] = None
+
 class BaseScraper(ABC):
-    def __init__(self):
+    """Generic search-page scraper driven by per-retailer declarations.
+
+    Subclasses set the attributes below; ``scrape`` fetches
+    ``base_url + search_path`` and applies ``spec`` to the first product tile.
+    """
+
+    # Key used for per-retailer settings (rate limits, concurrency, ...)
+    retailer = 'default'
+    # Retailer name reported in results
+    website = ''
+    base_url = ''
+    # Search path appended to base_url; {query} is the URL-encoded product name
+    search_path = ''
+    # Every scraper declares one
+    spec: ExtractionSpec
+    # Fixed brand for single-brand stores; None guesses it from the product name
+    brand: Optional[str] = None
+    # Try embedded JSON (JSON-LD, __NEXT_DATA__) before the spec's selectors
+    structured_data = STRUCTURED_DATA
+    # Search by the product's model number rather than its full marketing name
+    search_by_model = True
+    # Revalidate stale results with If-None-Match / If-Modified-Since
+    conditional_requests = CONDITIONAL_REQUESTS
+    # Decompressed size at which a page is abandoned rather than read on
+    max_response_bytes = MAX_RESPONSE_BYTES
+    # Products read per search page and ranked against the query; 1 trusts the first
+    match_candidates = MATCH_CANDIDATES
+
+    def __init__(self, *,
+                 cache: Optional[Cache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 limiter: Optional[ConcurrencyLimiter] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None,
+                 flights: Optional[SingleFlight] = None,
+                 metrics: Optional[Metrics] = None,
+                 parser: Optional[ParseExecutor] = None):
+        """The keyword arguments are shared with the other scrapers of a run
+        (see ``PriceScraper``); any left out get a private instance."""
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                           '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'),
+            # Only codecs that can be decoded here; brotli is an optional install
+            'Accept-Encoding': accept_encoding(),
         }
-        self.cache = Cache()
-        self.rate_limiter = RateLimiter()
+        self.cache = cache if cache is not None else Cache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        # Shared pooled session, attached by PriceScraper; None means standalone use
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Request slots; None means unlimited
+        self.limiter = limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        # Fails fast on retailers that keep failing
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        # Send a second attempt when one outlasts the usual latency (HEDGE_RETAILERS opt in)
+        self.hedge = self.retailer in HEDGE_RETAILERS
+        self.latencies = LatencyWindow()
+        # Coalesces identical lookups in flight
+        self.flights = flights if flights is not None else SingleFlight()
+        # Stage timings and counters
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Parse pool; None means parse inline
+        self.parser = parser
+        self.stream_parse = PARSE_STREAMING
+        # Where extracted products came from, for fast-path hit rates
+        self.parse_stats: Dict[str, int] = {'structured': 0, 'selectors': 0, 'missed': 0}
 
-    @abstractmethod
     async def scrape(self, product_name: str) -> Optional[List[Dict]]:
-        pass
+        """Like ``search``, but returns plain dicts, and logs failures and returns None
+        instead of raising"""
+        try:
+            results = await self.search(product_name)
+        except Exception as e:
+            logger.error(f"Error in {self.website} scraper: {str(e)}")
+            return None
+        return [result.to_dict() for result in results] if results is not None else None
+
+    async def search(self, product_name: str, fresh: bool = False) -> Optional[List[PriceResult]]:
+        """Look up ``product_name``; None when the retailer has no match.
+
+        Request and parse failures propagate so callers can tell a failed
+        lookup from one that found nothing. Concurrent lookups of the same
+        normalized query at this retailer share one request. A ``fresh``
+        lookup skips the result cache and asks the retailer again (still
+        conditionally, when the page's validators are stored).
+        """
+        key = (self.retailer, self.get_cache_key(product_name), fresh)
+        return await self.flights.do(key, lambda: self._search(product_name, fresh))
+
+    async def _search(self, product_name: str, fresh: bool = False) -> Optional[List[PriceResult]]:
+        with self.metrics.timer('scrape', retailer=self.retailer):
+            return await self._lookup(product_name, fresh)
+
+    async def _lookup(self, product_name: str,
+                      fresh: bool = False) -> Optional[List[PriceResult]]:
+        if not fresh:
+            with self.metrics.timer('cache', retailer=self.retailer):
+                cached_result = await self.get_cached_result(product_name)
+            self.metrics.inc('cache_lookups', retailer=self.retailer,
+                             result='hit' if cached_result else 'miss')
+            if cached_result:
+                return cached_result
+
+        search_url = self.build_search_url(product_name)
+        validator = await self.get_validator(search_url)
+        # Bodies stay bytes so lxml decodes them itself, without a str copy
+        reader = self._stream_tiles if self.stream_parse else self._read_body
+        page = await self.make_request(search_url,
+                                       headers=validator.headers() if validator else None,
+                                       reader=functools.partial(self._read_page, reader))
+
+        if page is NOT_MODIFIED and validator is not None:
+            # The page is unchanged, so its earlier result still holds; nothing to parse
+            self.metrics.inc('not_modified', retailer=self.retailer)
+            result = self._from_records(validator.value)
+            await self.cache_result(product_name, result)
+            return result
+
+        if page is NOT_MODIFIED or page is None:
+            item = None
+        elif self.stream_parse:
+            item = best_match(product_name, page.content) if page.content else None
+            self.metrics.inc('extracted', retailer=self.retailer,
+                             source='stream' if item else 'missed')
+        else:
+            item = None
+            if page.content:
+                item = await self.extract(page.content, self.spec, page.encoding, product_name)
+
+        confidence = item.get('confidence') if item else None
+        if item and confidence is not None and confidence < MATCH_MIN_CONFIDENCE:
+            logger.info(f"Best match for {product_name} at {self.website} is too uncertain "
+                        f"({confidence:.2f}): {item['title']}")
+            item = None
+
+        found = None
+        if item and item['price'] and item['title']:
+            found = self.build_result(product_name, item, search_url)
+        if found is not None:
+            result = [found]
+            await self.cache_result(product_name, result)
+            await self.set_validator(search_url, page, result)
+            return result
+
+        logger.info(f"No results found for {product_name} at {self.website}. URL: {search_url}")
+        return None
+
+    def search_query(self, product_name: str) -> str:
+        """What is sent to the retailer's search for ``product_name``"""
+        if self.search_by_model:
+            return canonical_query(product_name)
+        return normalize_query(product_name)
+
+    def build_search_url(self, product_name: str) -> str:
+        encoded_query = urllib.parse.quote(self.search_query(product_name))
+        return f"{self.base_url}{self.search_path.format(query=encoded_query)}"
+
+    def build_result(self, product_name: str, item: Dict[str, Any],
+                     search_url: str) -> Optional[PriceResult]:
+        """Turn the fields extracted from a product tile into a result;
+        None if its price doesn't parse"""
+        price_cents = to_cents(self.clean_price(item['price']))
+        if price_cents is None:
+            logger.info(f"Unreadable price {item['price']!r} for {product_name} at {self.website}")
+            return None
+
+        href = item.get('url')
+        if not href:
+            url = search_url
+        elif href.startswith(('http://', 'https://')):
+            url = href
+        else:
+            url = f"{self.base_url}{href}"
+
+        return PriceResult(
+            retailer=retailer_key(self.retailer),
+            brand=self.brand or self.extract_brand(product_name),
+            website=self.website,
+            title=item['title'],
+            price_cents=price_cents,
+            url=url,
+            price_valid_till='',
+            confidence=item.get('confidence'),
+        )
+
+    async def make_request(self, url: str, params: Optional[Dict] = None,
+                           reader: Optional[Reader] = None,
+                           headers: Optional[Dict[str, str]] = None) -> Any:
+        """Make an async HTTP request.
+
+        Returns the body as text, or whatever ``reader`` returns when given one
+        to consume a successful response (e.g. to parse it while streaming).
+        Bodies over ``max_response_bytes`` raise ``ResponseTooLarge``.
+        ``headers`` are sent on top of the scraper's own; a conditional request
+        answered with 304 returns ``NOT_MODIFIED``.
+        """
+        with self.metrics.timer('fetch', retailer=self.retailer):
+            if self.session is not None and not self.session.closed:
+                return await self._fetch(self.session, url, params, reader, headers)
+
+            # Standalone scraper without a shared pool: fall back to a one-off session
+            async with aiohttp.ClientSession() as session:
+                return await self._fetch(session, url, params, reader, headers)
+
+    async def _fetch(self, session: aiohttp.ClientSession, url: str,
+                     params: Optional[Dict] = None, reader: Optional[Reader] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Any:
+        """Fetch ``url``, retrying transient failures within REQUEST_DEADLINE"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REQUEST_DEADLINE
+        attempt = 0
+
+        while True:
+            remaining = deadline - loop.time()
+            timeout = aiohttp.ClientTimeout(total=min(REQUEST_TIMEOUT, remaining))
+            try:
+                return await self._hedged_attempt(session, url, params, timeout, reader, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.metrics.inc('request_errors', retailer=self.retailer,
+                                 error=e.__class__.__name__)
+                retryable = self.retry_policy.is_retryable(e)
+                if attempt >= self.retry_policy.max_retries or not retryable:
+                    raise
+
+                retry_after = None
+                if isinstance(e, aiohttp.ClientResponseError) and e.headers:
+                    retry_after = self.retry_policy.parse_retry_after(e.headers.get('Retry-After'))
+                delay = self.retry_policy.delay(attempt, retry_after)
+
+                if loop.time() + delay >= deadline or not self.retry_policy.spend(self.retailer):
+                    raise
 
-    async def make_request(self, url: str, params: Optional[Dict] = None) -> str:
-        """Make an async HTTP request"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=self.headers) as response:
+                logger.warning(
+                    f"{self.__class__.__name__} retry {attempt + 1}/{self.retry_policy.max_retries}"
+                    f" in {delay:.1f}s for {url}: {e.__class__.__name__} {str(e)}"
+                )
+                self.metrics.inc('retries', retailer=self.retailer)
+                # Sleep outside the request slot so other jobs keep flowing
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _hedged_attempt(self, session: aiohttp.ClientSession, url: str,
+                              params: Optional[Dict], timeout: aiohttp.ClientTimeout,
+                              reader: Optional[Reader],
+                              headers: Optional[Dict[str, str]] = None) -> Any:
+        """``_attempt``, plus a second one if the first outlasts HEDGE_QUANTILE of recent latencies.
+
+        Whichever succeeds first is used and the other is cancelled; the
+        hedge goes through the same rate limit, slot and breaker, so it is
+        only sent when the retailer has budget for it.
+        """
+        attempt = functools.partial(self._attempt, session, url, params, timeout, reader, headers)
+        delay = self.latencies.quantile(HEDGE_QUANTILE) if self.hedge else None
+        if delay is None:
+            return await attempt()
+
+        primary = asyncio.ensure_future(attempt())
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+            self.metrics.inc('hedged', retailer=self.retailer)
+            hedge = asyncio.ensure_future(attempt())
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.exception():
+                        if task is hedge:
+                            self.metrics.inc('hedge_won', retailer=self.retailer)
+                        return task.result()
+            # Both failed; the original attempt's error decides whether to retry
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _attempt(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict],
+                       timeout: aiohttp.ClientTimeout, reader: Optional[Reader],
+                       headers: Optional[Dict[str, str]] = None) -> Any:
+        # An open circuit fails before spending rate budget or a slot
+        try:
+            probe = self.breaker.check(self.retailer)
+        except CircuitOpenError:
+            self.metrics.inc('circuit_rejected', retailer=self.retailer)
+            raise
+        get = functools.partial(self._observed_get, session, url, params, timeout, reader, headers,
+                                probe)
+        try:
+            # Wait for rate budget before taking a slot so throttled retailers don't hold one
+            with self.metrics.timer('rate_wait', retailer=self.retailer):
+                await self.rate_limiter.wait(self.retailer)
+            if self.limiter is None:
+                return await get()
+            async with self.limiter.slot(self.retailer):
+                return await get()
+        except asyncio.CancelledError:
+            if probe is not None:
+                self.breaker.release(self.retailer, probe)
+            raise
+
+    async def _observed_get(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict],
+                            timeout: aiohttp.ClientTimeout, reader: Optional[Reader],
+                            headers: Optional[Dict[str, str]] = None,
+                            probe: Optional[int] = None) -> Any:
+        """``_get``, reporting how the retailer coped to the breaker and the limiter"""
+        start = time.perf_counter()
+        try:
+            result = await self._get(session, url, params, timeout, reader, headers)
+        except Exception as e:
+            if not self._is_overload(e):
+                # The retailer answered; the page itself was the problem
+                self.breaker.record_success(self.retailer, probe)
+            else:
+                if self.limiter is not None:
+                    self.limiter.failed(self.retailer)
+                if self.breaker.record_failure(self.retailer, probe):
+                    self.metrics.inc('circuit_open', retailer=self.retailer)
+            raise
+        latency = time.perf_counter() - start
+        self.breaker.record_success(self.retailer, probe)
+        self.latencies.add(latency)
+        if self.limiter is not None:
+            self.limiter.succeeded(self.retailer, latency)
+        return result
+
+    @staticmethod
+    def _is_overload(e: Exception) -> bool:
+        """Whether ``e`` suggests the retailer is down, overloaded or throttling us"""
+        if isinstance(e, aiohttp.ClientResponseError):
+            return e.status in OVERLOAD_STATUSES
+        return isinstance(e, (asyncio.TimeoutError, aiohttp.ClientConnectionError,
+                              aiohttp.ClientPayloadError))
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, params: Optional[Dict],
+                   timeout: aiohttp.ClientTimeout, reader: Optional[Reader],
+                   headers: Optional[Dict[str, str]] = None) -> Any:
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        with self.metrics.timer('request', retailer=self.retailer):
+            async with session.get(url, params=params, headers=request_headers,
+                                   timeout=timeout) as response:
+                self.metrics.inc('responses', retailer=self.retailer, status=response.status)
+                if response.status == 304:
+                    return NOT_MODIFIED
                 if response.status == 200:
-                    return await response.text()
+                    if reader is not None:
+                        return await reader(response)
+                    return await self._read_text(response)
                 response.raise_for_status()
 
+    async def _read_text(self, response: aiohttp.ClientResponse) -> str:
+        body = await self._read_body(response)
+        try:
+            return body.decode(response.charset or 'utf-8', errors='replace')
+        except LookupError:
+            # Unknown charset label from the server
+            return body.decode('utf-8', errors='replace')
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """Read the decompressed body, giving up once it passes ``max_response_bytes``"""
+        limit = self.max_response_bytes
+        with self.metrics.timer('read', retailer=self.retailer):
+            # Content-Length is the encoded size, so it can only rule a page out early
+            if response.content_length is not None and response.content_length > limit:
+                raise self._too_large(response)
+            chunks = []
+            size = 0
+            async for chunk in response.content.iter_any():
+                size += len(chunk)
+                if size > limit:
+                    raise self._too_large(response)
+                chunks.append(chunk)
+        self.metrics.observe('response_bytes', size, SIZE_BUCKETS, retailer=self.retailer)
+        return b''.join(chunks)
+
+    def _too_large(self, response: aiohttp.ClientResponse) -> ResponseTooLarge:
+        # Raising inside the request closes the connection instead of draining it
+        self.metrics.inc('oversized', retailer=self.retailer)
+        return ResponseTooLarge(f"{response.url} is larger than {self.max_response_bytes} bytes")
+
+    @staticmethod
+    async def _read_page(reader: Reader, response: aiohttp.ClientResponse) -> Page:
+        """Run ``reader`` and keep the response's validators for revalidation"""
+        return Page(await reader(response), response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'), response.charset)
+
+    async def _stream_tiles(self,
+                            response: aiohttp.ClientResponse) -> List[Dict[str, Optional[str]]]:
+        """Parse tiles as the body arrives and stop downloading once they're read.
+
+        Embedded JSON is often at the end of the page, so streaming skips
+        the structured-data fast path.
+        """
+        extractor = TileExtractor(self.spec, limit=self.match_candidates, encoding=response.charset)
+        size = 0
+        async for chunk in response.content.iter_chunked(PARSE_CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_response_bytes:
+                raise self._too_large(response)
+            if extractor.feed(chunk):
+                break
+        return extractor.close()
+
+    async def extract(self, html_content: Union[str, bytes], spec: ExtractionSpec,
+                      encoding: Optional[str] = None,
+                      query: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Extract the product from a search page.
+
+        Embedded structured data is used when present, falling back to the
+        product tiles described by ``spec``. With a ``query`` the best match
+        among the first ``match_candidates`` products is returned, with a
+        'confidence' score; otherwise the first product. Raw bytes are
+        decoded by the parser as ``encoding`` (the response charset).
+        """
+        args = (html_content, spec, self.structured_data, encoding, query, self.match_candidates)
+        with self.metrics.timer('parse', retailer=self.retailer):
+            if self.parser is None:
+                item, source = extract_product(*args)
+            else:
+                item, source = await self.parser.run(extract_product, *args)
+        self.parse_stats[source or 'missed'] += 1
+        self.metrics.inc('extracted', retailer=self.retailer, source=source or 'missed')
+        return item
+
+    @property
+    def structured_hit_rate(self) -> float:
+        """Share of extracted products that came from embedded structured data"""
+        found = self.parse_stats['structured'] + self.parse_stats['selectors']
+        return self.parse_stats['structured'] / found if found else 0.0
+
     def extract_brand(self, product_name: str) -> str:
         brands = ['Samsung', 'LG', 'Hisense', 'SONY']
         for brand in brands:
@@ -41,37 +487,58 @@ class BaseScraper(ABC):
         return 'Unknown'
 
     def clean_price(self, price: str) -> str:
-        return re.sub(r'[^\d.]', '', price)
-
-    def _get_safe_filename(self, filename: str) -> str:
-        """Convert string to a safe filename by removing or replacing invalid characters"""
-        safe_filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-        safe_filename = safe_filename.replace('"', '').replace("'", "")
-        safe_filename = safe_filename[:200]
-        return safe_filename
-
-    def get_cache_path(self, product_name: str) -> str:
-        """Get the cache file path for a product"""
-        safe_name = self._get_safe_filename(product_name)
-        return os.path.join('data', 'cache', f"{self.__class__.__name__}_{safe_name}.json")
-
-    def get_cached_result(self, product_name: str) -> Optional[List[Dict]]:
-        """Get cached results for a product if they exist"""
+        """Digits and decimal point of a displayed price ('$1,299.99' or '1 299,99 $')"""
+        digits = re.sub(r'[^\d.,]', '', price)
+        if '.' not in digits:
+            digits = _DECIMAL_COMMA.sub(r'.\1', digits)
+        return digits.replace(',', '')
+
+    def get_cache_key(self, product_name: str) -> str:
+        """Get the cache key for a product at this retailer: the query it is searched by"""
+        return self.search_query(product_name)
+
+    @property
+    def cache_ttl(self) -> float:
+        return CACHE_TTL_OVERRIDES.get(self.retailer, CACHE_DURATION)
+
+    async def get_cached_result(self, product_name: str) -> Optional[List[PriceResult]]:
+        """Get cached results for a product if they exist and haven't expired"""
         try:
-            cache_path = self.get_cache_path(product_name)
-            if os.path.exists(cache_path):
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            records = await self.cache.get(self.retailer, self.get_cache_key(product_name),
+                                           ttl=self.cache_ttl)
         except Exception as e:
             logger.warning(f"Cache read error for {product_name}: {str(e)}")
+            return None
+        return self._from_records(records) if records else None
+
+    def _from_records(self, records: List[Dict]) -> List[PriceResult]:
+        """Results stored as ``PriceResult.to_dict`` records (cache, validators)"""
+        results = [PriceResult.from_dict(record, self.retailer) for record in records]
+        return [result for result in results if result is not None]
+
+    async def get_validator(self, url: str) -> Optional[Validator]:
+        """Validators of the page last parsed from ``url``, if conditional requests are on"""
+        if not self.conditional_requests:
+            return None
+        try:
+            return await self.cache.get_validator(url)
+        except Exception as e:
+            logger.warning(f"Validator read error for {url}: {str(e)}")
         return None
 
-    def cache_result(self, product_name: str, result: List[Dict]) -> None:
-        """Cache results for a product"""
+    async def set_validator(self, url: str, page: Page, result: List[PriceResult]) -> None:
+        if not self.conditional_requests:
+            return
+        try:
+            await self.cache.set_validator(url, page.etag, page.last_modified,
+                                           [found.to_dict() for found in result])
+        except Exception as e:
+            logger.warning(f"Validator write error for {url}: {str(e)}")
+
+    async def cache_result(self, product_name: str, result: List[PriceResult]) -> None:
+        """Cache results for a product, as plain records so they can be stored as JSON"""
         try:
-            cache_path = self.get_cache_path(product_name)
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+            await self.cache.set(self.retailer, self.get_cache_key(product_name),
+                                 [found.to_dict() for found in result])
         except Exception as e:
-            logger.warning(f"Cache write error for {product_name}: {str(e)}") 
\ No newline at end of file
+            logger.warning(f"Cache write error for {product_name}: {str(e)}")
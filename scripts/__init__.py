@@ -0,0 +1,5 @@
+"""
+Maintenance scripts for TV price scraper.
+
+Run from the project root, e.g. ``python -m scripts.migrate_json_cache``.
+"""
@@ -0,0 +1,100 @@
+"""
+Import the legacy one-file-per-result JSON cache into the SQLite store.
+
+Handles both layouts found in ``data/cache``: bare result lists written by
+``BaseScraper.cache_result`` (named ``<ScraperClass>_<product>.json``) and
+``{"timestamp": ..., "value": ...}`` envelopes written by ``utils.cache``.
+Filenames had characters such as quotes replaced, so an imported entry is
+only reused when the product name survives that sanitising unchanged.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from config.settings import CACHE_DIR, DB_PATH
+from scrapers import REGISTRY
+from utils.query import canonical_query
+from utils.storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# (retailer, model, timestamp, value), as SQLiteStore.put_cache_many takes it
+CacheRow = Tuple[str, str, float, object]
+
+def _retailer_by_class() -> Dict[str, str]:
+    # Registry targets are 'module:ScraperClass', keyed by the class's retailer
+    return {target.rpartition(':')[2]: retailer for retailer, target in REGISTRY.items()}
+
+def _parse_file(path: Path, retailers: Dict[str, str]) -> Optional[CacheRow]:
+    class_name, _, model = path.stem.partition('_')
+    retailer = retailers.get(class_name)
+    if retailer is None or not model:
+        return None
+    # Match BaseScraper.get_cache_key
+    model = canonical_query(model)
+
+    with path.open('r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and 'timestamp' in data and 'value' in data:
+        return retailer, model, float(data['timestamp']), data['value']
+    # Legacy files carry no timestamp; the file's mtime is the best we have
+    return retailer, model, path.stat().st_mtime, data
+
+def iter_cache_files(cache_dir: Path) -> Iterator[Tuple[Path, CacheRow]]:
+    """Yield ``(source file, row)`` for every cache file that can be imported"""
+    retailers = _retailer_by_class()
+    for path in sorted(cache_dir.glob('*.json')):
+        try:
+            row = _parse_file(path, retailers)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable cache file {path}: {str(e)}")
+            continue
+        if row is None:
+            logger.warning(f"Skipping cache file with unknown scraper prefix: {path.name}")
+            continue
+        yield path, row
+
+def migrate(cache_dir: Path, store: SQLiteStore, batch_size: int = 500,
+            delete: bool = False) -> int:
+    """Copy cache files into ``store`` in batched transactions; returns rows imported.
+
+    With ``delete``, only files whose rows were committed are removed; skipped
+    (unknown or unreadable) files stay in place.
+    """
+    imported: List[Path] = []
+    batch: List[Tuple[Path, CacheRow]] = []
+    for entry in iter_cache_files(cache_dir):
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            store.put_cache_many(row for _, row in batch)
+            imported.extend(path for path, _ in batch)
+            batch = []
+    if batch:
+        store.put_cache_many(row for _, row in batch)
+        imported.extend(path for path, _ in batch)
+
+    if delete:
+        for path in imported:
+            path.unlink()
+    return len(imported)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR)
+    parser.add_argument('--db', type=Path, default=DB_PATH)
+    parser.add_argument('--delete', action='store_true',
+                        help='remove the JSON files that were imported')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+    store = SQLiteStore(args.db)
+    try:
+        imported = migrate(args.cache_dir, store, delete=args.delete)
+    finally:
+        store.close()
+    logger.info(f"Imported {imported} cache entries into {args.db}")
+
+if __name__ == "__main__":
+    main()
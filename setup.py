@@ -6,7 +6,6 @@ setup(
     packages=find_packages(),
     install_requires=[
         'requests>=2.26.0',
-        'beautifulsoup4>=4.9.3',
         'aiohttp>=3.8.1',
         'python-dotenv>=0.19.0',
         'lxml>=4.6.3',
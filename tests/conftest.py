@@ -0,0 +1,69 @@
+from typing import Awaitable, Callable, Dict
+import pytest
+from aiohttp import web
+from config.settings import RATE_LIMIT
+from scrapers import REGISTRY
+from scrapers.base_scraper import BaseScraper
+from utils.cache import Cache
+from utils.parsing import ExtractionSpec, Selector
+from utils.storage import SQLiteStore
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+class StubScraper(BaseScraper):
+    """Scraper for pages served by the ``serve`` fixture: one title and price per tile"""
+    retailer = 'stub'
+    website = 'Stub'
+    search_path = '/search?q={query}'
+    spec = ExtractionSpec(
+        'stub',
+        container=Selector('div', {'class': 'tile'}),
+        fields={
+            'title': Selector('h3', {'class': 'title'}),
+            'price': Selector('span', {'class': 'price'}),
+        }
+    )
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(tmp_path / 'test.db')
+    yield store
+    store.close()
+
+@pytest.fixture
+def make_scraper(store):
+    """Build a ``StubScraper`` caching to the test's own database"""
+    def make(**shared) -> StubScraper:
+        shared.setdefault('cache', Cache(store))
+        return StubScraper(**shared)
+    return make
+
+@pytest.fixture
+def stub_retailer(monkeypatch):
+    """Register ``StubScraper`` as retailer 'stub', so ``PriceScraper('stub')`` and
+    the CLI search the given base URL, with no rate limit"""
+    def register(base_url: str) -> None:
+        monkeypatch.setitem(REGISTRY, 'stub', 'tests.conftest:StubScraper')
+        monkeypatch.setitem(RATE_LIMIT, 'stub', {'requests': 1_000_000, 'period': 1})
+        monkeypatch.setattr(StubScraper, 'base_url', base_url)
+    return register
+
+@pytest.fixture
+async def serve():
+    """Start a local server for ``{path: handler}`` routes; returns its base URL"""
+    runners = []
+
+    async def start(routes: Dict[str, Handler]) -> str:
+        app = web.Application()
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        runners.append(runner)
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        port = runner.addresses[0][1]
+        return f"http://127.0.0.1:{port}"
+
+    yield start
+    for runner in runners:
+        await runner.cleanup()
@@ -1,10 +1,11 @@
 import pytest
 from scrapers.amazon_scraper import AmazonScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return AmazonScraper()
+def scraper(store):
+    return AmazonScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.amazon.ca"
@@ -1,10 +1,11 @@
 import pytest
 from scrapers.bestbuy_scraper import BestBuyScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return BestBuyScraper()
+def scraper(store):
+    return BestBuyScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.bestbuy.ca"
@@ -40,6 +41,12 @@ def test_model_number_extraction(scraper):
     for input_name, expected in test_cases:
         assert scraper._extract_model_number(input_name) == expected
 
+def test_search_uses_the_shared_canonical_query(scraper):
+    # The raw SKU keeps whatever follows the last hyphen; searches use the canonical model
+    name = 'Samsung TV - QN65Q60DAFXZC (2024)'
+    assert scraper._extract_model_number(name) == 'QN65Q60DAFXZC (2024)'
+    assert scraper.search_query(name) == 'QN65Q60DAFXZC'
+
 @pytest.mark.asyncio
 async def test_price_validation(scraper):
     product_name = 'Samsung 65" 4K TV - QN65Q60DAFXZC'
@@ -1,10 +1,11 @@
 import pytest
 from scrapers.canadiantire_scraper import CanadianTireScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return CanadianTireScraper()
+def scraper(store):
+    return CanadianTireScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.canadiantire.ca"
@@ -1,10 +1,11 @@
 import pytest
 from scrapers.dufresne_scraper import DufresneScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return DufresneScraper()
+def scraper(store):
+    return DufresneScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.dufresne.ca"
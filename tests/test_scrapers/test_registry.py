@@ -0,0 +1,23 @@
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import scrapers
+
+def test_registry_keys_match_scraper_retailers():
+    for retailer in scrapers.available_retailers():
+        assert scrapers.load_scraper(retailer).retailer == retailer
+
+def test_unknown_retailer():
+    with pytest.raises(ValueError):
+        scrapers.load_scraper('nope')
+    with pytest.raises(AttributeError):
+        scrapers.NopeScraper
+
+def test_only_requested_scrapers_are_imported():
+    code = ("import sys, main; main.PriceScraper('bestbuy'); "
+            "print(sorted(m for m in sys.modules if m.startswith('scrapers.')))")
+    root = Path(__file__).resolve().parents[2]
+    loaded = subprocess.run([sys.executable, '-c', code], check=True,
+                            capture_output=True, text=True, cwd=root).stdout
+    assert loaded.strip() == "['scrapers.base_scraper', 'scrapers.bestbuy_scraper']"
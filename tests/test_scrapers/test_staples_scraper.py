@@ -1,10 +1,11 @@
 import pytest
 from scrapers.staples_scraper import StaplesScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return StaplesScraper()
+def scraper(store):
+    return StaplesScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.staples.ca"
@@ -1,10 +1,11 @@
 import pytest
 from scrapers.tanguay_scraper import TanguayScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return TanguayScraper()
+def scraper(store):
+    return TanguayScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.tanguay.ca"
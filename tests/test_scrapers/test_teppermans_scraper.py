@@ -1,10 +1,11 @@
 import pytest
 from scrapers.teppermans_scraper import TeppermansScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return TeppermansScraper()
+def scraper(store):
+    return TeppermansScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.teppermans.com"
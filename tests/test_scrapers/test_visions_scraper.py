@@ -1,10 +1,11 @@
 import pytest
 from scrapers.visions_scraper import VisionsScraper
+from utils.cache import Cache
 from utils.validators import ProductValidationError
 
 @pytest.fixture
-def scraper():
-    return VisionsScraper()
+def scraper(store):
+    return VisionsScraper(cache=Cache(store))
 
 def test_scraper_initialization(scraper):
     assert scraper.base_url == "https://www.visions.ca"
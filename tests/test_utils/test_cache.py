@@ -0,0 +1,70 @@
+import pytest
+from utils.cache import Cache
+
+@pytest.fixture
+def cache(store):
+    return Cache(store, ttl=60, max_entries=2, batch_size=10, flush_delay=60)
+
+@pytest.mark.asyncio
+async def test_round_trip_is_served_from_memory(cache):
+    await cache.set('visions', 'QN65Q60DAFXZC', [{'price': '1'}])
+    assert await cache.get('visions', 'QN65Q60DAFXZC') == [{'price': '1'}]
+    assert cache.stats['memory_hits'] == 1
+    assert cache.store.get_cache('visions', 'QN65Q60DAFXZC') is None
+
+@pytest.mark.asyncio
+async def test_flush_persists_to_store(cache, store):
+    await cache.set('visions', 'a', [1])
+    await cache.set('visions', 'b', [2])
+    await cache.close()
+    assert cache.stats['flushes'] == 1
+
+    fresh = Cache(store, ttl=60)
+    assert await fresh.get('visions', 'a') == [1]
+    assert fresh.stats['disk_hits'] == 1
+    assert await fresh.get('visions', 'a') == [1]
+    assert fresh.stats['memory_hits'] == 1
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_immediately(store):
+    cache = Cache(store, batch_size=2, flush_delay=60)
+    await cache.set('visions', 'a', [1])
+    await cache.set('visions', 'b', [2])
+    assert store.get_cache('visions', 'b')[1] == [2]
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_misses(cache):
+    await cache.set('visions', 'a', [1])
+    assert await cache.get('visions', 'a', ttl=0) is None
+    assert cache.stats['expired'] == 1
+
+@pytest.mark.asyncio
+async def test_repeated_misses_skip_store(cache, store):
+    assert await cache.get('visions', 'missing') is None
+    store.put_cache_many([('visions', 'missing', 0.0, [1])])
+    assert await cache.get('visions', 'missing') is None
+    assert cache.stats['misses'] == 2
+    assert cache.stats['disk_hits'] == 0
+
+@pytest.mark.asyncio
+async def test_lru_evicts_oldest(cache):
+    await cache.set('visions', 'a', 1)
+    await cache.set('visions', 'b', 2)
+    await cache.get('visions', 'a')
+    await cache.set('visions', 'c', 3)
+    assert list(cache._memory) == [('visions', 'a'), ('visions', 'c')]
+    assert cache.stats['evictions'] == 1
+    # Evicted but not yet flushed entries are still served
+    assert await cache.get('visions', 'b') == 2
+
+@pytest.mark.asyncio
+async def test_disabled_cache_stores_nothing(store):
+    cache = Cache(store, enabled=False)
+    await cache.set('visions', 'a', 1)
+    assert await cache.get('visions', 'a') is None
+    assert not cache._pending
+
+def test_purge_uses_timestamp(store):
+    store.put_cache_many([('visions', 'old', 0.0, [1])])
+    assert store._purge_cache(60) == 1
+    assert store.get_cache('visions', 'old') is None
@@ -0,0 +1,130 @@
+import asyncio
+import pytest
+from aiohttp import web
+from utils.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from utils.retry import RetryPolicy
+from utils.scheduler import AdaptiveLimit, ConcurrencyLimiter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+async def down_server(serve):
+    calls = {'count': 0}
+
+    async def handler(request):
+        calls['count'] += 1
+        return web.Response(status=503)
+
+    return await serve({'/': handler}), calls
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60, clock=clock)
+    for _ in range(3):
+        assert not breaker.check('a')
+        breaker.record_failure('a')
+    assert breaker.state('a') == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check('a')
+    # Other retailers are unaffected
+    assert not breaker.check('b')
+
+    clock.now = 61
+    probe = breaker.check('a')
+    assert probe
+    assert breaker.state('a') == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check('a')  # only one probe at a time
+    breaker.record_failure('a', probe)
+    assert breaker.state('a') == OPEN
+
+    clock.now = 122
+    probe = breaker.check('a')
+    breaker.record_success('a', probe)
+    assert breaker.state('a') == CLOSED
+    assert breaker.stats['a'] == {'opened': 2, 'rejected': 2}
+
+def test_stragglers_do_not_settle_the_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60, clock=clock)
+    breaker.check('a')
+    breaker.record_failure('a')
+    clock.now = 61
+    probe = breaker.check('a')
+
+    # Requests sent before the circuit opened finish while the probe is in flight
+    breaker.record_success('a')
+    assert not breaker.record_failure('a')
+    breaker.release('a', probe + 1)
+    assert breaker.state('a') == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check('a')
+
+    breaker.release('a', probe)
+    assert breaker.check('a')
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure('a')
+    breaker.record_success('a')
+    breaker.record_failure('a')
+    assert breaker.state('a') == CLOSED
+
+def test_limit_halves_on_failure_and_grows_back():
+    limit = AdaptiveLimit(8)
+    limit.failed()
+    assert limit.current == 4
+    for _ in range(40):
+        limit.succeeded(0.1)
+    assert limit.current == 8
+
+def test_latency_spike_shrinks_the_limit():
+    limit = AdaptiveLimit(8)
+    for _ in range(10):
+        limit.succeeded(0.01)
+    limit.succeeded(1.0)
+    assert limit.current == 4
+
+def test_limit_is_fixed_when_not_adaptive():
+    limit = AdaptiveLimit(8, adaptive=False)
+    limit.failed()
+    assert limit.current == 8
+
+@pytest.mark.asyncio
+async def test_shrunk_limit_caps_in_flight_requests():
+    limiter = ConcurrencyLimiter(global_limit=10, retailer_limits={'default': 4})
+    limiter.failed('a')
+    assert limiter.current_limits() == {'a': 2}
+    active = peak = 0
+
+    async def job():
+        nonlocal active, peak
+        async with limiter.slot('a'):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(job() for _ in range(8)))
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_down_retailer_costs_a_few_probes(down_server, make_scraper):
+    url, calls = down_server
+    limiter = ConcurrencyLimiter(global_limit=10, retailer_limits={'default': 2})
+    scraper = make_scraper(retry_policy=RetryPolicy(max_retries=2, base_delay=0),
+                           breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60),
+                           limiter=limiter)
+
+    for _ in range(20):
+        with pytest.raises(Exception):
+            await scraper.make_request(url)
+    # The first lookup's retries trip the breaker; the other 19 never reach the server
+    assert calls['count'] == 3
+    assert scraper.breaker.stats['stub'] == {'opened': 1, 'rejected': 19}
+    assert scraper.limiter.current_limits() == {'stub': 1}
@@ -0,0 +1,59 @@
+import json
+import pytest
+from aiohttp import web
+import main
+from main import parse_args
+
+TV = 'Samsung TV - QN65Q60DAFXZC'
+
+@pytest.fixture
+def cli(monkeypatch, store):
+    """Run ``main()`` against the test's own database, without configuring logging"""
+    monkeypatch.setattr(main, 'configure_logging', lambda: None)
+    monkeypatch.setattr(main, 'SQLiteStore', lambda: store)
+    return main.main
+
+@pytest.mark.asyncio
+async def test_batch_run_writes_jsonl_and_resumes_by_run_id(cli, serve, stub_retailer, tmp_path):
+    searches = []
+
+    async def search(request):
+        searches.append(request.query['q'])
+        return web.Response(text='<div class="tile"><h3 class="title">TV QN65Q60DAFXZC</h3>'
+                                 '<span class="price">$999.99</span></div>',
+                            content_type='text/html')
+
+    stub_retailer(await serve({'/search': search}))
+    output = tmp_path / 'out.jsonl'
+    argv = ['-r', 'stub', '-p', TV, '-o', str(output), '--cache', 'off', '--run-id', 'cli-1']
+
+    assert await cli(argv) == 0
+    [line] = [json.loads(line) for line in output.read_text().splitlines()]
+    assert line['Name'] == TV
+    assert [entry['Price'] for entry in line['Product']] == ['999.99']
+    assert len(searches) == 1
+
+    # Same run id: the finished product is skipped, not searched or written again
+    assert await cli(argv) == 0
+    assert len(output.read_text().splitlines()) == 1
+    assert len(searches) == 1
+
+@pytest.mark.asyncio
+async def test_unknown_retailer_fails_the_run(cli, tmp_path):
+    assert await cli(['-r', 'nope', '-p', TV, '-o', str(tmp_path / 'out.jsonl')]) == 1
+
+def test_run_id_defaults_to_the_environment(monkeypatch):
+    monkeypatch.setattr(main, 'RUN_ID', None)
+    assert parse_args(['-p', TV]).run_id is None
+    monkeypatch.setattr(main, 'RUN_ID', 'nightly')
+    assert parse_args(['-p', TV]).run_id == 'nightly'
+    assert parse_args(['-p', TV, '--run-id', 'manual']).run_id == 'manual'
+
+@pytest.mark.parametrize('argv', [
+    ['-i', 'products.jsonl', '-p', TV],
+    ['-p', TV, '--cache', 'sometimes'],
+    ['-p', TV, '--concurrency', 'many'],
+])
+def test_invalid_arguments_exit(argv):
+    with pytest.raises(SystemExit):
+        parse_args(argv)
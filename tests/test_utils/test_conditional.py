@@ -0,0 +1,50 @@
+import pytest
+from aiohttp import web
+from config.settings import CACHE_TTL_OVERRIDES
+
+PAGE = ('<html><body><div class="tile"><h3 class="title">Samsung TV</h3>'
+        '<span class="price">$999.99</span></div></body></html>')
+ETAG = '"v1"'
+
+@pytest.fixture
+async def etag_server(serve):
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == ETAG:
+            return web.Response(status=304, headers={'ETag': ETAG})
+        return web.Response(text=PAGE, content_type='text/html', headers={'ETag': ETAG})
+
+    return await serve({'/search': handler}), seen
+
+@pytest.fixture
+def scraper(make_scraper, etag_server, monkeypatch):
+    # Every lookup after the first finds a stale entry and revalidates
+    monkeypatch.setitem(CACHE_TTL_OVERRIDES, 'stub', 0)
+    scraper = make_scraper()
+    scraper.base_url = etag_server[0]
+    return scraper
+
+@pytest.mark.asyncio
+async def test_not_modified_reuses_parsed_result(scraper, etag_server, monkeypatch):
+    _, seen = etag_server
+    first = await scraper.search('Samsung TV - QN65Q60DAFXZC')
+    assert first[0].price_cents == 99999
+
+    # A 304 must not reach the parser
+    async def fail(*args):
+        raise AssertionError('parsed a 304')
+    monkeypatch.setattr(scraper, 'extract', fail)
+
+    second = await scraper.search('Samsung TV - QN65Q60DAFXZC')
+    assert second == first
+    assert seen == [None, ETAG]
+
+@pytest.mark.asyncio
+async def test_refresh_mode_skips_validators(scraper, etag_server):
+    _, seen = etag_server
+    await scraper.search('Samsung TV - QN65Q60DAFXZC')
+    scraper.cache.refresh = True
+    await scraper.search('Samsung TV - QN65Q60DAFXZC')
+    assert seen == [None, None]
@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+from aiohttp import web
+from main import PriceScraper
+from utils.results import PriceResult
+from utils.retry import RetryPolicy
+from utils.scheduler import DeadlineExceeded, LatencyWindow
+
+@pytest.fixture
+async def slow_once_server(serve):
+    """Answers the first request after 2s and the rest at once"""
+    calls = {'count': 0}
+
+    async def handler(request):
+        calls['count'] += 1
+        if calls['count'] == 1:
+            await asyncio.sleep(2)
+        return web.Response(text=f"answer {calls['count']}")
+
+    return await serve({'/': handler}), calls
+
+@pytest.fixture
+async def price_scraper(store):
+    async with PriceScraper('bestbuy,costco', cache_mode='off', store=store) as scraper:
+        yield scraper
+
+def test_latency_window_quantile():
+    window = LatencyWindow(size=100, min_samples=10)
+    for latency in range(9):
+        window.add(latency)
+    assert window.quantile(0.95) is None
+    for latency in range(9, 100):
+        window.add(latency)
+    assert window.quantile(0.95) == 95
+    window.add(1000)  # the oldest sample drops out
+    assert window.quantile(0.0) == 1
+
+@pytest.mark.asyncio
+async def test_hedge_answers_when_the_first_attempt_stalls(slow_once_server, make_scraper):
+    url, calls = slow_once_server
+    scraper = make_scraper(retry_policy=RetryPolicy(max_retries=0))
+    scraper.hedge = True
+    for _ in range(20):
+        scraper.latencies.add(0.05)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await scraper.make_request(url) == 'answer 2'
+    assert loop.time() - start < 1
+    assert calls['count'] == 2
+    assert scraper.metrics.counters[('hedge_won', (('retailer', 'stub'),))] == 1
+
+@pytest.mark.asyncio
+async def test_product_deadline_keeps_the_results_that_are_in(price_scraper):
+    slow, fast = price_scraper.scrapers
+
+    async def stalled(product_name, fresh=False):
+        await asyncio.sleep(10)
+
+    async def answered(product_name, fresh=False):
+        return [PriceResult(fast.retailer, 'Samsung', fast.website, 'TV', 99999, '', '', None)]
+
+    slow.search, fast.search = stalled, answered
+    price_scraper.product_deadline = 0.2
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    products = [{'name': 'QN65Q60DAFXZC'}]
+    answers = [result async for result in price_scraper.iter_product_results(products)]
+    assert loop.time() - start < 2
+    assert answers == [(0, {'name': 'QN65Q60DAFXZC'}, await answered(''))]
+    key = ('deadline_exceeded', (('retailer', slow.retailer),))
+    assert price_scraper.metrics.counters[key] == 1
+
+@pytest.mark.asyncio
+async def test_deadline_raises_deadline_exceeded(price_scraper):
+    slow = price_scraper.scrapers[0]
+
+    async def stalled(product_name, fresh=False):
+        await asyncio.sleep(10)
+
+    slow.search = stalled
+    deadline_at = asyncio.get_running_loop().time() + 0.1
+    with pytest.raises(DeadlineExceeded):
+        await price_scraper.search(slow, 'QN65Q60DAFXZC', deadline_at)
+
+@pytest.mark.asyncio
+async def test_late_lookups_end_with_the_run(store):
+    cancelled = asyncio.Event()
+
+    async def stalled(product_name, fresh=False):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async with PriceScraper('bestbuy', cache_mode='off', store=store) as price_scraper:
+        scraper = price_scraper.scrapers[0]
+        scraper._search = stalled
+        deadline_at = asyncio.get_running_loop().time() + 0.1
+        with pytest.raises(DeadlineExceeded):
+            await price_scraper.search(scraper, 'QN65Q60DAFXZC', deadline_at)
+        # Still running, so a late answer could reach the cache
+        assert len(price_scraper.flights) == 1
+    assert cancelled.is_set()
+    assert len(price_scraper.flights) == 0
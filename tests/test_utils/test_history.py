@@ -0,0 +1,61 @@
+import io
+import json
+import pytest
+from aiohttp import web
+from main import PriceScraper
+from utils.history import PriceChange, PriceHistory
+
+@pytest.mark.asyncio
+async def test_only_changes_are_reported_and_appended(store):
+    history = PriceHistory(store)
+    first = await history.record([('bestbuy', 'QN65Q60DAFXZC', '999.99'),
+                                  ('costco', 'QN65Q60DAFXZC', '949.99')], 'run-1')
+    assert first == [PriceChange('bestbuy', 'QN65Q60DAFXZC', None, 99999),
+                     PriceChange('costco', 'QN65Q60DAFXZC', None, 94999)]
+
+    second = await history.record([('bestbuy', 'QN65Q60DAFXZC', '999.99'),
+                                   ('costco', 'QN65Q60DAFXZC', '899.99')], 'run-2')
+    assert second == [PriceChange('costco', 'QN65Q60DAFXZC', 94999, 89999)]
+
+    seen = await history.history('costco', 'QN65Q60DAFXZC')
+    assert [cents for _, cents in seen] == [94999, 89999]
+    assert [cents for _, cents in await history.history('bestbuy', 'QN65Q60DAFXZC')] == [99999]
+    assert history.stats == {'observed': 4, 'changed': 1, 'new': 2}
+
+@pytest.mark.asyncio
+async def test_unparseable_prices_are_skipped(store):
+    history = PriceHistory(store)
+    assert await history.record([('bestbuy', 'QN65Q60DAFXZC', 'N/A')]) == []
+    assert await history.history('bestbuy', 'QN65Q60DAFXZC') == []
+
+@pytest.mark.asyncio
+async def test_changes_only_writes_changed_products_with_previous_price(serve, stub_retailer,
+                                                                        store):
+    prices = {'QN65Q60DAFXZC': '$999.99', 'OLED65C4PUA': '$1,799.99'}
+
+    async def search(request):
+        model = next(model for model in prices if model in request.query['q'])
+        return web.Response(text=f'<div class="tile"><h3 class="title">TV {model}</h3>'
+                                 f'<span class="price">{prices[model]}</span></div>',
+                            content_type='text/html')
+
+    stub_retailer(await serve({'/search': search}))
+    products = [{'name': 'Samsung TV - QN65Q60DAFXZC'}, {'name': 'LG TV - OLED65C4PUA'}]
+
+    async def run(run_id):
+        output = io.StringIO()
+        async with PriceScraper('stub', cache_mode='off', store=store) as price_scraper:
+            await price_scraper.scrape_to_jsonl(products, output, run_id, changes_only=True)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    first = await run('run-1')
+    # Lines are written as products complete, in whatever order that is
+    assert sorted(line['Name'] for line in first) == sorted(product['name'] for product in products)
+    assert all(line['Product'][0]['PreviousPrice'] is None for line in first)
+
+    prices['QN65Q60DAFXZC'] = '$899.99'
+    second = await run('run-2')
+    assert [line['Name'] for line in second] == ['Samsung TV - QN65Q60DAFXZC']
+    [entry] = second[0]['Product']
+    assert entry['Price'] == '899.99'
+    assert entry['PreviousPrice'] == '999.99'
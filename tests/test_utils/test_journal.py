@@ -0,0 +1,109 @@
+import asyncio
+import io
+import json
+import pytest
+from aiohttp import web
+from main import PriceScraper
+from scrapers import REGISTRY
+from tests.conftest import StubScraper
+from utils.journal import EMPTY, FAILED, FOUND, RunJournal
+
+TV = {'name': ' Samsung QN65Q60DAFXZC '}
+RESULT = [{'website': 'Best Buy', 'title': 'TV', 'price': '999.99'}]
+
+class OtherStubScraper(StubScraper):
+    """A second retailer on the stub server, searched under /other"""
+    retailer = 'otherstub'
+    website = 'Other Stub'
+    search_path = '/other?q={query}'
+
+@pytest.mark.asyncio
+async def test_resume_restores_settled_pairs_and_retries_failures(store):
+    journal = await RunJournal(store, 'run-1').load()
+    await journal.record(TV, 'bestbuy', FOUND, RESULT)
+    await journal.record(TV, 'costco', EMPTY)
+    await journal.record(TV, 'amazon', FAILED)
+
+    resumed = await RunJournal(store, 'run-1').load()
+    assert not resumed.is_complete(TV)
+    assert resumed.settled(TV) == {'bestbuy', 'costco'}
+    assert await resumed.restore(TV) == {'bestbuy': RESULT}
+
+    # A retry that succeeds replaces the failure
+    await resumed.record(TV, 'amazon', FOUND, RESULT)
+    assert (await RunJournal(store, 'run-1').load()).settled(TV) == {'bestbuy', 'costco', 'amazon'}
+
+@pytest.mark.asyncio
+async def test_completed_products_are_skipped_per_run(store):
+    journal = await RunJournal(store, 'run-1').load()
+    await journal.record(TV, 'bestbuy', FOUND, RESULT)
+    await journal.complete(TV)
+
+    assert (await RunJournal(store, 'run-1').load()).is_complete({'name': 'Samsung QN65Q60DAFXZC'})
+    other = await RunJournal(store, 'run-2').load()
+    assert not other.is_complete(TV)
+    assert other.settled(TV) == set()
+
+@pytest.mark.asyncio
+async def test_old_journals_are_purged(store):
+    journal = await RunJournal(store, 'run-1').load()
+    await journal.complete(TV)
+    assert await store.purge_journal_async(3600) == 0
+    assert await store.purge_journal_async(-1) == 1
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_where_it_stopped(serve, stub_retailer, store,
+                                                        monkeypatch):
+    products = [{'name': 'Samsung TV - QN65Q60DAFXZC'}, {'name': 'LG TV - OLED65C4PUA'},
+                {'name': 'Sony TV - XR65A80L'}]
+    requests = []
+    # The other retailer stalls on the Sony TV until the first run is cut short
+    stalled = asyncio.Event()
+
+    async def search(request):
+        model = request.query['q'].split()[-1]
+        requests.append((request.path, model))
+        if request.path == '/other' and model == 'XR65A80L' and not stalled.is_set():
+            await stalled.wait()
+        return web.Response(text=f'<div class="tile"><h3 class="title">TV {model}</h3>'
+                                 f'<span class="price">$999.99</span></div>',
+                            content_type='text/html')
+
+    stub_retailer(await serve({'/search': search, '/other': search}))
+    monkeypatch.setitem(REGISTRY, 'otherstub', f'{__name__}:OtherStubScraper')
+
+    async def stuck_on_the_sony_tv():
+        # Two products done and only the stalled pair still open
+        while True:
+            completed, partial = await store.load_journal_async('run-1')
+            if len(completed) == 2 and 'stub' in partial.get('Sony TV - XR65A80L', {}):
+                return
+            await asyncio.sleep(0.01)
+
+    async def run(interrupt: bool = False):
+        output = io.StringIO()
+        async with PriceScraper('stub,otherstub', cache_mode='off', store=store) as scraper:
+            scrape = asyncio.ensure_future(scraper.scrape_to_jsonl(products, output, 'run-1'))
+            if not interrupt:
+                await scrape
+            else:
+                try:
+                    await asyncio.wait_for(stuck_on_the_sony_tv(), 10)
+                finally:
+                    scrape.cancel()
+                await asyncio.gather(scrape, return_exceptions=True)
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    try:
+        first = await run(interrupt=True)
+    finally:
+        stalled.set()
+    assert sorted(line['Name'] for line in first) == ['LG TV - OLED65C4PUA',
+                                                      'Samsung TV - QN65Q60DAFXZC']
+    requests.clear()
+
+    second = await run()
+    assert [line['Name'] for line in second] == ['Sony TV - XR65A80L']
+    # Finished products are skipped; the Sony TV's answered retailer is restored
+    assert requests == [('/other', 'XR65A80L')]
+    assert [entry['Website'] for entry in second[0]['Product']] == ['Stub', 'Other Stub']
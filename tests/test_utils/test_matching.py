@@ -0,0 +1,58 @@
+from utils.matching import best_match, model_similarity, rank_items, score_match
+from utils.parsing import ExtractionSpec, Selector, TileExtractor, extract_product
+
+SPEC = ExtractionSpec(
+    'test',
+    container=Selector('div', {'class': 'product-tile'}),
+    fields={
+        'title': Selector('h3', {'class': 'title'}),
+        'price': Selector('span', {'class': 'price'}),
+    }
+)
+
+QUERY = 'Samsung 65" 4K Tizen Smart QLED TV - QN65Q60DAFXZC'
+
+def _tile(title: str, price: str = '$999.99') -> str:
+    return (f'<div class="product-tile"><h3 class="title">{title}</h3>'
+            f'<span class="price">{price}</span></div>')
+
+PAGE = '<html><body>' + ''.join([
+    _tile('Universal Tilting Wall Mount for 40"-85" TVs', '$79.99'),
+    _tile('Samsung 55" Q60D QLED 4K TV (QN55Q60DAFXZC)', '$799.99'),
+    _tile('Samsung 65" Q60D QLED 4K Tizen Smart TV (QN65Q60DAFXZC)', '$1,099.99'),
+    _tile('Samsung 75" Q60D QLED 4K TV (QN75Q60DAFXZC)', '$1,499.99'),
+]) + '</body></html>'
+
+def test_model_number_dominates_the_score():
+    exact = score_match(QUERY, 'Samsung 65" Q60D QLED 4K Smart TV - QN65Q60DAFXZC')
+    other_size = score_match(QUERY, 'Samsung 55" Q60D QLED 4K Smart TV - QN55Q60DAFXZC')
+    assert exact > 0.9
+    assert other_size < 0.5
+    assert model_similarity('QN65Q60DAFXZC', 'Samsung QN65Q60DAF') > 0.7
+
+def test_accessories_are_marked_down():
+    tv = score_match('LG 65" OLED TV', 'LG 65" OLED evo C4 TV')
+    mount = score_match('LG 65" OLED TV', 'Wall mount for LG 65" OLED TV')
+    assert mount < tv
+    assert score_match('LG wall mount', 'LG wall mount') == 1.0
+
+def test_ties_keep_page_order_and_unusable_items_are_dropped():
+    items = [{'title': 'A TV', 'price': '1'}, {'title': 'B TV', 'price': '2'},
+             {'title': 'C TV', 'price': None}]
+    assert [item['title'] for _, item in rank_items('Unrelated query', items)] == ['A TV', 'B TV']
+
+def test_best_tile_is_picked_from_one_parse():
+    item, source = extract_product(PAGE, SPEC, query=QUERY, candidates=5)
+    assert source == 'selectors'
+    assert item['title'] == 'Samsung 65" Q60D QLED 4K Tizen Smart TV (QN65Q60DAFXZC)'
+    assert item['confidence'] > 0.9
+
+    # Without a query the first tile is still trusted
+    item, _ = extract_product(PAGE, SPEC, candidates=5)
+    assert item['title'].startswith('Universal')
+
+def test_streamed_tiles_rank_the_same():
+    extractor = TileExtractor(SPEC, limit=5)
+    extractor.feed(PAGE)
+    parsed, _ = extract_product(PAGE, SPEC, query=QUERY, candidates=5)
+    assert best_match(QUERY, extractor.close()) == parsed
@@ -0,0 +1,63 @@
+import json
+import pytest
+from utils.metrics import SIZE_BUCKETS, Histogram, Metrics
+
+def test_counters_and_timers_are_keyed_by_labels():
+    metrics = Metrics(enabled=True)
+    metrics.inc('responses', retailer='bestbuy', status=200)
+    metrics.inc('responses', retailer='bestbuy', status=200)
+    metrics.inc('responses', retailer='costco', status=503)
+    with metrics.timer('fetch', retailer='bestbuy'):
+        pass
+
+    assert metrics.counters[('responses', (('retailer', 'bestbuy'), ('status', '200')))] == 2
+    assert len(metrics.counters) == 2
+    assert metrics.histograms[('fetch', (('retailer', 'bestbuy'),))].count == 1
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    metrics.inc('responses')
+    metrics.observe('response_bytes', 10, SIZE_BUCKETS)
+    with metrics.timer('fetch'):
+        pass
+    assert not metrics.counters and not metrics.histograms
+    assert metrics.timer('a') is metrics.timer('b')
+
+@pytest.mark.asyncio
+async def test_timed_decorator():
+    metrics = Metrics(enabled=True)
+
+    @metrics.timed('work')
+    async def work(x):
+        return x * 2
+
+    assert await work(2) == 4
+    assert metrics.histograms[('work', ())].count == 1
+
+def test_histogram_quantiles():
+    hist = Histogram()
+    for _ in range(90):
+        hist.observe(0.02)
+    for _ in range(10):
+        hist.observe(2.0)
+    assert 0.01 < hist.quantile(0.5) <= 0.025
+    assert 1.0 < hist.quantile(0.95) <= 2.0
+    assert hist.max == 2.0
+
+def test_exports(tmp_path):
+    metrics = Metrics(enabled=True)
+    metrics.inc('retries', retailer='amazon')
+    metrics.observe('fetch', 0.3, retailer='amazon')
+
+    text = metrics.to_prometheus()
+    assert 'scraper_retries_total{retailer="amazon"} 1' in text
+    assert 'scraper_fetch_bucket{retailer="amazon",le="0.5"} 1' in text
+    assert 'scraper_fetch_count{retailer="amazon"} 1' in text
+
+    path = tmp_path / 'metrics.json'
+    metrics.write(path)
+    data = json.loads(path.read_text())
+    assert data['counters'][0] == {'name': 'retries', 'labels': {'retailer': 'amazon'}, 'value': 1}
+    assert data['histograms'][0]['count'] == 1
+
+    assert 'fetch' in metrics.summary()
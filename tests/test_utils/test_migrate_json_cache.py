@@ -0,0 +1,19 @@
+import json
+from scripts.migrate_json_cache import migrate
+
+RESULT = [{'website': 'Best Buy', 'title': 'TV', 'price': '999.99'}]
+
+def test_imported_files_are_deleted_and_skipped_files_kept(tmp_path, store):
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    (cache_dir / 'BestBuyScraper_QN65Q60DAFXZC.json').write_text(json.dumps(RESULT))
+    (cache_dir / 'CostcoScraper_QN65Q60DAFXZC.json').write_text(
+        json.dumps({'timestamp': 1700000000.0, 'value': RESULT}))
+    (cache_dir / 'GoneScraper_QN65Q60DAFXZC.json').write_text(json.dumps(RESULT))
+    (cache_dir / 'StaplesScraper_QN65Q60DAFXZC.json').write_text('{"truncated": ')
+
+    assert migrate(cache_dir, store, batch_size=1, delete=True) == 2
+    assert store.get_cache('bestbuy', 'QN65Q60DAFXZC')[1] == RESULT
+    assert store.get_cache('costco', 'QN65Q60DAFXZC') == (1700000000.0, RESULT)
+    remaining = sorted(path.name for path in cache_dir.glob('*.json'))
+    assert remaining == ['GoneScraper_QN65Q60DAFXZC.json', 'StaplesScraper_QN65Q60DAFXZC.json']
@@ -0,0 +1,83 @@
+import pytest
+from utils.parsing import (
+    ExtractionSpec, ParseExecutor, Selector, TileExtractor, extract_first, extract_items,
+)
+
+SPEC = ExtractionSpec(
+    'test',
+    container=Selector('div', {'class': 'product-tile'}),
+    fields={
+        'title': Selector('h3', {'class': 'title'}),
+        'price': Selector('span', {'class': 'price'}),
+        'url': Selector('a', {'class': 'link'}, attr='href'),
+    }
+)
+
+HTML = """
+<html><body>
+<div class="banner"><span class="price">$1.00</span></div>
+<div class="product-tile">
+  <h3 class="title"> Samsung 65" TV </h3>
+  <span class="price">$1,299.99</span>
+  <a class="link" href="/p/1">View</a>
+</div>
+<div class="product-tile"><h3 class="title">Second</h3></div>
+</body></html>
+"""
+
+def test_extract_first_reads_first_tile_only():
+    assert extract_first(HTML, SPEC) == {
+        'title': 'Samsung 65" TV',
+        'price': '$1,299.99',
+        'url': '/p/1',
+    }
+
+def test_missing_fields_are_none():
+    item = extract_first('<div class="product-tile"><h3 class="title">x</h3></div>', SPEC)
+    assert item == {'title': 'x', 'price': None, 'url': None}
+
+def test_missing_container_returns_none():
+    assert extract_first('<html></html>', SPEC) is None
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('mode', ParseExecutor.MODES)
+async def test_executor_modes_agree(mode):
+    executor = ParseExecutor(mode, max_workers=1)
+    try:
+        assert await executor.run(extract_first, HTML, SPEC) == extract_first(HTML, SPEC)
+    finally:
+        executor.shutdown()
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ParseExecutor('gpu')
+
+def test_class_matching_follows_beautifulsoup():
+    spec = ExtractionSpec(
+        'classes',
+        container=Selector('div', {'class': 'price_FHDfG large_3gQAp'}),
+        fields={'title': Selector('span', {'data-role': "it's"})},
+    )
+    html = """
+    <div class="price_FHDfG">partial</div>
+    <div class="price_FHDfG  large_3gQAp"><span data-role="it's">exact</span></div>
+    """
+    assert extract_first(html, spec) == {'title': 'exact'}
+
+def test_partial_and_full_parse_agree():
+    html = HTML.replace('<div class="product-tile"><h3 class="title">Second</h3></div>',
+                        '<div class="product-tile"><h3 class="title">Second</h3></div>' * 3)
+    for limit in (1, 2, 10):
+        full = extract_items(html, SPEC, limit, partial=False)
+        assert extract_items(html, SPEC, limit, partial=True) == full
+
+def test_tile_extractor_stops_once_limit_reached():
+    extractor = TileExtractor(SPEC, limit=1)
+    data = HTML.encode('utf-8')
+    consumed = 0
+    for offset in range(0, len(data), 16):
+        consumed = offset + 16
+        if extractor.feed(data[offset:offset + 16]):
+            break
+    assert consumed < len(data)
+    assert extractor.close()[0]['title'] == 'Samsung 65" TV'
@@ -0,0 +1,56 @@
+import io
+import json
+import pytest
+from utils.product_io import open_output, read_products, write_jsonl
+
+def test_jsonl_and_bare_names(tmp_path):
+    path = tmp_path / 'products.jsonl'
+    path.write_text(
+        '{"name": "Samsung QN65Q60DAFXZC", "sku": 1}\n'
+        '\n'
+        '# comment\n'
+        'LG OLED65C1PUB\n'
+        '{broken\n'
+        '{"title": "no name"}\n',
+        encoding='utf-8'
+    )
+    assert list(read_products(str(path))) == [
+        {'name': 'Samsung QN65Q60DAFXZC', 'sku': 1},
+        {'name': 'LG OLED65C1PUB'},
+    ]
+
+def test_csv_requires_name_column(tmp_path):
+    path = tmp_path / 'products.csv'
+    path.write_text('name,notes\n"Sony 65"" XR65A80K",x\n,empty\n', encoding='utf-8')
+    assert list(read_products(str(path))) == [{'name': 'Sony 65" XR65A80K', 'notes': 'x'}]
+
+    path.write_text('title\nSony\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(read_products(str(path)))
+
+def test_legacy_json_array(tmp_path):
+    path = tmp_path / 'products.json'
+    path.write_text(json.dumps([{'name': 'a'}, {'name': 'b'}]), encoding='utf-8')
+    assert [p['name'] for p in read_products(str(path))] == ['a', 'b']
+
+    path.write_text(json.dumps({'name': 'a'}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(read_products(str(path)))
+
+def test_stdin_is_read_lazily(monkeypatch):
+    lines = iter(['first\n', 'second\n'])
+    monkeypatch.setattr('sys.stdin', lines)
+    products = read_products('-')
+    assert next(products) == {'name': 'first'}
+    assert next(lines) == 'second\n'
+
+def test_output_appends_jsonl(tmp_path):
+    path = tmp_path / 'out' / 'results.jsonl'
+    for name in ('a', 'b'):
+        with open_output(str(path)) as handle:
+            write_jsonl(handle, {'Name': name})
+    assert [json.loads(line)['Name'] for line in path.read_text().splitlines()] == ['a', 'b']
+
+    buffer = io.StringIO()
+    write_jsonl(buffer, {'Name': 'ü'})
+    assert buffer.getvalue() == '{"Name": "ü"}\n'
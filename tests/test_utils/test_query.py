@@ -0,0 +1,21 @@
+import pytest
+from utils.query import canonical_query, extract_model_number, normalize_query
+
+@pytest.mark.parametrize('name, model', [
+    ('Samsung 65" 4K Tizen Smart QLED TV - QN65Q60DAFXZC', 'QN65Q60DAFXZC'),
+    ('Samsung 43" 4K Tizen Smart CUHD TV-UN43DU7100FXZC', 'UN43DU7100FXZC'),
+    ('Hisense 32" HD Smart VIDAA LED TV - 32A4KV', '32A4KV'),
+    ('LG OLED65C1PUB 65" TV', 'OLED65C1PUB'),
+    ('Sony BRAVIA 55" 4K HDR10 120HZ 2160P TV', None),
+    ('NonexistentProduct12345', None),
+])
+def test_extract_model_number(name, model):
+    assert extract_model_number(name) == model
+
+def test_canonical_query_collapses_marketing_variants():
+    assert canonical_query('Samsung 43" 4K Tizen Smart CUHD TV-UN43DU7100FXZC') == \
+        canonical_query('Samsung 43" Crystal UHD TV - UN43DU7100FXZC')
+    assert canonical_query('  Generic  Smart TV ') == 'generic smart tv'
+
+def test_normalize_query():
+    assert normalize_query('  Samsung  65"\tQLED TV ') == normalize_query('samsung 65" qled tv')
@@ -0,0 +1,50 @@
+import asyncio
+import time
+import pytest
+from utils.rate_limiter import RateLimiter
+
+LIMITS = {
+    'fast': {'requests': 100, 'period': 1},
+    'default': {'requests': 2, 'period': 0.2},
+}
+
+@pytest.mark.asyncio
+async def test_burst_is_allowed_without_waiting():
+    limiter = RateLimiter(LIMITS)
+    start = time.monotonic()
+    await limiter.wait('slow')
+    await limiter.wait('slow')
+    assert time.monotonic() - start < 0.05
+
+@pytest.mark.asyncio
+async def test_requests_beyond_burst_are_spaced():
+    limiter = RateLimiter(LIMITS)
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.wait('slow')
+    # Two requests burst, the next two are spaced 0.1s apart
+    assert time.monotonic() - start >= 0.18
+
+@pytest.mark.asyncio
+async def test_throttled_retailer_does_not_block_others():
+    limiter = RateLimiter(LIMITS)
+    for _ in range(2):
+        await limiter.wait('slow')
+
+    blocked = asyncio.ensure_future(limiter.wait('slow'))
+    start = time.monotonic()
+    await limiter.wait('fast')
+    assert time.monotonic() - start < 0.05
+    await blocked
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_order():
+    limiter = RateLimiter({'default': {'requests': 1, 'period': 0.01}})
+    order = []
+
+    async def request(i):
+        await limiter.wait('shop')
+        order.append(i)
+
+    await asyncio.gather(*(request(i) for i in range(5)))
+    assert order == list(range(5))
@@ -0,0 +1,106 @@
+import io
+import pytest
+from aiohttp import web
+from main import PriceScraper
+from utils.history import PriceHistory
+from utils.refresh import RefreshScheduler
+from utils.storage import SQLiteStore
+
+HOUR = 3600.0
+PAGE = ('<html><body><div class="tile"><h3 class="title">Samsung TV</h3>'
+        '<span class="price">$999.99</span></div></body></html>')
+ETAG = '"v1"'
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+@pytest.fixture
+def refresh(clock):
+    refresh = RefreshScheduler(min_interval=HOUR, max_interval=24 * HOUR, clock=clock)
+    refresh.add('bestbuy', 'VOLATILE1', {'name': 'Volatile'})
+    refresh.add('bestbuy', 'STABLE1', {'name': 'Stable'})
+    return refresh
+
+def test_never_fetched_pairs_go_first_and_min_interval_holds(refresh, clock):
+    first, _ = refresh.next('bestbuy')
+    second, _ = refresh.next('bestbuy')
+    assert {first.model, second.model} == {'VOLATILE1', 'STABLE1'}
+    refresh.succeeded(first, False)
+    refresh.succeeded(second, False)
+
+    clock.now += HOUR / 2
+    pair, wait = refresh.next('bestbuy')
+    assert pair is None and wait == pytest.approx(HOUR / 2)
+
+def test_volatile_pairs_are_preferred(refresh, clock):
+    pairs = refresh.pairs['bestbuy']
+    for _ in range(5):
+        for model in ('VOLATILE1', 'STABLE1'):
+            pair = pairs[model]
+            pair.in_flight = True
+            pair.last_attempt = clock.now
+            refresh.succeeded(pair, model == 'VOLATILE1')
+        clock.now += 2 * HOUR
+
+    pair, _ = refresh.next('bestbuy')
+    assert pair.model == 'VOLATILE1'
+    assert pairs['VOLATILE1'].changes == 4 and pairs['STABLE1'].changes == 0
+
+def test_overdue_pairs_beat_volatile_ones(refresh, clock):
+    pairs = refresh.pairs['bestbuy']
+    pairs['VOLATILE1'].changes = 20
+    pairs['VOLATILE1'].first_seen = clock.now - 10 * HOUR
+    pairs['VOLATILE1'].last_success = pairs['VOLATILE1'].last_attempt = clock.now - 2 * HOUR
+    pairs['STABLE1'].first_seen = clock.now - 30 * HOUR
+    pairs['STABLE1'].last_success = pairs['STABLE1'].last_attempt = clock.now - 25 * HOUR
+
+    pair, _ = refresh.next('bestbuy')
+    assert pair.model == 'STABLE1'
+    assert refresh.stats['overdue'] == 1
+
+@pytest.mark.asyncio
+async def test_load_seeds_state_from_price_history(tmp_path, refresh):
+    store = SQLiteStore(tmp_path / 'test.db')
+    try:
+        history = PriceHistory(store)
+        await history.record([('bestbuy', 'VOLATILE1', '10.00')])
+        await history.record([('bestbuy', 'VOLATILE1', '12.00')])
+        await refresh.load(store)
+    finally:
+        store.close()
+
+    pair = refresh.pairs['bestbuy']['VOLATILE1']
+    assert pair.changes == 1
+    assert pair.last_success is not None
+    assert refresh.pairs['bestbuy']['STABLE1'].last_success is None
+
+@pytest.mark.asyncio
+async def test_watch_refreshes_from_the_retailer_not_the_cache(serve, stub_retailer, store):
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == ETAG:
+            return web.Response(status=304, headers={'ETag': ETAG})
+        return web.Response(text=PAGE, content_type='text/html', headers={'ETag': ETAG})
+
+    stub_retailer(await serve({'/search': handler}))
+    refresh = RefreshScheduler(min_interval=0.05, max_interval=HOUR)
+    async with PriceScraper('stub', store=store) as price_scraper:
+        await price_scraper.watch([{'name': 'Samsung TV - QN65Q60DAFXZC'}], io.StringIO(),
+                                  refresh=refresh, duration=0.5)
+
+    refreshed = refresh.stats['refreshed']
+    assert refreshed >= 3
+    # One request per refresh (plus one cut short when the watch ended)
+    assert refreshed <= len(seen) <= refreshed + 1
+    # Refreshes still revalidate instead of downloading the page again
+    assert seen[0] is None and set(seen[1:]) == {ETAG}
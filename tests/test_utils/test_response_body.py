@@ -0,0 +1,67 @@
+import importlib.util
+import pytest
+from aiohttp import web
+from utils.session import ResponseTooLarge, accept_encoding
+
+PAGE = ('<html><body><div class="tile"><h3 class="title">Téléviseur Samsung</h3>'
+        '<span class="price">999,99 $</span></div></body></html>')
+
+@pytest.fixture
+async def page_server(serve):
+    calls = {'count': 0}
+
+    async def search(request):
+        calls['count'] += 1
+        # Latin-1 body that is only readable with the header's charset
+        response = web.Response(body=PAGE.encode('latin-1'), content_type='text/html',
+                                charset='iso-8859-1')
+        response.enable_compression()
+        return response
+
+    async def huge(request):
+        calls['count'] += 1
+        response = web.StreamResponse()
+        response.content_type = 'text/html'
+        await response.prepare(request)
+        for _ in range(64):
+            await response.write(b'<p>' + b'x' * 4096 + b'</p>')
+        return response
+
+    return await serve({'/search': search, '/huge': huge}), calls
+
+@pytest.fixture
+def scraper(make_scraper, page_server):
+    scraper = make_scraper()
+    scraper.base_url = page_server[0]
+    scraper.cache.enabled = False
+    return scraper
+
+@pytest.mark.asyncio
+async def test_compressed_bytes_are_decoded_with_response_charset(scraper):
+    result = await scraper.search('Samsung TV - QN65Q60DAFXZC')
+    assert result[0].title == 'Téléviseur Samsung'
+    assert result[0].price == '999.99'
+
+def test_prices_with_a_decimal_comma(make_scraper):
+    scraper = make_scraper()
+    assert scraper.clean_price('999,99 $') == '999.99'
+    assert scraper.clean_price('1\xa0299,99\xa0$') == '1299.99'
+    assert scraper.clean_price('$1,299.99') == '1299.99'
+    assert scraper.clean_price('$1,299') == '1299'
+
+@pytest.mark.asyncio
+async def test_oversized_body_is_abandoned_without_retry(scraper, page_server):
+    url, calls = page_server
+    scraper.max_response_bytes = 64 * 1024
+    with pytest.raises(ResponseTooLarge):
+        await scraper.make_request(f"{url}/huge")
+    assert calls['count'] == 1
+
+def test_accept_encoding_lists_only_available_codecs(make_scraper, monkeypatch):
+    accept_encoding.cache_clear()
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+    try:
+        assert accept_encoding() == 'gzip, deflate'
+    finally:
+        accept_encoding.cache_clear()
+    assert make_scraper().headers['Accept-Encoding'] == accept_encoding()
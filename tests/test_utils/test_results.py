@@ -0,0 +1,66 @@
+import dataclasses
+import pytest
+from main import PriceScraper
+from scrapers import REGISTRY
+from utils.results import PriceResult, Retailer, format_cents, retailer_key, to_cents
+from utils.validators import ProductValidationError, ProductValidator
+
+RESULT = PriceResult(
+    retailer=Retailer.BESTBUY, brand='Samsung', website='Best Buy',
+    title='Samsung 65" QLED TV', price_cents=129999, url='https://www.bestbuy.ca/p/1',
+    price_valid_till='', confidence=0.95,
+)
+
+def test_result_is_frozen_and_slotted():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        RESULT.price_cents = 1
+    assert not hasattr(RESULT, '__dict__')
+    assert RESULT.price == '1299.99'
+
+def test_cents_round_trip():
+    assert to_cents('1299.99') == 129999
+    assert to_cents('1299') == 129900
+    assert to_cents('0.1') == 10
+    assert to_cents('') is None
+    assert to_cents('call for price') is None
+    assert to_cents('0') is None
+    assert format_cents(129999) == '1299.99'
+    assert format_cents(5) == '0.05'
+
+def test_retailer_keys_match_the_registry():
+    # A retailer added to one list must be added to the other
+    assert [retailer.value for retailer in Retailer] == list(REGISTRY)
+
+def test_retailers_are_shared_members():
+    assert retailer_key('bestbuy') is Retailer.BESTBUY
+    assert retailer_key('bestbuy') == 'bestbuy'
+    assert retailer_key('newstore') == 'newstore'
+
+def test_dict_round_trip_and_legacy_records():
+    assert PriceResult.from_dict(RESULT.to_dict()) == RESULT
+    # Cached before results carried cents and a retailer
+    legacy = {'brand': 'Samsung', 'website': 'Best Buy', 'title': 'Samsung 65" QLED TV',
+              'price': '1299.99', 'price_valid_till': '', 'url': 'https://www.bestbuy.ca/p/1'}
+    restored = PriceResult.from_dict(legacy, 'bestbuy')
+    assert restored == dataclasses.replace(RESULT, confidence=None)
+    assert PriceResult.from_dict({**legacy, 'price': 'N/A'}, 'bestbuy') is None
+
+def test_output_shape():
+    assert PriceScraper.format_product([RESULT]) == {
+        'Brand': 'Samsung',
+        'Product': [{
+            'Website': 'Best Buy',
+            'Title': 'Samsung 65" QLED TV',
+            'Price': '1299.99',
+            'PriceValidTill': '',
+            'URL': 'https://www.bestbuy.ca/p/1',
+        }],
+    }
+
+def test_validator_accepts_cents():
+    assert ProductValidator.validate_price(129999)
+    assert not ProductValidator.validate_price(0)
+    assert ProductValidator.validate_price('$1,299.99')
+    ProductValidator.validate_product_data(RESULT)
+    with pytest.raises(ProductValidationError):
+        ProductValidator.validate_product_data(dataclasses.replace(RESULT, price_cents=-1))
@@ -0,0 +1,49 @@
+import pytest
+from aiohttp import web
+from utils.retry import RetryPolicy
+
+@pytest.fixture
+async def flaky_server(serve):
+    calls = {'count': 0}
+
+    async def handler(request):
+        calls['count'] += 1
+        if calls['count'] < 3:
+            return web.Response(status=503, headers={'Retry-After': '0'})
+        return web.Response(text='ok')
+
+    return await serve({'/': handler}), calls
+
+def test_parse_retry_after():
+    assert RetryPolicy.parse_retry_after('120') == 120.0
+    assert RetryPolicy.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert RetryPolicy.parse_retry_after('soon') is None
+    assert RetryPolicy.parse_retry_after(None) is None
+
+def test_backoff_is_capped_and_jittered():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+    for attempt in range(10):
+        assert 0 <= policy.backoff(attempt) <= 4
+
+def test_budget_is_per_retailer():
+    policy = RetryPolicy(budgets={'default': 1})
+    assert policy.spend('a')
+    assert not policy.spend('a')
+    assert policy.spend('b')
+    assert policy.budget_exhausted == {'a': 1}
+
+@pytest.mark.asyncio
+async def test_make_request_retries_transient_errors(flaky_server, make_scraper):
+    url, calls = flaky_server
+    scraper = make_scraper(retry_policy=RetryPolicy(max_retries=3, base_delay=0))
+    assert await scraper.make_request(url) == 'ok'
+    assert calls['count'] == 3
+    assert scraper.retry_policy.retries_spent['stub'] == 2
+
+@pytest.mark.asyncio
+async def test_make_request_gives_up_after_max_retries(flaky_server, make_scraper):
+    url, calls = flaky_server
+    scraper = make_scraper(retry_policy=RetryPolicy(max_retries=1, base_delay=0))
+    with pytest.raises(Exception):
+        await scraper.make_request(url)
+    assert calls['count'] == 2
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+from utils.scheduler import ConcurrencyLimiter, JobScheduler
+
+@pytest.mark.asyncio
+async def test_results_stream_in_completion_order():
+    async def job(delay, value):
+        await asyncio.sleep(delay)
+        return value
+
+    jobs = [('slow', lambda: job(0.05, 'slow')), ('fast', lambda: job(0, 'fast'))]
+    order = [key async for key, _ in JobScheduler().run(jobs)]
+    assert order == ['fast', 'slow']
+
+@pytest.mark.asyncio
+async def test_exceptions_are_yielded_as_results():
+    async def boom():
+        raise ValueError('boom')
+
+    results = [result async for _, result in JobScheduler().run([('a', boom)])]
+    assert isinstance(results[0], ValueError)
+
+@pytest.mark.asyncio
+async def test_jobs_are_pulled_lazily():
+    started = []
+
+    def jobs():
+        for i in range(10):
+            started.append(i)
+            yield i, lambda: asyncio.sleep(0)
+
+    scheduler = JobScheduler(max_pending=2)
+    async for key, _ in scheduler.run(jobs()):
+        # Never more than max_pending jobs ahead of the consumer
+        assert len(started) - key <= 3
+
+@pytest.mark.asyncio
+async def test_limiter_caps_global_and_per_retailer_concurrency():
+    limiter = ConcurrencyLimiter(global_limit=3, retailer_limits={'default': 1})
+    active = {'all': 0, 'peak': 0, 'a': 0, 'peak_a': 0}
+
+    async def request(retailer):
+        async with limiter.slot(retailer):
+            active['all'] += 1
+            active[retailer] = active.get(retailer, 0) + 1
+            active['peak'] = max(active['peak'], active['all'])
+            if retailer == 'a':
+                active['peak_a'] = max(active['peak_a'], active['a'])
+            await asyncio.sleep(0.01)
+            active['all'] -= 1
+            active[retailer] -= 1
+
+    await asyncio.gather(*(request(r) for r in ['a', 'a', 'b', 'c', 'd', 'e']))
+    assert active['peak'] <= 3
+    assert active['peak_a'] == 1
@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from utils.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ['result']
+
+    results = await asyncio.gather(*(flights.do(('bestbuy', 'tv'), fetch) for _ in range(5)),
+                                   flights.do(('costco', 'tv'), fetch))
+    assert calls == 2
+    assert results == [['result']] * 6
+    assert flights.stats == {'executed': 2, 'coalesced': 4}
+    assert len(flights) == 0
+
+    # Finished keys run again rather than serving a stale result
+    await flights.do(('bestbuy', 'tv'), fetch)
+    assert calls == 3
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_cancellation_is_isolated():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError('boom')
+
+    first = asyncio.ensure_future(flights.do('key', fail))
+    second = asyncio.ensure_future(flights.do('key', fail))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(RuntimeError):
+        await second
+    with pytest.raises(asyncio.CancelledError):
+        await first
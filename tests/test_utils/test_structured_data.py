@@ -0,0 +1,73 @@
+import json
+from utils.parsing import ExtractionSpec, Selector, extract_product
+from utils.structured_data import extract_structured
+
+SPEC = ExtractionSpec(
+    'test',
+    container=Selector('div', {'class': 'product-tile'}),
+    fields={
+        'title': Selector('h3', {'class': 'title'}),
+        'price': Selector('span', {'class': 'price'}),
+    }
+)
+
+TILE = ('<div class="product-tile"><h3 class="title">From tile</h3>'
+        '<span class="price">$9.99</span></div>')
+
+def _ld_json(data) -> str:
+    return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+def test_json_ld_item_list():
+    page = _ld_json({
+        '@context': 'https://schema.org',
+        '@type': 'ItemList',
+        'itemListElement': [
+            {'@type': 'ListItem', 'position': 1, 'item': {
+                '@type': 'Product', 'name': 'Samsung QN65Q60DAFXZC',
+                'url': 'https://example.com/p/1',
+                'offers': {'@type': 'Offer', 'price': 1299.99, 'priceCurrency': 'CAD'},
+            }},
+            {'@type': 'ListItem', 'position': 2, 'item': {
+                '@type': 'Product', 'name': 'Second', 'offers': {'price': '10'},
+            }},
+        ],
+    })
+    assert extract_structured(page) == {
+        'title': 'Samsung QN65Q60DAFXZC',
+        'price': '1299.99',
+        'url': 'https://example.com/p/1',
+    }
+
+def test_json_ld_product_is_preferred_over_embedded_state():
+    state = ('<script id="__NEXT_DATA__" type="application/json">'
+             '{"props": {"products": [{"title": "State", "salePrice": 5}]}}</script>')
+    page = state + _ld_json({'@type': ['Product'], 'name': 'LD',
+                             'offers': [{'@type': 'AggregateOffer', 'lowPrice': '799.00'}]})
+    assert extract_structured(page)['title'] == 'LD'
+
+def test_next_data_and_window_state():
+    next_data = ('<script id="__NEXT_DATA__" type="application/json">'
+                 '{"props": {"products": [{"productName": "Next", "price": {"value": 499}}]}}'
+                 '</script>')
+    assert extract_structured(next_data) == {'title': 'Next', 'price': '499.00', 'url': None}
+
+    state = ('<script>window.__INITIAL_STATE__ = {"search": {"items": '
+             '[{"name": "LG 55\\"", "currentPrice": "$649.99", "productUrl": "/p/55"}]}};'
+             'window.other = 1;</script>')
+    assert extract_structured(state.encode('utf-8')) == {
+        'title': 'LG 55"', 'price': '$649.99', 'url': '/p/55',
+    }
+
+def test_broken_or_missing_blobs():
+    assert extract_structured('<html><body>no data</body></html>') is None
+    assert extract_structured('<script type="application/ld+json">{not json</script>') is None
+    assert extract_structured(_ld_json({'@type': 'Product', 'name': 'No offer'})) is None
+
+def test_extract_product_falls_back_to_selectors():
+    page = f"<html><body>{TILE}</body></html>"
+    assert extract_product(page, SPEC) == ({'title': 'From tile', 'price': '$9.99'}, 'selectors')
+
+    page = _ld_json({'@type': 'Product', 'name': 'LD', 'offers': {'price': 1}}) + TILE
+    assert extract_product(page, SPEC)[1] == 'structured'
+    assert extract_product(page, SPEC, structured=False)[1] == 'selectors'
+    assert extract_product('<html></html>', SPEC) == (None, None)
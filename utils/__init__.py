@@ -1,13 +1,52 @@
 """
 Utility modules for TV price scraper.
+
+The classes below are imported from their modules on first access, so
+importing one light module (e.g. ``utils.product_io``) doesn't pull in
+aiohttp and lxml through this package.
 """
 
-from .cache import Cache
-from .rate_limiter import RateLimiter
-from .validators import ProductValidator
+import importlib
+from typing import List
+
+_EXPORTS = {
+    'Cache': '.cache',
+    'SQLiteStore': '.storage',
+    'RateLimiter': '.rate_limiter',
+    'RetryPolicy': '.retry',
+    'ProductValidator': '.validators',
+    'SessionManager': '.session',
+    'ConcurrencyLimiter': '.scheduler',
+    'JobScheduler': '.scheduler',
+    'ExtractionSpec': '.parsing',
+    'ParseExecutor': '.parsing',
+    'Selector': '.parsing',
+    'PriceResult': '.results',
+    'Retailer': '.results',
+}
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(importlib.import_module(module, __name__), name)
+    return value
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
 
 __all__ = [
     'Cache',
+    'SQLiteStore',
     'RateLimiter',
+    'RetryPolicy',
     'ProductValidator',
+    'SessionManager',
+    'ConcurrencyLimiter',
+    'JobScheduler',
+    'ExtractionSpec',
+    'ParseExecutor',
+    'Selector',
+    'PriceResult',
+    'Retailer',
 ]
@@ -1,41 +1,177 @@
-import json
+import asyncio
+import logging
 import time
-from pathlib import Path
-from typing import Any, Optional
-from config.settings import CACHE_DIR, CACHE_DURATION
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from config.settings import (
+    CACHE_DURATION,
+    CACHE_ENABLED,
+    CACHE_MEMORY_ENTRIES,
+    CACHE_WRITE_BATCH,
+    CACHE_FLUSH_DELAY,
+)
+from .storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Marks a key known to be absent from the store so repeated misses skip it
+_MISSING = object()
+
+Key = Tuple[str, str]
+
+class Validator(NamedTuple):
+    """HTTP validators of a fetched page plus the result parsed from it"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    value: Any
+
+    def headers(self) -> Dict[str, str]:
+        """Conditional request headers that revalidate the page"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
 
 class Cache:
-    def __init__(self):
-        self.cache_dir = Path(CACHE_DIR)
-        self.cache_dir.mkdir(exist_ok=True)
+    """Two-tier TTL cache: a bounded in-process LRU in front of SQLite.
+
+    Entries are keyed by (retailer, model) and remember when they were
+    stored, so callers can apply their own TTL (e.g. per retailer) on read.
+    Hits served from memory never touch the database; writes are buffered
+    and flushed in batched transactions on the store's executor.
+    """
+
+    def __init__(self,
+                 store: Optional[SQLiteStore] = None,
+                 ttl: float = CACHE_DURATION,
+                 max_entries: int = CACHE_MEMORY_ENTRIES,
+                 enabled: bool = CACHE_ENABLED,
+                 batch_size: int = CACHE_WRITE_BATCH,
+                 flush_delay: float = CACHE_FLUSH_DELAY,
+                 refresh: bool = False):
+        self.store = store if store is not None else SQLiteStore()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_delay = flush_delay
+        # Refresh mode skips reads but still stores fresh results
+        self.refresh = refresh
+        self._memory: "OrderedDict[Key, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[Key, Tuple[float, Any]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'evictions': 0,
+            'writes': 0,
+            'flushes': 0,
+        }
+
+    def _remember(self, key: Key, stored_at: float, value: Any) -> None:
+        self._memory[key] = (stored_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    async def get(self, retailer: str, model: str, ttl: Optional[float] = None) -> Optional[Any]:
+        if not self.enabled or self.refresh:
+            return None
+        ttl = self.ttl if ttl is None else ttl
+        key = (retailer, model)
 
-    def _get_cache_path(self, key: str) -> Path:
-        return self.cache_dir / f"{key}.json"
+        entry = self._memory.get(key)
+        if entry is None and key in self._pending:
+            # Evicted from memory before its batch was flushed
+            entry = self._pending[key]
+            self._remember(key, *entry)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            source = 'memory_hits'
+        else:
+            entry = await self.store.get_cache_async(retailer, model)
+            source = 'disk_hits'
 
-    def get(self, key: str) -> Optional[Any]:
-        cache_path = self._get_cache_path(key)
-        if not cache_path.exists():
+        if entry is None or entry[1] is _MISSING:
+            if entry is None:
+                self._remember(key, time.time(), _MISSING)
+            self.stats['misses'] += 1
             return None
 
+        stored_at, value = entry
+        if time.time() - stored_at > ttl:
+            self.stats['expired'] += 1
+            self.stats['misses'] += 1
+            self._remember(key, stored_at, _MISSING)
+            return None
+
+        if source == 'disk_hits':
+            self._remember(key, stored_at, value)
+        self.stats[source] += 1
+        return value
+
+    async def set(self, retailer: str, model: str, value: Any) -> None:
+        if not self.enabled:
+            return
+        key = (retailer, model)
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+        self._pending[key] = (stored_at, value)
+        self.stats['writes'] += 1
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered entries to the store in one transaction"""
+        if not self._pending:
+            return
+        rows = [
+            (retailer, model, stored_at, value)
+            for (retailer, model), (stored_at, value) in self._pending.items()
+        ]
+        self._pending = {}
         try:
-            with cache_path.open('r') as f:
-                data = json.load(f)
-                if time.time() - data['timestamp'] > CACHE_DURATION:
-                    cache_path.unlink()
-                    return None
-                return data['value']
-        except Exception:
+            await self.store.put_cache_many_async(rows)
+            self.stats['flushes'] += 1
+        except Exception as e:
+            logger.warning(f"Cache flush failed for {len(rows)} entries: {str(e)}")
+
+    async def get_validator(self, url: str) -> Optional[Validator]:
+        """Validators stored for ``url``, kept past the TTL so stale entries can be revalidated"""
+        if not self.enabled or self.refresh:
             return None
+        row = await self.store.get_validator_async(url)
+        return Validator(*row) if row is not None else None
 
-    def set(self, key: str, value: Any) -> None:
-        cache_path = self._get_cache_path(key)
-        data = {
-            'timestamp': time.time(),
-            'value': value
-        }
-        with cache_path.open('w') as f:
-            json.dump(data, f)
+    async def set_validator(self, url: str, etag: Optional[str], last_modified: Optional[str],
+                            value: Any) -> None:
+        if not self.enabled or not (etag or last_modified):
+            return
+        await self.store.put_validator_async(url, etag, last_modified, value)
+
+    async def purge_expired(self, max_age: Optional[float] = None) -> int:
+        """Drop stored entries older than ``max_age`` (defaults to the cache TTL)"""
+        return await self.store.purge_cache_async(self.ttl if max_age is None else max_age)
+
+    async def close(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        await self.flush()
 
-    def clear(self) -> None:
-        for cache_file in self.cache_dir.glob('*.json'):
-            cache_file.unlink() 
\ No newline at end of file
+    @property
+    def hit_rate(self) -> float:
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
@@ -0,0 +1,124 @@
+import itertools
+import logging
+import time
+from typing import Callable, Dict, Optional
+from config.settings import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a retailer whose circuit is open"""
+
+    def __init__(self, retailer: str, retry_in: float):
+        super().__init__(f"Circuit open for {retailer}; next probe in {retry_in:.0f}s")
+        self.retailer = retailer
+        self.retry_in = retry_in
+
+class _Circuit:
+    __slots__ = ('state', 'failures', 'opened_at', 'probe')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # Token of the half-open probe in flight, if any
+        self.probe: Optional[int] = None
+
+class CircuitBreaker:
+    """Per-retailer circuit breaker.
+
+    A retailer's circuit opens after ``failure_threshold`` consecutive
+    failures; while open, requests fail fast with ``CircuitOpenError``.
+    Once ``reset_timeout`` has passed it goes half-open and lets a single
+    probe through: success closes the circuit, failure opens it again for
+    another ``reset_timeout``. Only the probe's own outcome counts then;
+    requests sent before the circuit opened that finish late are ignored.
+    """
+
+    def __init__(self,
+                 failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._circuits: Dict[str, _Circuit] = {}
+        self._tokens = itertools.count(1)
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _circuit(self, retailer: str) -> _Circuit:
+        circuit = self._circuits.get(retailer)
+        if circuit is None:
+            circuit = self._circuits[retailer] = _Circuit()
+            self.stats[retailer] = {'opened': 0, 'rejected': 0}
+        return circuit
+
+    def state(self, retailer: str) -> str:
+        return self._circuit(retailer).state
+
+    def check(self, retailer: str) -> Optional[int]:
+        """Raise ``CircuitOpenError`` unless a request to ``retailer`` may go out.
+
+        Returns a probe token when the request is the half-open probe, to be
+        passed back with its outcome; None otherwise.
+        """
+        circuit = self._circuit(retailer)
+        if circuit.state == CLOSED:
+            return None
+        if circuit.state == OPEN:
+            retry_in = circuit.opened_at + self.reset_timeout - self.clock()
+            if retry_in > 0:
+                self._reject(retailer, retry_in)
+            circuit.state = HALF_OPEN
+            logger.info(f"Circuit half-open for {retailer}; sending a probe")
+        if circuit.probe is not None:
+            # Only one probe at a time; the rest wait for its outcome
+            self._reject(retailer, 0.0)
+        circuit.probe = next(self._tokens)
+        return circuit.probe
+
+    def _reject(self, retailer: str, retry_in: float) -> None:
+        self.stats[retailer]['rejected'] += 1
+        raise CircuitOpenError(retailer, retry_in)
+
+    @staticmethod
+    def _is_straggler(circuit: _Circuit, probe: Optional[int]) -> bool:
+        # Once the circuit has opened, only the admitted probe may settle it
+        return circuit.state != CLOSED and probe != circuit.probe
+
+    def record_success(self, retailer: str, probe: Optional[int] = None) -> None:
+        circuit = self._circuit(retailer)
+        if self._is_straggler(circuit, probe):
+            return
+        if circuit.state != CLOSED:
+            logger.info(f"Circuit closed for {retailer}")
+        circuit.state = CLOSED
+        circuit.failures = 0
+        circuit.probe = None
+
+    def record_failure(self, retailer: str, probe: Optional[int] = None) -> bool:
+        """Count a failure; True when it opened the circuit"""
+        circuit = self._circuit(retailer)
+        if self._is_straggler(circuit, probe):
+            return False
+        circuit.failures += 1
+        circuit.probe = None
+        tripped = circuit.state == CLOSED and circuit.failures >= self.failure_threshold
+        if circuit.state == HALF_OPEN or tripped:
+            circuit.state = OPEN
+            circuit.opened_at = self.clock()
+            self.stats[retailer]['opened'] += 1
+            logger.warning(f"Circuit open for {retailer} after {circuit.failures} consecutive "
+                           f"failures; probing again in {self.reset_timeout:.0f}s")
+            return True
+        return False
+
+    def release(self, retailer: str, probe: int) -> None:
+        """Forget an in-flight probe that ended without an outcome (e.g. cancelled)"""
+        circuit = self._circuit(retailer)
+        if circuit.probe == probe:
+            circuit.probe = None
@@ -0,0 +1,53 @@
+import logging
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from .results import to_cents
+from .storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+class PriceChange(NamedTuple):
+    retailer: str
+    model: str
+    # None when the (retailer, model) pair had never been seen before
+    previous_cents: Optional[int]
+    price_cents: int
+
+class PriceHistory:
+    """Records observed prices and reports which ones changed.
+
+    Prices are kept as integer cents per (retailer, model), where the model
+    is the retailer's search key for the product. Only changes are
+    appended to the history, so a run costs one indexed lookup per price
+    and a few rows for the prices that moved.
+    """
+
+    def __init__(self, store: SQLiteStore):
+        self.store = store
+        self.stats: Dict[str, int] = {'observed': 0, 'changed': 0, 'new': 0}
+
+    async def record(self, observations: Iterable[Tuple[str, str, Union[int, str, None]]],
+                     run_id: Optional[str] = None) -> List[PriceChange]:
+        """Record ``(retailer, model, price)`` observations and return the changes among them.
+
+        Prices are integer cents, or strings such as '1299.99'.
+        """
+        rows = []
+        for retailer, model, price in observations:
+            cents = price if isinstance(price, int) else to_cents(price)
+            if cents is None:
+                logger.debug(f"Not recording unparseable price {price!r} for {model} at {retailer}")
+                continue
+            rows.append((retailer, model, cents))
+        if not rows:
+            return []
+
+        recorded = await self.store.record_prices_async(run_id, rows)
+        changes = [PriceChange(*change) for change in recorded]
+        self.stats['observed'] += len(rows)
+        for change in changes:
+            self.stats['new' if change.previous_cents is None else 'changed'] += 1
+        return changes
+
+    async def history(self, retailer: str, model: str) -> List[Tuple[float, int]]:
+        """``(timestamp, cents)`` for every price change of a model at a retailer, oldest first"""
+        return await self.store.price_history_async(retailer, model)
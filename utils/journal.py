@@ -0,0 +1,68 @@
+import logging
+from typing import Any, Dict, List, Optional, Set
+from .storage import PRODUCT_DONE, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Outcomes recorded per (product, retailer) pair
+FOUND = 'found'
+EMPTY = 'empty'
+FAILED = 'failed'
+
+class RunJournal:
+    """Checkpoints of one run, so re-running the same run id resumes it.
+
+    Every finished (product, retailer) pair is recorded with its outcome as
+    soon as it completes, and a product is marked done once its output has
+    been written. On resume, done products are skipped, pairs that found a
+    price or found nothing are restored, and only failed or missing pairs
+    are fetched again.
+    """
+
+    def __init__(self, store: SQLiteStore, run_id: str):
+        self.store = store
+        self.run_id = run_id
+        self._completed: Set[str] = set()
+        self._partial: Dict[str, Dict[str, str]] = {}
+        self.stats: Dict[str, int] = {
+            'skipped_products': 0,
+            'restored_pairs': 0,
+            'recorded_pairs': 0,
+        }
+
+    @staticmethod
+    def key(product: Dict) -> str:
+        return product['name'].strip()
+
+    async def load(self) -> 'RunJournal':
+        self._completed, self._partial = await self.store.load_journal_async(self.run_id)
+        if self._completed or self._partial:
+            logger.info(
+                f"Resuming run {self.run_id}: {len(self._completed)} products done, "
+                f"{len(self._partial)} partially done"
+            )
+        return self
+
+    def is_complete(self, product: Dict) -> bool:
+        return self.key(product) in self._completed
+
+    def settled(self, product: Dict) -> Set[str]:
+        """Retailers whose outcome for ``product`` is final (anything but a failure)"""
+        statuses = self._partial.get(self.key(product), {})
+        return {retailer for retailer, status in statuses.items() if status != FAILED}
+
+    async def restore(self, product: Dict) -> Dict[str, List[Dict]]:
+        """Results recorded for ``product`` by earlier attempts, keyed by retailer"""
+        return await self.store.journal_results_async(self.run_id, self.key(product))
+
+    async def record(self, product: Dict, retailer: str, status: str,
+                     value: Optional[Any] = None) -> None:
+        await self.store.record_journal_async(self.run_id, self.key(product), retailer, status,
+                                              value)
+        self.stats['recorded_pairs'] += 1
+
+    async def complete(self, product: Dict) -> None:
+        key = self.key(product)
+        await self.store.record_journal_async(self.run_id, key, PRODUCT_DONE, 'done')
+        self._completed.add(key)
+        self._partial.pop(key, None)
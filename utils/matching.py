@@ -0,0 +1,84 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from .query import extract_model_number
+
+_WORD = re.compile(r'[a-z0-9]+')
+# Model-like runs of letters and digits in a title, compared against the query's model number
+_TITLE_MODEL = re.compile(r'[A-Z0-9]{5,}')
+_NON_ALNUM = re.compile(r'[^A-Z0-9]')
+# Words that make a title an accessory or add-on rather than the TV itself
+_ACCESSORY_WORDS = frozenset({
+    'mount', 'bracket', 'cable', 'remote', 'cover', 'case', 'protector',
+    'adapter', 'kit', 'replacement', 'warranty', 'protection', 'plan', 'cleaning',
+})
+# Words too common in TV listings to tell two of them apart
+_STOP_WORDS = frozenset({'tv', 'the', 'with', 'and', 'in', 'inch', 'smart', 'series', 'class'})
+
+# Share of the score given to the model number when the query has one
+MODEL_WEIGHT = 0.7
+# Shortest shared prefix, as a share of the query's model number, counted as a variant
+# (e.g. QN65Q60DAFXZC vs the US QN65Q60DAF) rather than a different model
+MODEL_PREFIX_MIN = 0.6
+# Factor applied to accessories when the query didn't ask for one
+ACCESSORY_PENALTY = 0.5
+
+Item = Dict[str, Optional[str]]
+
+@lru_cache(maxsize=4096)
+def _words(text: str) -> FrozenSet[str]:
+    return frozenset(_WORD.findall(text.casefold()))
+
+def model_similarity(model: str, title: str) -> float:
+    """1.0 when ``title`` carries ``model``, less for a regional variant of it, else 0"""
+    upper = title.upper()
+    if model in _NON_ALNUM.sub('', upper):
+        return 1.0
+    best = 0
+    for token in _TITLE_MODEL.findall(upper):
+        shared = 0
+        for a, b in zip(model, token):
+            if a != b:
+                break
+            shared += 1
+        best = max(best, shared)
+    ratio = best / len(model)
+    return ratio if ratio >= MODEL_PREFIX_MIN else 0.0
+
+def score_match(query: str, title: str) -> float:
+    """How well a result ``title`` matches a product ``query``, from 0 to 1.
+
+    The query's model number decides most of the score; the rest is the
+    share of the query's words found in the title. A title that reads as an
+    accessory is marked down unless the query asked for one.
+    """
+    query_words = _words(query)
+    title_words = _words(title)
+    wanted = query_words - _STOP_WORDS or query_words
+    score = len(wanted & title_words) / len(wanted) if wanted else 0.0
+
+    model = extract_model_number(query)
+    if model:
+        score = MODEL_WEIGHT * model_similarity(model, title) + (1 - MODEL_WEIGHT) * score
+    if title_words & _ACCESSORY_WORDS and not query_words & _ACCESSORY_WORDS:
+        score *= ACCESSORY_PENALTY
+    return round(score, 3)
+
+def rank_items(query: str, items: Iterable[Item]) -> List[Tuple[float, Item]]:
+    """Usable items (with a title and a price) paired with their score, best first.
+
+    Ties keep page order, so the retailer's own ranking breaks them.
+    """
+    scored = [(score_match(query, item['title'] or ''), item)
+              for item in items if item and item.get('title') and item.get('price')]
+    scored.sort(key=lambda pair: -pair[0])
+    return scored
+
+def best_match(query: str, items: Iterable[Item]) -> Optional[Dict]:
+    """The item that best matches ``query``, with its score under 'confidence';
+    None if none is usable"""
+    ranked = rank_items(query, items)
+    if not ranked:
+        return None
+    confidence, item = ranked[0]
+    return {**item, 'confidence': confidence}
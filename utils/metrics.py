@@ -0,0 +1,198 @@
+import bisect
+import functools
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Union
+from config.settings import METRICS_ENABLED
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds (and bytes for size histograms)
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(2 ** n * 1024 for n in range(0, 13))  # 1 KiB .. 4 MiB
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Fixed-bucket histogram; memory stays constant however many samples arrive"""
+
+    def __init__(self, buckets: Tuple[float, ...] = TIME_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.metrics._observe(self.name, self.labels, elapsed, TIME_BUCKETS)
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+_NULL_TIMER = _NullTimer()
+
+class Metrics:
+    """Counters, timers and histograms keyed by name and labels.
+
+    Timers measure wall time and work across ``await``, so a stage is timed
+    with ``with metrics.timer('fetch', retailer='bestbuy'):``. When disabled,
+    every call returns immediately and ``timer`` hands out one shared no-op
+    context manager, so instrumentation can stay in hot paths.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = (name, self._labels(labels))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = TIME_BUCKETS,
+                **labels) -> None:
+        if not self.enabled:
+            return
+        self._observe(name, self._labels(labels), value, buckets)
+
+    def _observe(self, name: str, labels: Labels, value: float, buckets: Tuple[float, ...]) -> None:
+        histogram = self.histograms.get((name, labels))
+        if histogram is None:
+            histogram = self.histograms[(name, labels)] = Histogram(buckets)
+        histogram.observe(value)
+
+    def timer(self, name: str, **labels) -> Union[_Timer, _NullTimer]:
+        """Context manager recording the elapsed seconds in histogram ``name``"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, self._labels(labels))
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of an async function"""
+        def decorate(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with self.timer(name):
+                    return await fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # Reporting
+
+    def summary(self) -> str:
+        """Plain-text table of every timer/histogram followed by the counters"""
+        rows: List[Tuple[str, ...]] = [('metric', 'labels', 'count', 'p50', 'p95', 'max', 'total')]
+        for (name, labels), hist in sorted(self.histograms.items()):
+            scale, unit = (1000, 'ms') if hist.buckets is TIME_BUCKETS else (1 / 1024, 'KiB')
+            rows.append((
+                name, _format_labels(labels), str(hist.count),
+                f"{hist.quantile(0.5) * scale:.1f}{unit}",
+                f"{hist.quantile(0.95) * scale:.1f}{unit}",
+                f"{hist.max * scale:.1f}{unit}", f"{hist.sum * scale:.1f}{unit}",
+            ))
+        lines = _table(rows) if len(rows) > 1 else []
+        for (name, labels), value in sorted(self.counters.items()):
+            lines.append(f"{name}{{{_format_labels(labels)}}} {value:g}")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ],
+            'histograms': [
+                {'name': name, 'labels': dict(labels), 'count': hist.count, 'sum': hist.sum,
+                 'max': hist.max, 'p50': hist.quantile(0.5), 'p95': hist.quantile(0.95),
+                 'buckets': dict(zip([*map(str, hist.buckets), '+Inf'], hist.counts))}
+                for (name, labels), hist in sorted(self.histograms.items())
+            ],
+        }
+
+    def to_prometheus(self, prefix: str = 'scraper_') -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for (name, labels), value in sorted(self.counters.items()):
+            lines.append(f"{prefix}{name}_total{_prom_labels(labels)} {value:g}")
+        for (name, labels), hist in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip([*hist.buckets, float('inf')], hist.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                bucket_labels = _prom_labels(labels + (('le', le),))
+                lines.append(f"{prefix}{name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{prefix}{name}_sum{_prom_labels(labels)} {hist.sum:g}")
+            lines.append(f"{prefix}{name}_count{_prom_labels(labels)} {hist.count}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Export to ``path``: JSON for a .json suffix, Prometheus text otherwise"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == '.json':
+            path.write_text(json.dumps(self.to_dict(), indent=2), encoding='utf-8')
+        else:
+            path.write_text(self.to_prometheus(), encoding='utf-8')
+
+def _format_labels(labels: Labels) -> str:
+    return ','.join(f"{name}={value}" for name, value in labels)
+
+def _prom_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+def _table(rows: List[Tuple[str, ...]]) -> List[str]:
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return ['  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+            for row in rows]
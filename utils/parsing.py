@@ -0,0 +1,364 @@
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import lxml.html  # type: ignore[import-untyped]
+from lxml import etree  # type: ignore[import-untyped]
+from config.settings import PARSE_EXECUTOR, PARSE_WORKERS, PARSE_PARTIAL, PARSE_CHUNK_SIZE
+from .matching import best_match
+from .structured_data import extract_structured_items
+
+logger = logging.getLogger(__name__)
+
+class Selector:
+    """One ``find(tag, attrs)`` lookup, optionally reading an attribute instead of text.
+
+    Matching follows BeautifulSoup: a single class name matches any element
+    carrying that class, a space-separated value must equal the whole
+    class attribute, and other attributes must match exactly.
+    """
+
+    def __init__(self, tag: str, attrs: Optional[Dict[str, str]] = None,
+                 attr: Optional[str] = None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.attr = attr
+
+    @property
+    def key(self) -> Tuple:
+        return (self.tag, tuple(sorted(self.attrs.items())), self.attr)
+
+    def to_xpath(self) -> str:
+        predicates = []
+        for name, value in self.attrs.items():
+            if name == 'class' and ' ' not in value.strip():
+                padded = _literal(' ' + value.strip() + ' ')
+                predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), {padded})")
+            elif name == 'class':
+                predicates.append(f"normalize-space(@class)={_literal(' '.join(value.split()))}")
+            else:
+                predicates.append(f"@{name}={_literal(value)}")
+        condition = ''.join(f'[{predicate}]' for predicate in predicates)
+        return f"{self.tag}{condition}"
+
+    def anchor_pattern(self) -> str:
+        """Regex for this element's opening tag, used to skip ahead in raw markup.
+
+        Only the first attribute is checked; the parser verifies the rest.
+        """
+        tag = re.escape(self.tag)
+        if not self.attrs:
+            return rf"<{tag}\b"
+        name, value = next(iter(self.attrs.items()))
+        if name == 'class' and ' ' not in value.strip():
+            value_pattern = rf"(?:[^\"'>]*\s)?{re.escape(value.strip())}(?:\s[^\"'>]*)?"
+        elif name == 'class':
+            tokens = r"\s+".join(re.escape(token) for token in value.split())
+            value_pattern = r"\s*" + tokens + r"\s*"
+        else:
+            value_pattern = re.escape(value)
+        return rf"""<{tag}\b[^>]*?\s{re.escape(name)}\s*=\s*["']{value_pattern}["']"""
+
+    def __repr__(self) -> str:
+        return f"Selector({self.tag!r}, {self.attrs!r}, attr={self.attr!r})"
+
+class ExtractionSpec:
+    """Where a retailer's search page keeps the first product tile and its fields.
+
+    Specs are plain picklable objects so they can be shipped to worker
+    processes together with the raw HTML; each process compiles a spec's
+    selectors once and reuses them (see ``compile_spec``).
+    """
+
+    def __init__(self, name: str, container: Selector, fields: Dict[str, Selector]):
+        self.name = name
+        self.container = container
+        self.fields = fields
+        self.key = (name, container.key, tuple((field, sel.key) for field, sel in fields.items()))
+
+    def __repr__(self) -> str:
+        return f"ExtractionSpec({self.name!r})"
+
+def _literal(value: str) -> str:
+    """Quote ``value`` as an XPath string literal"""
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    parts = value.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+class CompiledSpec:
+    """An ExtractionSpec with every selector compiled to an lxml XPath"""
+
+    def __init__(self, spec: ExtractionSpec):
+        container = spec.container.to_xpath()
+        # Finds tiles in a fully built document
+        self.containers = etree.XPath(f"//{container}")
+        # Tests a single element as it streams past in partial mode
+        self.is_container = etree.XPath(f"boolean(self::{container})")
+        # Locates the first tile's opening tag in raw markup
+        anchor = spec.container.anchor_pattern()
+        self.anchor_text = re.compile(anchor, re.IGNORECASE)
+        self.anchor_bytes = re.compile(anchor.encode('utf-8'), re.IGNORECASE)
+        self.fields = [
+            (field, etree.XPath(f"(.//{selector.to_xpath()})[1]"), selector.attr)
+            for field, selector in spec.fields.items()
+        ]
+
+    def read_fields(self, container) -> Dict[str, Optional[str]]:
+        item: Dict[str, Optional[str]] = {}
+        for field, xpath, attr in self.fields:
+            match = xpath(container)
+            if not match:
+                item[field] = None
+            elif attr:
+                item[field] = match[0].get(attr)
+            else:
+                item[field] = ''.join(match[0].itertext()).strip()
+        return item
+
+# Markup handed to the pull parser per step once inside the product list
+PARSE_FEED_SIZE = 4096
+
+# Compiled specs keyed by ExtractionSpec.key; per thread, as lxml XPath
+# evaluators must not be shared between threads
+_local = threading.local()
+
+def compile_spec(spec: ExtractionSpec) -> CompiledSpec:
+    cache = getattr(_local, 'compiled', None)
+    if cache is None:
+        cache = _local.compiled = {}
+    compiled = cache.get(spec.key)
+    if compiled is None:
+        compiled = CompiledSpec(spec)
+        cache[spec.key] = compiled
+    return compiled
+
+def compile_specs(specs: Iterable[ExtractionSpec]) -> None:
+    """Precompile ``specs``; used as the worker initializer of the parse pool"""
+    for spec in specs:
+        compile_spec(spec)
+
+class TileExtractor:
+    """Incremental extractor that builds only as much tree as it needs.
+
+    Incoming chunks are first scanned with a regex for the opening tag of
+    the first product tile; everything before it (head, scripts, navigation)
+    is skipped without building any tree. From there an lxml pull parser
+    reads tiles as their closing tags arrive and discards finished elements
+    outside them. ``feed`` returns True once ``limit`` tiles have been
+    extracted, at which point the caller can stop reading.
+    """
+
+    def __init__(self, spec: ExtractionSpec, limit: int = 1, encoding: Optional[str] = None):
+        self.compiled = compile_spec(spec)
+        self.limit = limit
+        self.encoding = encoding
+        self.items: List[Dict[str, Optional[str]]] = []
+        self._parser: Optional[etree.HTMLPullParser] = None
+        self._pending: Union[str, bytes, None] = None
+        self._container = None
+
+    @property
+    def done(self) -> bool:
+        return len(self.items) >= self.limit
+
+    def feed(self, chunk: Union[str, bytes]) -> bool:
+        if self.done:
+            return True
+        if self._parser is None:
+            start = self._skip_to_first_tile(chunk)
+            if start is None:
+                return False
+            chunk = start
+            self._parser = self._new_parser(isinstance(chunk, bytes))
+        # Feed in small slices so parsing stops soon after the last tile closes
+        for offset in range(0, len(chunk), PARSE_FEED_SIZE):
+            self._parser.feed(chunk[offset:offset + PARSE_FEED_SIZE])
+            self._process_events(self._parser)
+            if self.done:
+                break
+        return self.done
+
+    def close(self) -> List[Dict[str, Optional[str]]]:
+        if self._parser is not None and not self.done:
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                # Hopelessly broken markup after the first tile
+                pass
+            self._process_events(self._parser)
+        return self.items[:self.limit]
+
+    def _skip_to_first_tile(self, chunk: Union[str, bytes]) -> Union[str, bytes, None]:
+        """Buffer until the first tile's opening tag; return the text from there on"""
+        # The pending text and the chunk are both str or both bytes, as the response gives them
+        data: Any = chunk
+        if self._pending is not None:
+            data = self._pending + data
+        is_bytes = isinstance(data, bytes)
+        anchor = self.compiled.anchor_bytes if is_bytes else self.compiled.anchor_text
+        match = anchor.search(data)
+        if match is None:
+            # Keep a tag that may be split across chunks
+            cut = data.rfind(b'<' if is_bytes else '<')
+            self._pending = data[cut:] if cut >= 0 else data[:0]
+            return None
+
+        self._pending = None
+        return data[match.start():]
+
+    def _new_parser(self, is_bytes: bool) -> etree.HTMLPullParser:
+        # Parsing starts mid-document, so the charset <meta> may be behind us
+        encoding = (self.encoding or 'utf-8') if is_bytes else None
+        try:
+            return etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        except LookupError:
+            # Unknown charset label from the server
+            return etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+
+    def _process_events(self, parser: etree.HTMLPullParser) -> None:
+        for event, elem in parser.read_events():
+            if self.done:
+                break
+            if event == 'start':
+                if self._container is None and self.compiled.is_container(elem):
+                    self._container = elem
+                continue
+
+            if elem is self._container:
+                self.items.append(self.compiled.read_fields(elem))
+                self._container = None
+            elif self._container is not None:
+                # Inside a tile: keep the subtree until the tile closes
+                continue
+
+            # Drop finished content we no longer need to bound memory
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+def extract_items(html: Union[str, bytes], spec: ExtractionSpec, limit: int = 1,
+                  partial: bool = PARSE_PARTIAL,
+                  encoding: Optional[str] = None) -> List[Dict[str, Optional[str]]]:
+    """Return the spec's fields for up to ``limit`` product tiles.
+
+    With ``partial`` only the product-list region is parsed, stopping once
+    ``limit`` tiles are read; otherwise the whole document is built first.
+    Raw bytes are parsed as they are, decoded by lxml using ``encoding``
+    (the response charset) when given. Runs in a worker, so it returns only
+    small dicts of strings rather than any part of the parse tree.
+    """
+    if not html or html.isspace():
+        return []
+
+    if partial:
+        extractor = TileExtractor(spec, limit, encoding)
+        for offset in range(0, len(html), PARSE_CHUNK_SIZE):
+            if extractor.feed(html[offset:offset + PARSE_CHUNK_SIZE]):
+                break
+        return extractor.close()
+
+    compiled = compile_spec(spec)
+    parser = _html_parser(encoding) if encoding and isinstance(html, bytes) else None
+    root = lxml.html.document_fromstring(html, parser=parser)
+    return [compiled.read_fields(container) for container in compiled.containers(root)[:limit]]
+
+def _html_parser(encoding: str) -> lxml.html.HTMLParser:
+    parsers = getattr(_local, 'parsers', None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        try:
+            parser = parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+        except LookupError:
+            # Unknown charset label; let lxml sniff the <meta> instead
+            return None
+    return parser
+
+def extract_first(html: Union[str, bytes], spec: ExtractionSpec,
+                  encoding: Optional[str] = None) -> Optional[Dict[str, Optional[str]]]:
+    """Return the spec's fields for the first product tile, or None"""
+    items = extract_items(html, spec, limit=1, encoding=encoding)
+    return items[0] if items else None
+
+def extract_product(html: Union[str, bytes], spec: ExtractionSpec, structured: bool = True,
+                    encoding: Optional[str] = None, query: Optional[str] = None,
+                    candidates: int = 1) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Return ``(fields, source)`` for the product on a search page.
+
+    Embedded JSON (JSON-LD, __NEXT_DATA__, window state) is tried first when
+    ``structured`` is set; the spec's selectors only run when it has no
+    usable product. ``source`` is 'structured', 'selectors' or None.
+
+    With a ``query``, up to ``candidates`` products are read in the same
+    pass and the best match for it is returned, with its score under
+    'confidence' (see ``utils.matching``); otherwise the first product is.
+    """
+    limit = max(1, candidates) if query else 1
+    if structured:
+        items = extract_structured_items(html, encoding, limit)
+        if items:
+            return _pick(items, query), 'structured'
+    items = extract_items(html, spec, limit, encoding=encoding)
+    item = _pick(items, query)
+    return item, ('selectors' if item else None)
+
+def _pick(items: List[Dict[str, Optional[str]]], query: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not items:
+        return None
+    if query is None:
+        return items[0]
+    # Fall back to the first tile when none is usable, as callers check its fields
+    return best_match(query, items) or items[0]
+
+class ParseExecutor:
+    """Runs CPU-bound parsing off the event loop.
+
+    ``mode`` is 'process' (scales across cores), 'thread' (cheap to start,
+    limited by the GIL) or 'inline' (parse on the loop, for debugging).
+    """
+
+    MODES = ('process', 'thread', 'inline')
+
+    def __init__(self, mode: str = PARSE_EXECUTOR, max_workers: Optional[int] = PARSE_WORKERS,
+                 specs: Iterable[ExtractionSpec] = ()):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid parse executor '{mode}'. "
+                             f"Available options: {', '.join(self.MODES)}")
+        self.mode = mode
+        self.max_workers = max_workers
+        # Compiled up front here and in each worker process as it starts
+        self.specs = list(specs)
+        compile_specs(self.specs)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=compile_specs,
+                                                     initargs=(self.specs,))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='parser',
+                                                    initializer=compile_specs,
+                                                    initargs=(self.specs,))
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        if self.mode == 'inline':
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), fn, *args)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,86 @@
+import csv
+import json
+import logging
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+def _from_lines(lines: Iterable[str], source: str) -> Iterator[Dict]:
+    """Products from JSONL; a line that isn't a JSON object is taken as a bare name"""
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('{'):
+            try:
+                product = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping invalid JSON at {source}:{number}: {str(e)}")
+                continue
+        else:
+            product = {'name': line}
+        if not isinstance(product.get('name'), str) or not product['name'].strip():
+            logger.warning(f"Skipping product without a 'name' at {source}:{number}")
+            continue
+        yield product
+
+def _from_csv(lines: Iterable[str], source: str) -> Iterator[Dict]:
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or 'name' not in reader.fieldnames:
+        raise ValueError(f"{source} needs a 'name' column")
+    for number, row in enumerate(reader, 2):
+        if not (row.get('name') or '').strip():
+            logger.warning(f"Skipping row without a 'name' at {source}:{number}")
+            continue
+        yield row
+
+def _from_json_array(handle: TextIO, source: str) -> Iterator[Dict]:
+    # Legacy products.json: an array has to be loaded whole
+    products = json.load(handle)
+    if not isinstance(products, list):
+        raise ValueError(f"{source} must contain an array of products")
+    for product in products:
+        if not isinstance(product, dict) or 'name' not in product:
+            raise ValueError(f"Each product in {source} must have a 'name' field")
+        yield product
+
+def read_products(source: str) -> Iterator[Dict]:
+    """Lazily yield products from ``source``.
+
+    ``source`` is a .jsonl/.ndjson, .csv or .json file, or '-' for stdin
+    (JSONL or one product name per line). Only JSON arrays are read whole;
+    every other format is streamed line by line so catalog size doesn't
+    matter.
+    """
+    if source == '-':
+        yield from _from_lines(sys.stdin, '<stdin>')
+        return
+
+    path = Path(source)
+    suffix = path.suffix.lower()
+    with open(path, 'r', encoding='utf-8', newline='' if suffix == '.csv' else None) as handle:
+        if suffix == '.csv':
+            yield from _from_csv(handle, source)
+        elif suffix == '.json':
+            yield from _from_json_array(handle, source)
+        else:
+            yield from _from_lines(handle, source)
+
+@contextmanager
+def open_output(target: Optional[str]) -> Iterator[TextIO]:
+    """Open ``target`` for appending JSONL lines; '-' or None is stdout"""
+    if target in (None, '-'):
+        yield sys.stdout
+        return
+    path = Path(target)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Line buffered so every completed product is on disk right away
+    with open(path, 'a', encoding='utf-8', buffering=1) as handle:
+        yield handle
+
+def write_jsonl(handle: TextIO, record: Dict) -> None:
+    handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+    handle.flush()
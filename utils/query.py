@@ -0,0 +1,38 @@
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Upper-case alphanumeric runs mixing letters and digits, e.g. QN65Q60DAFXZC or 50A68N
+_MODEL_TOKEN = re.compile(
+    r'(?<![A-Za-z0-9])(?=[A-Z0-9]*[0-9])(?=[A-Z0-9]*[A-Z])[A-Z0-9]{5,}(?![A-Za-z0-9])'
+)
+# Spec tokens that look like model numbers but aren't
+_NOT_A_MODEL = re.compile(r'(?:\d+(?:K|P|HZ)|HDR\d+|HDMI\d*|USB\d*|DDR\d+|WIFI\d*)')
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return ' '.join(text.split()).casefold()
+
+@lru_cache(maxsize=4096)
+def extract_model_number(product_name: str) -> Optional[str]:
+    """Return the manufacturer model number in ``product_name``, if any.
+
+    Marketing names put the model number anywhere ("LG OLED65C1PUB 65\\" TV")
+    or after a dash ("Samsung 43\\" ... TV-UN43DU7100FXZC"); the longest
+    letters-and-digits token wins, the last one on a tie.
+    """
+    best = None
+    for match in _MODEL_TOKEN.finditer(product_name):
+        token = match.group(0)
+        if _NOT_A_MODEL.fullmatch(token):
+            continue
+        if best is None or len(token) >= len(best):
+            best = token
+    return best
+
+@lru_cache(maxsize=4096)
+def canonical_query(product_name: str) -> str:
+    """The query a product is searched and cached under: its model number
+    when one is found, else the normalized name."""
+    model = extract_model_number(product_name)
+    return model if model else normalize_query(product_name)
@@ -1,34 +1,50 @@
+import asyncio
 import time
-from collections import defaultdict
-from threading import Lock
-from typing import Dict
+from typing import Dict, Optional
 from config.settings import RATE_LIMIT
 
 class RateLimiter:
-    def __init__(self):
-        self.requests = defaultdict(list)
-        self.locks = defaultdict(Lock)
-
-    def wait(self, website: str) -> None:
-        with self.locks[website]:
-            rate_config = RATE_LIMIT.get(website, RATE_LIMIT['default'])
-            current_time = time.time()
-            
-            # Remove old requests
-            self.requests[website] = [
-                req_time for req_time in self.requests[website]
-                if current_time - req_time < rate_config['period']
-            ]
-            
-            # If we've hit the limit, wait
-            if len(self.requests[website]) >= rate_config['requests']:
-                sleep_time = (
-                    self.requests[website][0] +
-                    rate_config['period'] -
-                    current_time
-                )
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-            
-            # Add current request
-            self.requests[website].append(current_time) 
\ No newline at end of file
+    """Asyncio-native per-retailer rate limiter (GCRA / virtual token bucket).
+
+    Each retailer keeps only its theoretical arrival time, so acquiring is O(1).
+    A retailer may burst up to its ``requests`` budget, after which requests
+    are spaced ``period / requests`` seconds apart. Waiters for one retailer
+    queue FIFO on that retailer's lock and never block other retailers.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Dict]] = None):
+        self.limits = limits if limits is not None else RATE_LIMIT
+        self._tat: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _config(self, website: str) -> Dict:
+        return self.limits.get(website, self.limits['default'])
+
+    def _lock(self, website: str) -> asyncio.Lock:
+        lock = self._locks.get(website)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[website] = lock
+        return lock
+
+    def delay(self, website: str) -> float:
+        """Seconds until a request for ``website`` would be allowed"""
+        config = self._config(website)
+        interval = config['period'] / config['requests']
+        burst = interval * (config['requests'] - 1)
+        tat = self._tat.get(website, 0.0)
+        return max(0.0, tat - burst - time.monotonic())
+
+    async def wait(self, website: str) -> None:
+        """Wait until a request to ``website`` fits in its rate budget"""
+        config = self._config(website)
+        interval = config['period'] / config['requests']
+
+        # asyncio.Lock wakes waiters in FIFO order, giving fair queuing
+        async with self._lock(website):
+            sleep_time = self.delay(website)
+            if sleep_time > 0:
+                await asyncio.sleep(sleep_time)
+
+            now = time.monotonic()
+            self._tat[website] = max(self._tat.get(website, now), now) + interval
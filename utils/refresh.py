@@ -0,0 +1,149 @@
+import logging
+import math
+import time
+from typing import Callable, Dict, Optional, Tuple
+from config.settings import WATCH_MIN_INTERVAL, WATCH_MAX_INTERVAL
+from .storage import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Priorities above any probability of change: overdue pairs rank from OVERDUE
+# up to twice that by how overdue they are, never-fetched pairs above all
+OVERDUE = 1.0
+NEVER_FETCHED = 3.0
+
+class WatchedPair:
+    """Refresh state of one (retailer, model) pair"""
+
+    __slots__ = ('retailer', 'model', 'product', 'changes', 'first_seen',
+                 'last_success', 'last_attempt', 'in_flight')
+
+    def __init__(self, retailer: str, model: str, product: Dict):
+        self.retailer = retailer
+        self.model = model
+        self.product = product
+        # Price changes observed since first_seen
+        self.changes = 0
+        self.first_seen: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_attempt: Optional[float] = None
+        self.in_flight = False
+
+    def change_rate(self, prior_interval: float) -> float:
+        """Estimated price changes per second.
+
+        One change per ``prior_interval`` is added as a prior, so a pair seen
+        once is not taken to never change, and the estimate sharpens as the
+        observed span grows.
+        """
+        span = 0.0
+        if self.first_seen is not None and self.last_success is not None:
+            span = max(0.0, self.last_success - self.first_seen)
+        return (self.changes + 1) / (span + prior_interval)
+
+class RefreshScheduler:
+    """Chooses which (retailer, model) pair to refresh next.
+
+    Each pair's price changes are modelled as a Poisson process whose rate
+    is estimated from its history, so the chance it has changed since the
+    last successful lookup is ``1 - exp(-rate * age)``. Each retailer's
+    next request goes to the eligible pair with the highest chance: never
+    fetched pairs first, then pairs past ``max_interval`` (most overdue
+    first), then the rest. No pair is fetched again within ``min_interval``
+    of its last attempt. The per-retailer rate limit still decides how many
+    requests go out; this only decides which ones.
+
+    Picking scans the retailer's pairs, as the ordering shifts with time;
+    at the request rates retailers allow, that is negligible even for
+    catalogs of tens of thousands of products.
+    """
+
+    def __init__(self,
+                 min_interval: float = WATCH_MIN_INTERVAL,
+                 max_interval: float = WATCH_MAX_INTERVAL,
+                 clock: Callable[[], float] = time.time):
+        if min_interval > max_interval:
+            raise ValueError("min_interval must not exceed max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.pairs: Dict[str, Dict[str, WatchedPair]] = {}
+        self.stats: Dict[str, int] = {'refreshed': 0, 'changed': 0, 'failed': 0, 'overdue': 0}
+
+    def add(self, retailer: str, model: str, product: Dict) -> bool:
+        """Watch ``product`` at ``retailer`` under its search key ``model``;
+        False if already watched"""
+        pairs = self.pairs.setdefault(retailer, {})
+        if model in pairs:
+            return False
+        pairs[model] = WatchedPair(retailer, model, product)
+        return True
+
+    async def load(self, store: SQLiteStore) -> 'RefreshScheduler':
+        """Seed change counts and last-success times from the price history"""
+        stats = await store.price_stats_async()
+        loaded = 0
+        for (retailer, model), (observations, first_seen, seen_at) in stats.items():
+            pair = self.pairs.get(retailer, {}).get(model)
+            if pair is None:
+                continue
+            pair.changes = observations - 1
+            pair.first_seen = first_seen
+            pair.last_success = pair.last_attempt = seen_at
+            loaded += 1
+        if loaded:
+            logger.info(f"Loaded price history for {loaded} watched pairs")
+        return self
+
+    def priority(self, pair: WatchedPair, now: float) -> Optional[float]:
+        """Chance ``pair`` has changed (above 1 when overdue or never fetched);
+        None if not eligible"""
+        if pair.in_flight:
+            return None
+        if pair.last_attempt is not None and now - pair.last_attempt < self.min_interval:
+            return None
+        if pair.last_success is None:
+            return NEVER_FETCHED
+        age = now - pair.last_success
+        if age >= self.max_interval:
+            return OVERDUE + min(1.0, age / self.max_interval - 1.0)
+        return 1.0 - math.exp(-pair.change_rate(self.max_interval) * age)
+
+    def next(self, retailer: str) -> Tuple[Optional[WatchedPair], float]:
+        """Take the pair to fetch next at ``retailer``, or ``(None, seconds until one is due)``"""
+        now = self.clock()
+        best: Optional[WatchedPair] = None
+        best_priority = -1.0
+        wait = self.min_interval
+        for pair in self.pairs.get(retailer, {}).values():
+            priority = self.priority(pair, now)
+            if priority is None:
+                if not pair.in_flight and pair.last_attempt is not None:
+                    wait = min(wait, pair.last_attempt + self.min_interval - now)
+                continue
+            if priority > best_priority:
+                best, best_priority = pair, priority
+
+        if best is None:
+            return None, max(0.0, wait)
+        if OVERDUE <= best_priority < NEVER_FETCHED:
+            self.stats['overdue'] += 1
+        best.in_flight = True
+        best.last_attempt = now
+        return best, 0.0
+
+    def succeeded(self, pair: WatchedPair, changed: bool) -> None:
+        now = self.clock()
+        pair.in_flight = False
+        if pair.first_seen is None:
+            pair.first_seen = now
+        elif changed:
+            pair.changes += 1
+        pair.last_success = now
+        self.stats['refreshed'] += 1
+        self.stats['changed'] += changed
+
+    def failed(self, pair: WatchedPair) -> None:
+        """Leave the pair to be retried once ``min_interval`` has passed"""
+        pair.in_flight = False
+        self.stats['failed'] += 1
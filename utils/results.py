@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import Any, Dict, Optional, Union
+
+def to_cents(price: Optional[str]) -> Optional[int]:
+    """Parse a cleaned price such as '1299.99' into integer cents; None if it isn't one"""
+    if not price:
+        return None
+    try:
+        cents = int((Decimal(price) * 100).to_integral_value())
+    except (InvalidOperation, ValueError):
+        return None
+    return cents if cents > 0 else None
+
+def format_cents(cents: int) -> str:
+    """Integer cents back in the '1299.99' form results use"""
+    return f"{cents // 100}.{cents % 100:02d}"
+
+class Retailer(str, Enum):
+    """Retailer keys, one shared instance each (also plain strings, e.g. for JSON).
+
+    Kept in step with ``scrapers.REGISTRY``, in the same order.
+    """
+    VISIONS = 'visions'
+    CANADIANTIRE = 'canadiantire'
+    COSTCO = 'costco'
+    BESTBUY = 'bestbuy'
+    AMAZON = 'amazon'
+    LONDONDRUGS = 'londondrugs'
+    DUFRESNE = 'dufresne'
+    TANGUAY = 'tanguay'
+    TEPPERMANS = 'teppermans'
+    LG = 'lg'
+    SAMSUNG = 'samsung'
+    STAPLES = 'staples'
+
+@dataclass(frozen=True)
+class PriceResult:
+    """One price found at one retailer.
+
+    The price is kept as integer cents, so it is parsed once when the
+    result is built and never again by history, validation or output.
+    Slots are declared by hand (``dataclass(slots=True)`` needs 3.10).
+    """
+
+    __slots__ = ('retailer', 'brand', 'website', 'title', 'price_cents',
+                 'url', 'price_valid_till', 'confidence')
+
+    retailer: Union[Retailer, str]
+    brand: str
+    website: str
+    title: str
+    price_cents: int
+    url: str
+    price_valid_till: str
+    # How well the title matches the product searched for (0-1); None when not ranked
+    confidence: Optional[float]
+
+    @property
+    def price(self) -> str:
+        """The price in the '1299.99' form results are written in"""
+        return format_cents(self.price_cents)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain record for JSON (cache, journal) and dict-based callers"""
+        retailer = self.retailer.value if isinstance(self.retailer, Retailer) else self.retailer
+        return {
+            'retailer': retailer,
+            'brand': self.brand,
+            'website': self.website,
+            'title': self.title,
+            'price': self.price,
+            'price_cents': self.price_cents,
+            'price_valid_till': self.price_valid_till,
+            'url': self.url,
+            'confidence': self.confidence,
+        }
+
+    def to_output(self) -> Dict[str, Any]:
+        """One entry of a product's 'Product' list in the output JSON (confidence stays internal)"""
+        return {
+            'Website': self.website,
+            'Title': self.title,
+            'Price': self.price,
+            'PriceValidTill': self.price_valid_till,
+            'URL': self.url,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  retailer: Optional[str] = None) -> Optional['PriceResult']:
+        """Rebuild a result from ``to_dict`` output, or from a record cached before
+        results carried cents and a retailer; None if its price doesn't parse"""
+        cents = data.get('price_cents')
+        if cents is None:
+            cents = to_cents(data.get('price'))
+            if cents is None:
+                return None
+        return cls(
+            retailer=retailer_key(data.get('retailer') or retailer or ''),
+            brand=data.get('brand', ''),
+            website=data.get('website', ''),
+            title=data.get('title', ''),
+            price_cents=cents,
+            url=data.get('url') or '',
+            price_valid_till=data.get('price_valid_till') or '',
+            confidence=data.get('confidence'),
+        )
+
+def retailer_key(retailer: str) -> Union[Retailer, str]:
+    """The shared ``Retailer`` member for ``retailer``, or the string itself for unlisted ones"""
+    try:
+        return Retailer(retailer)
+    except ValueError:
+        return retailer
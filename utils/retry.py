@@ -0,0 +1,78 @@
+import asyncio
+import random
+import socket
+from collections import defaultdict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+import aiohttp
+from config.settings import MAX_RETRIES, RETRY_DELAY, RETRY_MAX_DELAY, RETRY_BUDGET
+
+# Statuses worth another attempt; anything else is a definitive answer
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+class RetryPolicy:
+    """Exponential backoff with full jitter and per-retailer retry budgets.
+
+    Counters are kept per retailer so a run can report how many retries
+    were spent and how often a retailer ran out of budget.
+    """
+
+    def __init__(self,
+                 max_retries: int = MAX_RETRIES,
+                 base_delay: float = RETRY_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY,
+                 budgets: Optional[Dict[str, int]] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budgets = budgets if budgets is not None else RETRY_BUDGET
+        self.retries_spent: Dict[str, int] = defaultdict(int)
+        self.budget_exhausted: Dict[str, int] = defaultdict(int)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number ``attempt`` (0-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Delay before the next attempt, honoring a server's Retry-After"""
+        if retry_after is not None:
+            return retry_after
+        return self.backoff(attempt)
+
+    def spend(self, retailer: str) -> bool:
+        """Take one retry from ``retailer``'s budget; False once it is used up"""
+        budget = self.budgets.get(retailer, self.budgets['default'])
+        if self.retries_spent[retailer] >= budget:
+            self.budget_exhausted[retailer] += 1
+            return False
+        self.retries_spent[retailer] += 1
+        return True
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status in RETRYABLE_STATUSES
+        if isinstance(error, aiohttp.ClientConnectorError):
+            # A host that doesn't resolve won't start resolving a few seconds later
+            return not isinstance(error.os_error, socket.gaierror)
+        return isinstance(error, (aiohttp.ClientConnectionError,
+                                  aiohttp.ClientPayloadError,
+                                  asyncio.TimeoutError))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given as delta-seconds or an HTTP-date"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
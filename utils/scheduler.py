@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple
+from config.settings import (
+    CONCURRENT_REQUESTS, RETAILER_CONCURRENCY, SCHEDULER_MAX_PENDING,
+    ADAPTIVE_CONCURRENCY, LATENCY_SPIKE_FACTOR, HEDGE_MIN_SAMPLES,
+)
+
+logger = logging.getLogger(__name__)
+
+Job = Tuple[Any, Callable[[], Awaitable[Any]]]
+
+# Samples of latency before spikes are judged against the average
+LATENCY_WARMUP = 5
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """A lookup was abandoned because its retailer or product deadline passed"""
+
+class LatencyWindow:
+    """The most recent request latencies, for quantile estimates"""
+
+    def __init__(self, size: int = 200, min_samples: int = HEDGE_MIN_SAMPLES):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def add(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The ``q`` quantile of the window; None until ``min_samples`` are in"""
+        if len(self.samples) < max(1, self.min_samples):
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class AdaptiveLimit:
+    """In-flight cap for one retailer, adjusted AIMD-style when ``adaptive``.
+
+    Each success under the latency-spike threshold adds ``1 / limit`` (about
+    one slot per window of requests); an error or a latency spike halves the
+    limit, at most once per average round trip so one bad window counts
+    once. The limit stays between 1 and ``max_limit``. Waiters are served
+    in order.
+    """
+
+    def __init__(self, max_limit: int, adaptive: bool = ADAPTIVE_CONCURRENCY,
+                 spike_factor: float = LATENCY_SPIKE_FACTOR):
+        self.max_limit = max(1, max_limit)
+        self.adaptive = adaptive
+        self.spike_factor = spike_factor
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        # Moving average of request latency in seconds
+        self.latency: Optional[float] = None
+        self.samples = 0
+        self.decreases = 0
+        self._last_decrease = float('-inf')
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def current(self) -> int:
+        return max(1, int(self.limit))
+
+    async def acquire(self) -> None:
+        if not self._waiters and self.in_flight < self.current:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Slots are handed to waiters directly so newcomers can't jump the queue
+        while self._waiters and self.in_flight < self.current:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def succeeded(self, latency: float) -> None:
+        if not self.adaptive:
+            return
+        baseline = self.latency if self.samples >= LATENCY_WARMUP else None
+        if baseline is not None and latency > self.spike_factor * baseline:
+            self._decrease()
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        self.samples += 1
+        self._wake()
+
+    def failed(self) -> None:
+        if self.adaptive:
+            self._decrease()
+
+    def _decrease(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(1.0, self.limit / 2)
+        self.decreases += 1
+
+class ConcurrencyLimiter:
+    """Global plus per-retailer cap on in-flight requests.
+
+    Per-retailer caps start at the configured limit and adapt to how the
+    retailer copes (see ``AdaptiveLimit``); callers report each request's
+    outcome through ``succeeded`` and ``failed``.
+    """
+
+    def __init__(self,
+                 global_limit: int = CONCURRENT_REQUESTS,
+                 retailer_limits: Optional[Dict[str, int]] = None,
+                 adaptive: bool = ADAPTIVE_CONCURRENCY):
+        self.global_limit = global_limit
+        if retailer_limits is None:
+            retailer_limits = RETAILER_CONCURRENCY
+        self.retailer_limits = retailer_limits
+        self.adaptive = adaptive
+        # Created lazily so they bind to the running event loop
+        self._global: Optional[asyncio.Semaphore] = None
+        self._per_retailer: Dict[str, AdaptiveLimit] = {}
+
+    def retailer_limit(self, retailer: str) -> int:
+        default = self.retailer_limits.get('default', self.global_limit)
+        return self.retailer_limits.get(retailer, default)
+
+    def _retailer_state(self, retailer: str) -> AdaptiveLimit:
+        state = self._per_retailer.get(retailer)
+        if state is None:
+            state = AdaptiveLimit(self.retailer_limit(retailer), self.adaptive)
+            self._per_retailer[retailer] = state
+        return state
+
+    @asynccontextmanager
+    async def slot(self, retailer: str) -> AsyncIterator[None]:
+        """Hold one request slot for ``retailer``.
+
+        The retailer slot is taken first so a saturated retailer queues on its
+        own limit without occupying a global slot.
+        """
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.global_limit)
+        state = self._retailer_state(retailer)
+        await state.acquire()
+        try:
+            async with self._global:
+                yield
+        finally:
+            state.release()
+
+    def succeeded(self, retailer: str, latency: float) -> None:
+        self._retailer_state(retailer).succeeded(latency)
+
+    def failed(self, retailer: str) -> None:
+        self._retailer_state(retailer).failed()
+
+    def current_limits(self) -> Dict[str, int]:
+        """Each retailer's cap right now, for reporting"""
+        return {retailer: state.current for retailer, state in self._per_retailer.items()}
+
+class JobScheduler:
+    """Runs independent jobs concurrently and yields results as they finish.
+
+    Jobs are pulled lazily from the input iterable, keeping at most
+    ``max_pending`` tasks alive so memory stays flat for large batches.
+    """
+
+    def __init__(self, max_pending: int = SCHEDULER_MAX_PENDING):
+        self.max_pending = max(1, max_pending)
+
+    async def run(self, jobs: Iterable[Job]) -> AsyncIterator[Tuple[Any, Any]]:
+        """Yield ``(key, result)`` pairs in completion order.
+
+        A job that raises yields the exception as its result, mirroring
+        ``asyncio.gather(..., return_exceptions=True)``.
+        """
+        job_iter = iter(jobs)
+        pending: Dict[asyncio.Future, Any] = {}
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_pending:
+                    try:
+                        key, factory = next(job_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[asyncio.ensure_future(factory())] = key
+
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    key = pending.pop(task)
+                    if task.cancelled():
+                        yield key, asyncio.CancelledError()
+                    elif task.exception() is not None:
+                        yield key, task.exception()
+                    else:
+                        yield key, task.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,82 @@
+import functools
+import importlib.util
+import logging
+from typing import Optional
+import aiohttp
+from config.settings import (
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+class ResponseTooLarge(Exception):
+    """A response body went over the configured size limit"""
+
+@functools.lru_cache(maxsize=None)
+def accept_encoding() -> str:
+    """Accept-Encoding listing only the codecs aiohttp can decode here.
+
+    gzip and deflate are built in; brotli needs the optional ``brotli`` or
+    ``brotlicffi`` package, and a server answering ``br`` without it fails
+    the request.
+    """
+    codecs = ['gzip', 'deflate']
+    if any(importlib.util.find_spec(name) is not None for name in ('brotli', 'brotlicffi')):
+        codecs.append('br')
+    return ', '.join(codecs)
+
+class SessionManager:
+    """Owns one pooled aiohttp session shared by every scraper in a run.
+
+    Use as an async context manager; the connector keeps TCP/TLS connections
+    alive between requests and caches DNS lookups, so repeated searches
+    against the same retailer skip the handshake.
+    """
+
+    def __init__(self,
+                 limit: int = CONNECTION_LIMIT,
+                 limit_per_host: int = CONNECTION_LIMIT_PER_HOST,
+                 dns_cache_ttl: int = DNS_CACHE_TTL,
+                 keepalive_timeout: float = KEEPALIVE_TIMEOUT):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("SessionManager is not open; use 'async with SessionManager()'")
+        return self._session
+
+    async def open(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            logger.debug(
+                f"Opened shared session (limit={self.limit}, per_host={self.limit_per_host})"
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.debug("Closed shared session")
+        self._session = None
+
+    async def __aenter__(self) -> "SessionManager":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key starts the work as its own task; callers
+    arriving while it runs await the same result (or exception) instead of
+    repeating it. Each caller waits through ``asyncio.shield`` so a caller
+    being cancelled doesn't cancel the work for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats: Dict[str, int] = {'executed': 0, 'coalesced': 0}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+            self.stats['executed'] += 1
+        else:
+            self.stats['coalesced'] += 1
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the error as seen in case every caller was cancelled meanwhile
+        if not future.cancelled():
+            future.exception()
+
+    async def cancel_all(self) -> None:
+        """Cancel the work still in flight and wait for it to unwind, e.g. before
+        the session and store it uses are closed"""
+        futures = list(self._inflight.values())
+        for future in futures:
+            future.cancel()
+        await asyncio.gather(*futures, return_exceptions=True)
+
+    def __len__(self) -> int:
+        return len(self._inflight)
@@ -0,0 +1,353 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from config.settings import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# (retailer, model, previous price in cents or None, new price in cents)
+PriceChange = Tuple[str, str, Optional[int], int]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    retailer TEXT NOT NULL,
+    model TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (retailer, model)
+);
+CREATE INDEX IF NOT EXISTS idx_cache_timestamp ON cache (timestamp);
+
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    brand TEXT,
+    website TEXT NOT NULL,
+    title TEXT,
+    price TEXT,
+    price_valid_till TEXT,
+    url TEXT,
+    saved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS idx_results_website ON results (website, saved_at);
+
+CREATE TABLE IF NOT EXISTS journal (
+    run_id TEXT NOT NULL,
+    product TEXT NOT NULL,
+    retailer TEXT NOT NULL,
+    status TEXT NOT NULL,
+    value TEXT,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (run_id, product, retailer)
+);
+CREATE INDEX IF NOT EXISTS idx_journal_finished ON journal (finished_at);
+
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    value TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_validators_stored ON validators (stored_at);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    retailer TEXT NOT NULL,
+    model TEXT NOT NULL,
+    observed_at REAL NOT NULL,
+    price_cents INTEGER NOT NULL,
+    run_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_price_history_model ON price_history (retailer, model, observed_at);
+
+CREATE TABLE IF NOT EXISTS latest_prices (
+    retailer TEXT NOT NULL,
+    model TEXT NOT NULL,
+    price_cents INTEGER NOT NULL,
+    changed_at REAL NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (retailer, model)
+) WITHOUT ROWID;
+"""
+
+# Journal retailer marking a product whose output line has been written
+PRODUCT_DONE = '*'
+
+
+class SQLiteStore:
+    """Single SQLite database (WAL mode) holding cached results and run output.
+
+    The synchronous methods do the actual work; the ``*_async`` wrappers run
+    them on a dedicated single-thread executor so the event loop never blocks
+    on disk and all database access is serialized on one connection.
+    """
+
+    def __init__(self, db_path: Path = DB_PATH):
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _run_sync(self, fn: Callable, *args) -> Any:
+        with self._lock:
+            return fn(*args)
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite-store')
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run_sync, fn, *args)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # Cache table
+
+    def _get_cache(self, retailer: str, model: str) -> Optional[Tuple[float, Any]]:
+        row = self.conn.execute(
+            'SELECT timestamp, value FROM cache WHERE retailer = ? AND model = ?',
+            (retailer, model)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def _put_cache_many(self, rows: Iterable[Tuple[str, str, float, Any]]) -> int:
+        encoded = [
+            (retailer, model, timestamp, json.dumps(value, ensure_ascii=False))
+            for retailer, model, timestamp, value in rows
+        ]
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO cache (retailer, model, timestamp, value) '
+                'VALUES (?, ?, ?, ?)',
+                encoded
+            )
+        return len(encoded)
+
+    def _purge_cache(self, max_age: float) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                'DELETE FROM cache WHERE timestamp < ?', (time.time() - max_age,)
+            )
+        return cursor.rowcount
+
+    def get_cache(self, retailer: str, model: str) -> Optional[Tuple[float, Any]]:
+        return self._run_sync(self._get_cache, retailer, model)
+
+    def put_cache_many(self, rows: Iterable[Tuple[str, str, float, Any]]) -> int:
+        return self._run_sync(self._put_cache_many, list(rows))
+
+    async def get_cache_async(self, retailer: str, model: str) -> Optional[Tuple[float, Any]]:
+        return await self._run(self._get_cache, retailer, model)
+
+    async def put_cache_many_async(self, rows: List[Tuple[str, str, float, Any]]) -> int:
+        return await self._run(self._put_cache_many, rows)
+
+    async def purge_cache_async(self, max_age: float) -> int:
+        return await self._run(self._purge_cache, max_age)
+
+    # Validators table
+
+    def _get_validator(self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Any]]:
+        row = self.conn.execute(
+            'SELECT etag, last_modified, value FROM validators WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def _put_validator(self, url: str, etag: Optional[str], last_modified: Optional[str],
+                       value: Any) -> None:
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO validators (url, etag, last_modified, value, stored_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, etag, last_modified, json.dumps(value, ensure_ascii=False), time.time())
+            )
+
+    def _purge_validators(self, max_age: float) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                'DELETE FROM validators WHERE stored_at < ?', (time.time() - max_age,)
+            )
+        return cursor.rowcount
+
+    async def get_validator_async(
+            self, url: str) -> Optional[Tuple[Optional[str], Optional[str], Any]]:
+        return await self._run(self._get_validator, url)
+
+    async def put_validator_async(self, url: str, etag: Optional[str], last_modified: Optional[str],
+                                  value: Any) -> None:
+        await self._run(self._put_validator, url, etag, last_modified, value)
+
+    async def purge_validators_async(self, max_age: float) -> int:
+        return await self._run(self._purge_validators, max_age)
+
+    # Results table
+
+    def _save_results(self, run_id: str, results: List[Dict]) -> int:
+        """Store one run's per-brand output (the shape save_results writes)"""
+        saved_at = time.time()
+        rows = [
+            (run_id, block['Brand'], item['Website'], item['Title'], item['Price'],
+             item.get('PriceValidTill', ''), item.get('URL', ''), saved_at)
+            for block in results
+            for item in block['Product']
+        ]
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO results (run_id, brand, website, title, price, '
+                'price_valid_till, url, saved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        return len(rows)
+
+    async def save_results_async(self, run_id: str, results: List[Dict]) -> int:
+        return await self._run(self._save_results, run_id, results)
+
+    # Price history
+
+    def _record_prices(self, run_id: Optional[str],
+                       observations: Iterable[Tuple[str, str, int]]) -> List[PriceChange]:
+        """Record observed prices; return ``(retailer, model, previous, current)`` for each change.
+
+        Only changes are appended to ``price_history``; ``latest_prices``
+        holds the current price per (retailer, model) and when it was last
+        seen, so detecting a change is one primary-key lookup.
+        """
+        now = time.time()
+        changes = []
+        with self.conn:
+            for retailer, model, price_cents in observations:
+                row = self.conn.execute(
+                    'SELECT price_cents FROM latest_prices WHERE retailer = ? AND model = ?',
+                    (retailer, model)
+                ).fetchone()
+                if row is not None and row[0] == price_cents:
+                    self.conn.execute(
+                        'UPDATE latest_prices SET seen_at = ? WHERE retailer = ? AND model = ?',
+                        (now, retailer, model)
+                    )
+                    continue
+                self.conn.execute(
+                    'INSERT INTO price_history (retailer, model, observed_at, price_cents, run_id) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (retailer, model, now, price_cents, run_id)
+                )
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO latest_prices '
+                    '(retailer, model, price_cents, changed_at, seen_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (retailer, model, price_cents, now, now)
+                )
+                changes.append((retailer, model, row[0] if row is not None else None, price_cents))
+        return changes
+
+    def _price_history(self, retailer: str, model: str) -> List[Tuple[float, int]]:
+        return self.conn.execute(
+            'SELECT observed_at, price_cents FROM price_history WHERE retailer = ? AND model = ? '
+            'ORDER BY observed_at',
+            (retailer, model)
+        ).fetchall()
+
+    def _price_stats(self) -> Dict[Tuple[str, str], Tuple[int, float, float]]:
+        """``(changes recorded, first observed, last seen)`` per (retailer, model)"""
+        rows = self.conn.execute(
+            'SELECT h.retailer, h.model, COUNT(*), MIN(h.observed_at), l.seen_at '
+            'FROM price_history h JOIN latest_prices l '
+            'ON l.retailer = h.retailer AND l.model = h.model '
+            'GROUP BY h.retailer, h.model'
+        )
+        return {(retailer, model): (count, first, seen)
+                for retailer, model, count, first, seen in rows}
+
+    async def record_prices_async(self, run_id: Optional[str],
+                                  observations: List[Tuple[str, str, int]]) -> List[PriceChange]:
+        return await self._run(self._record_prices, run_id, observations)
+
+    async def price_history_async(self, retailer: str, model: str) -> List[Tuple[float, int]]:
+        return await self._run(self._price_history, retailer, model)
+
+    async def price_stats_async(self) -> Dict[Tuple[str, str], Tuple[int, float, float]]:
+        return await self._run(self._price_stats)
+
+    # Run journal
+
+    def _load_journal(self, run_id: str) -> Tuple[Set[str], Dict[str, Dict[str, str]]]:
+        """Products finished in ``run_id`` and the pair statuses of the rest"""
+        completed = {
+            row[0] for row in self.conn.execute(
+                'SELECT product FROM journal WHERE run_id = ? AND retailer = ?',
+                (run_id, PRODUCT_DONE)
+            )
+        }
+        partial: Dict[str, Dict[str, str]] = {}
+        for product, retailer, status in self.conn.execute(
+            'SELECT product, retailer, status FROM journal WHERE run_id = ? AND retailer != ?',
+            (run_id, PRODUCT_DONE)
+        ):
+            if product not in completed:
+                partial.setdefault(product, {})[retailer] = status
+        return completed, partial
+
+    def _journal_results(self, run_id: str, product: str) -> Dict[str, Any]:
+        rows = self.conn.execute(
+            'SELECT retailer, value FROM journal '
+            "WHERE run_id = ? AND product = ? AND status = 'found'",
+            (run_id, product)
+        )
+        return {retailer: json.loads(value) for retailer, value in rows}
+
+    def _record_journal(self, run_id: str, product: str, retailer: str,
+                        status: str, value: Any = None) -> None:
+        encoded = None if value is None else json.dumps(value, ensure_ascii=False)
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO journal '
+                '(run_id, product, retailer, status, value, finished_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (run_id, product, retailer, status, encoded, time.time())
+            )
+
+    def _purge_journal(self, max_age: float) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                'DELETE FROM journal WHERE finished_at < ?', (time.time() - max_age,)
+            )
+        return cursor.rowcount
+
+    async def load_journal_async(self, run_id: str) -> Tuple[Set[str], Dict[str, Dict[str, str]]]:
+        return await self._run(self._load_journal, run_id)
+
+    async def journal_results_async(self, run_id: str, product: str) -> Dict[str, Any]:
+        return await self._run(self._journal_results, run_id, product)
+
+    async def record_journal_async(self, run_id: str, product: str, retailer: str,
+                                   status: str, value: Any = None) -> None:
+        await self._run(self._record_journal, run_id, product, retailer, status, value)
+
+    async def purge_journal_async(self, max_age: float) -> int:
+        return await self._run(self._purge_journal, max_age)
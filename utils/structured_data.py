@@ -0,0 +1,156 @@
+import json
+import logging
+import re
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Opening tags of the script blocks that carry product data as JSON
+_SCRIPT_TAG = re.compile(
+    r"""<script\b[^>]*?"""
+    r"""(?:type\s*=\s*["']application/ld\+json["']|id\s*=\s*["']__NEXT_DATA__["'])[^>]*>""",
+    re.IGNORECASE
+)
+# Inline state assignments, e.g. ``window.__INITIAL_STATE__ = {...};``
+_STATE_ASSIGNMENT = re.compile(r"window\.__(?:INITIAL|PRELOADED)_STATE__\s*=\s*")
+
+_TITLE_KEYS = ('name', 'title', 'productName')
+_PRICE_KEYS = ('price', 'salePrice', 'currentPrice', 'lowPrice', 'regularPrice')
+_URL_KEYS = ('url', 'productUrl', 'canonicalUrl', 'href')
+
+# Cheap substring checks that rule out pages without any blob before the regexes run
+_MARKERS = ('ld+json', '__NEXT_DATA__', '_STATE__')
+_BYTE_MARKERS = tuple(marker.encode('ascii') for marker in _MARKERS)
+
+# Upper bound on JSON nodes visited per page so odd blobs can't stall a worker
+MAX_NODES = 50000
+
+_decoder = json.JSONDecoder(strict=False)
+
+def _json_blobs(html: str) -> Iterator[Any]:
+    """Decode JSON-LD, __NEXT_DATA__ and inline state blobs in document order"""
+    for match in _SCRIPT_TAG.finditer(html):
+        end = html.find('</script', match.end())
+        if end < 0:
+            break
+        try:
+            yield json.loads(html[match.end():end], strict=False)
+        except ValueError:
+            continue
+
+    for match in _STATE_ASSIGNMENT.finditer(html):
+        try:
+            # raw_decode stops at the end of the object, ignoring the rest of the script
+            blob, _ = _decoder.raw_decode(html, match.end())
+        except ValueError:
+            continue
+        yield blob
+
+def _walk(node: Any, budget: list) -> Iterator[Dict]:
+    """Yield every dict under ``node`` depth first, in document order"""
+    stack = [node]
+    while stack and budget[0] > 0:
+        current = stack.pop()
+        budget[0] -= 1
+        if isinstance(current, dict):
+            yield current
+            stack.extend(reversed(list(current.values())))
+        elif isinstance(current, list):
+            stack.extend(reversed(current))
+
+def _first(mapping: Dict, keys) -> Any:
+    for key in keys:
+        value = mapping.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+def _price(value: Any) -> Optional[str]:
+    """Normalize a price given as a number, string or nested price object"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return f"{value:.2f}" if value > 0 else None
+    if isinstance(value, str):
+        return value.strip() if re.search(r'\d', value) else None
+    if isinstance(value, dict):
+        return _price(_first(value, ('value', 'amount', 'current', *_PRICE_KEYS)))
+    return None
+
+def _is_product(node: Dict) -> bool:
+    kind = node.get('@type')
+    if isinstance(kind, list):
+        return 'Product' in kind
+    return kind == 'Product'
+
+def _from_product(node: Dict) -> Optional[Dict[str, Optional[str]]]:
+    """Read a schema.org Product"""
+    offers = node.get('offers')
+    if isinstance(offers, list):
+        offers = offers[0] if offers else None
+    price = _price(_first(offers, ('price', 'lowPrice'))) if isinstance(offers, dict) else None
+    url = node.get('url') or (offers.get('url') if isinstance(offers, dict) else None)
+    return _item(node.get('name'), price, url)
+
+def _from_state(node: Dict) -> Optional[Dict[str, Optional[str]]]:
+    """Read a product-like object from embedded app state"""
+    price = _first(node, _PRICE_KEYS)
+    if price is None:
+        return None
+    return _item(_first(node, _TITLE_KEYS), _price(price), _first(node, _URL_KEYS))
+
+def _item(title: Any, price: Optional[str], url: Any) -> Optional[Dict[str, Optional[str]]]:
+    if not isinstance(title, str) or not title.strip() or not price:
+        return None
+    return {
+        'title': title.strip(),
+        'price': price,
+        'url': url if isinstance(url, str) and url else None,
+    }
+
+def extract_structured(html: Union[str, bytes],
+                       encoding: Optional[str] = None) -> Optional[Dict[str, Optional[str]]]:
+    """Return the first product found in the page's embedded JSON, or None"""
+    items = extract_structured_items(html, encoding, limit=1)
+    return items[0] if items else None
+
+def extract_structured_items(html: Union[str, bytes], encoding: Optional[str] = None,
+                             limit: int = 1) -> List[Dict[str, Optional[str]]]:
+    """Return up to ``limit`` products found in the page's embedded JSON.
+
+    Only the script blocks are located (by regex) and decoded; no DOM is
+    built. schema.org Products in JSON-LD are preferred; only when there
+    are none are objects in __NEXT_DATA__ or window state carrying a title
+    and a price used. Items have the same fields as a product tile read by
+    a spec. Raw bytes are only decoded (as ``encoding``, default UTF-8)
+    once a marker shows there is something to read.
+    """
+    if not html:
+        return []
+    if isinstance(html, bytes):
+        if not any(marker in html for marker in _BYTE_MARKERS):
+            return []
+        try:
+            text = html.decode(encoding or 'utf-8', errors='replace')
+        except LookupError:
+            text = html.decode('utf-8', errors='replace')
+        html = text
+    elif not any(marker in html for marker in _MARKERS):
+        return []
+
+    budget = [MAX_NODES]
+    products: List[Dict[str, Optional[str]]] = []
+    fallback: List[Dict[str, Optional[str]]] = []
+    for blob in _json_blobs(html):
+        for node in _walk(blob, budget):
+            if _is_product(node):
+                item = _from_product(node)
+                if item:
+                    products.append(item)
+                    if len(products) >= limit:
+                        return products
+            elif len(fallback) < limit and '@type' not in node:
+                item = _from_state(node)
+                if item:
+                    fallback.append(item)
+    return products or fallback
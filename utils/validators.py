@@ -1,7 +1,11 @@
-from typing import Dict, Any
+from typing import Dict, Any, Union
 from dataclasses import dataclass
 from decimal import Decimal
 import re
+from .results import PriceResult
+
+# Reasonable price range for TVs, in cents
+MAX_PRICE_CENTS = 100000 * 100
 
 @dataclass
 class ProductValidationError(Exception):
@@ -10,7 +14,14 @@ class ProductValidationError(Exception):
 
 class ProductValidator:
     @staticmethod
-    def validate_price(price: str) -> bool:
+    def validate_cents(cents: int) -> bool:
+        return 0 < cents < MAX_PRICE_CENTS
+
+    @staticmethod
+    def validate_price(price: Union[int, str]) -> bool:
+        """Check a price given as integer cents, or as text such as '$1,299.99'"""
+        if isinstance(price, int):
+            return ProductValidator.validate_cents(price)
         try:
             cleaned_price = re.sub(r'[^\d.]', '', price)
             price_decimal = Decimal(cleaned_price)
@@ -19,7 +30,16 @@ class ProductValidator:
             return False
 
     @staticmethod
-    def validate_product_data(product_data: Dict) -> None:
+    def validate_product_data(product_data: Union[PriceResult, Dict]) -> None:
+        if isinstance(product_data, PriceResult):
+            # Fields are typed and the price was parsed when the result was built
+            if not ProductValidator.validate_cents(product_data.price_cents):
+                raise ProductValidationError(
+                    "Invalid price format or value",
+                    {"price": product_data.price}
+                )
+            return
+
         required_fields = ['brand', 'website', 'title', 'price']
         
         for field in required_fields: